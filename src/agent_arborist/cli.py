@@ -60,9 +60,10 @@ def _resolve_container_workspace(
     cli_mode: str | None, cfg: ArboristConfig, target: Path,
 ) -> Path | None:
     """Resolve container mode and return workspace path or None."""
-    from agent_arborist.devcontainer import should_use_container
+    from agent_arborist.devcontainer import set_container_shell, should_use_container
     resolved_mode = cli_mode or cfg.defaults.container_mode
     if should_use_container(resolved_mode, target):
+        set_container_shell(cfg.defaults.container_shell)
         return target
     return None
 
@@ -232,7 +233,10 @@ def build(spec_dir, output, no_ai, runner, model, container_mode):
 @click.option("--container-mode", "-c", "container_mode", default=None,
               type=click.Choice(["auto", "enabled", "disabled"]),
               help="Container mode (default: from config or 'auto')")
-def garden(tree_path, runner, model, max_retries, target_repo, base_branch, report_dir, log_dir, container_mode):
+@click.option("--pipelined", is_flag=True,
+              help="Start review while tests run; a test failure discards the approval, a rejection cancels the tests")
+def garden(tree_path, runner, model, max_retries, target_repo, base_branch, report_dir, log_dir, container_mode,
+           pipelined):
     """Execute a single task."""
     from agent_arborist.runner import get_runner
     from agent_arborist.worker.garden import garden as garden_fn
@@ -273,6 +277,11 @@ def garden(tree_path, runner, model, max_retries, target_repo, base_branch, repo
         container_up_timeout=cfg.timeouts.container_up,
         container_check_timeout=cfg.timeouts.container_check,
         spec_id=spec_id,
+        pipelined=pipelined,
+        test_cache=cfg.test.cache,
+        test_parallel=cfg.test.parallel,
+        test_fail_fast=cfg.test.fail_fast,
+        test_compress_logs=cfg.test.compress_logs,
     )
 
     if result.success:
@@ -297,7 +306,15 @@ def garden(tree_path, runner, model, max_retries, target_repo, base_branch, repo
 @click.option("--container-mode", "-c", "container_mode", default=None,
               type=click.Choice(["auto", "enabled", "disabled"]),
               help="Container mode (default: from config or 'auto')")
-def gardener(tree_path, runner, model, max_retries, target_repo, base_branch, report_dir, log_dir, container_mode):
+@click.option("--parallel", default=1, type=click.IntRange(min=1),
+              help="Max tasks to run concurrently, each in its own git worktree (default: 1)")
+@click.option("--pipelined", is_flag=True,
+              help="Start review while tests run; a test failure discards the approval, a rejection cancels the tests")
+@click.option("--schedule", default="auto", type=click.Choice(["auto", "structural", "critical-path"]),
+              help="Task priority: tree order, or longest remaining chain first using past durations "
+                   "(default: auto = critical-path when --parallel > 1)")
+def gardener(tree_path, runner, model, max_retries, target_repo, base_branch, report_dir, log_dir, container_mode,
+             parallel, pipelined, schedule):
     """Run the gardener loop to execute all tasks."""
     from agent_arborist.runner import get_runner
     from agent_arborist.worker.gardener import gardener as gardener_fn
@@ -320,6 +337,13 @@ def gardener(tree_path, runner, model, max_retries, target_repo, base_branch, re
     if log_dir is None:
         log_dir = tree_path.resolve().parent / "logs"
 
+    if schedule == "auto":
+        schedule = "critical-path" if parallel > 1 else "structural"
+    if schedule != "structural":
+        from agent_arborist.tree.schedule import get_policy, load_task_durations
+        durations = load_task_durations(target, spec_id=spec_id, report_dir=Path(report_dir).resolve())
+        tree.compute_execution_order(get_policy(schedule)(tree, durations))
+
     resolved_test_timeout = cfg.test.timeout or cfg.timeouts.test_command
     impl_runner_instance = get_runner(impl_runner_name, impl_model)
     rev_runner_instance = get_runner(rev_runner_name, rev_model)
@@ -338,6 +362,12 @@ def gardener(tree_path, runner, model, max_retries, target_repo, base_branch, re
         container_up_timeout=cfg.timeouts.container_up,
         container_check_timeout=cfg.timeouts.container_check,
         spec_id=spec_id,
+        parallel=parallel,
+        pipelined=pipelined,
+        test_cache=cfg.test.cache,
+        test_parallel=cfg.test.parallel,
+        test_fail_fast=cfg.test.fail_fast,
+        test_compress_logs=cfg.test.compress_logs,
     )
 
     if result.success:
@@ -355,9 +385,16 @@ def gardener(tree_path, runner, model, max_retries, target_repo, base_branch, re
 @click.option("--target-repo", type=click.Path(path_type=Path), default=None)
 @click.option("--format", "output_format", type=click.Choice(["text", "json"]), default="text",
               help="Output format (text or json)")
-def status(tree_path, target_repo, output_format):
+@click.option("--report-dir", type=click.Path(path_type=Path), default=None,
+              help="Directory with report JSON files (default: next to task tree)")
+@click.option("--estimate", is_flag=True, default=False,
+              help="Predict the makespan of the remaining tasks from recorded durations")
+@click.option("--parallel", default=1, type=click.IntRange(min=1),
+              help="Workers to assume for the predicted makespan (default: 1)")
+def status(tree_path, target_repo, output_format, report_dir, estimate, parallel):
     """Show current status of all tasks."""
     from agent_arborist.git.state import scan_task_states, task_state_from_trailers
+    from agent_arborist.tree.schedule import load_task_durations, predict_makespan
 
     target = target_repo.resolve() if target_repo else Path(_default_repo()).resolve()
     branch = git_current_branch(target)
@@ -368,13 +405,26 @@ def status(tree_path, target_repo, output_format):
 
     task_states, task_trailers = scan_task_states(tree, target, spec_id=spec_id)
 
+    completed = [tid for tid, state in task_states.items() if state.value == "complete"]
+    prediction = None
+    if estimate:
+        if report_dir is None:
+            report_dir = tree_path.resolve().parent / "reports"
+        # Report durations only: the git history fallback is a long log walk.
+        durations = load_task_durations(
+            target, spec_id=spec_id, report_dir=Path(report_dir).resolve(), git_history=False,
+        )
+        prediction = predict_makespan(tree, durations, workers=parallel, completed=completed)
+
     if output_format == "json":
         status_data = {
             "tree": tree.to_dict(),
             "branch": branch,
-            "completed": [tid for tid, state in task_states.items() if state.value == "complete"],
-            "tasks": {}
+            "completed": completed,
+            "tasks": {},
         }
+        if prediction is not None:
+            status_data["prediction"] = prediction.to_dict()
 
         for node_id, node in tree.nodes.items():
             if node.is_leaf:
@@ -407,6 +457,16 @@ def status(tree_path, target_repo, output_format):
             _add_status_subtree(rich_tree, root_id)
 
         console.print(rich_tree)
+        if prediction is not None and prediction.remaining:
+            note = f", {len(prediction.estimated)} without history" if prediction.estimated else ""
+            console.print(
+                f"Predicted makespan: {_format_secs(prediction.makespan)} "
+                f"for {prediction.remaining} remaining task(s) on {parallel} worker(s){note}"
+            )
+            console.print(
+                f"Critical path ({_format_secs(prediction.critical_path_secs)}): "
+                f"{' -> '.join(prediction.critical_path)}"
+            )
 
 
 @main.command()
@@ -566,21 +626,9 @@ def reports(tree_path, report_dir, output_format, task_id):
             console.print("[yellow]No reports directory found[/yellow]")
         return
 
-    all_reports = []
-    for fname in sorted(report_dir.glob("*.json")):
-        try:
-            data = json.loads(fname.read_text())
-            if task_id is None or data.get("task_id") == task_id:
-                all_reports.append(data)
-        except Exception:
-            pass
+    from agent_arborist.reports import load_reports
 
-    summary = {
-        "total": len(all_reports),
-        "passed": sum(1 for r in all_reports if r.get("result") == "pass"),
-        "failed": sum(1 for r in all_reports if r.get("result") == "fail"),
-        "avg_retries": round(sum(r.get("retries", 0) for r in all_reports) / len(all_reports), 2) if all_reports else 0
-    }
+    all_reports, summary = load_reports(report_dir, target, task_id=task_id)
 
     if output_format == "json":
         print(json.dumps({"reports": all_reports, "summary": summary}, indent=2))
@@ -605,7 +653,7 @@ def reports(tree_path, report_dir, output_format, task_id):
 @click.option("--show", "show_file", default=None, help="Show content of a specific log file")
 def logs(tree_path, log_dir, output_format, task_id, show_file):
     """List task execution history (commits + log files)."""
-    from agent_arborist.git.state import get_task_commit_history
+    from agent_arborist.git.state import scan_task_commits
     from agent_arborist.tree.model import TaskTree
 
     target = Path(_default_repo()).resolve()
@@ -630,20 +678,26 @@ def logs(tree_path, log_dir, output_format, task_id, show_file):
         if not log_file.exists():
             console.print(f"[red]Log file not found:[/red] {show_file}")
             sys.exit(1)
-        print(log_file.read_text())
+        if log_file.name.endswith(".gz"):
+            import gzip
+
+            with gzip.open(log_file, "rt", errors="replace") as f:
+                print(f.read())
+        else:
+            print(log_file.read_text())
         return
 
     tree = TaskTree.from_dict(json.loads(tree_path.read_text()))
 
-    # Gather commit history per task
+    # Gather commit history per task (one git log for all of them)
+    all_commits = scan_task_commits(target, spec_id=spec_id)
     commits_by_task = {}
     for node in tree.leaves():
         tid = node.id
         if task_id is not None and tid != task_id:
             continue
-        commits = get_task_commit_history(tid, target, spec_id=spec_id)
-        if commits:
-            commits_by_task[tid] = commits
+        if all_commits.get(tid):
+            commits_by_task[tid] = all_commits[tid]
 
     # Gather log files per task by searching for files matching known task IDs
     from agent_arborist.dashboard.logs import scan_log_files
@@ -741,6 +795,16 @@ def dashboard(tree_path, port, report_dir, log_dir):
     start_dashboard(tree_path, report_dir, log_dir, port)
 
 
+def _format_secs(secs: float) -> str:
+    minutes, secs = divmod(int(round(secs)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
 def _load_tree(tree_path: Path):
     from agent_arborist.tree.model import TaskTree
     if not tree_path.exists():
@@ -85,6 +85,7 @@ class DefaultsConfig:
     model: str | None = None
     output_format: str = "json"
     container_mode: str = "auto"
+    container_shell: bool = False
     quiet: bool = False
     max_retries: int = 5
     base_branch: str = "main"
@@ -118,6 +119,7 @@ class DefaultsConfig:
             "model": self.model,
             "output_format": self.output_format,
             "container_mode": self.container_mode,
+            "container_shell": self.container_shell,
             "quiet": self.quiet,
             "max_retries": self.max_retries,
             "base_branch": self.base_branch,
@@ -144,6 +146,7 @@ class DefaultsConfig:
             model=data.get("model"),
             output_format=data.get("output_format", "json"),
             container_mode=data.get("container_mode", "auto"),
+            container_shell=data.get("container_shell", False),
             quiet=data.get("quiet", False),
             max_retries=data.get("max_retries", 5),
         )
@@ -302,10 +305,27 @@ class TestingConfig:
     """Testing/test command configuration."""
 
     timeout: int | None = None
+    cache: bool = False
+    parallel: int = 1
+    fail_fast: bool = True
+    compress_logs: bool = False
+
+    def validate(self) -> None:
+        """Validate test configuration."""
+        if self.parallel <= 0:
+            raise ConfigValidationError(
+                f"test parallel must be positive, got {self.parallel}"
+            )
 
     def to_dict(self, exclude_none: bool = False) -> dict[str, Any]:
         """Convert to dictionary."""
-        result = {"timeout": self.timeout}
+        result = {
+            "timeout": self.timeout,
+            "cache": self.cache,
+            "parallel": self.parallel,
+            "fail_fast": self.fail_fast,
+            "compress_logs": self.compress_logs,
+        }
         if exclude_none:
             return {k: v for k, v in result.items() if v is not None}
         return result
@@ -323,6 +343,10 @@ class TestingConfig:
 
         return cls(
             timeout=data.get("timeout"),
+            cache=data.get("cache", False),
+            parallel=data.get("parallel", 1),
+            fail_fast=data.get("fail_fast", True),
+            compress_logs=data.get("compress_logs", False),
         )
 
 
@@ -721,6 +745,7 @@ class ArboristConfig:
         """Validate entire configuration."""
         self.defaults.validate()
         self.timeouts.validate()
+        self.test.validate()
 
         # Validate step names
         for step_name in self.steps:
@@ -872,6 +897,8 @@ def merge_configs(*configs: ArboristConfig) -> ArboristConfig:
             result.defaults.output_format = config.defaults.output_format
         if config.defaults.container_mode != "auto":  # non-default
             result.defaults.container_mode = config.defaults.container_mode
+        if config.defaults.container_shell:  # non-default
+            result.defaults.container_shell = config.defaults.container_shell
         if config.defaults.quiet:  # non-default
             result.defaults.quiet = config.defaults.quiet
         if config.defaults.max_retries != 5:  # non-default
@@ -903,6 +930,14 @@ def merge_configs(*configs: ArboristConfig) -> ArboristConfig:
         # Merge test config
         if config.test.timeout is not None:
             result.test.timeout = config.test.timeout
+        if config.test.cache:  # non-default
+            result.test.cache = True
+        if config.test.parallel != 1:  # non-default
+            result.test.parallel = config.test.parallel
+        if not config.test.fail_fast:  # non-default
+            result.test.fail_fast = False
+        if config.test.compress_logs:  # non-default
+            result.test.compress_logs = True
 
         # Merge paths (only non-default values)
         if config.paths.worktrees != "worktrees":
@@ -1182,6 +1217,8 @@ def generate_config_template() -> dict[str, Any]:
             "_comment_output_format": f"Output format. Valid: {', '.join(VALID_OUTPUT_FORMATS)}",
             "container_mode": "auto",
             "_comment_container_mode": f"Container mode. Valid: {', '.join(VALID_CONTAINER_MODES)}",
+            "container_shell": False,
+            "_comment_container_shell": "Run container commands through one long-lived shell instead of an exec each",
             "quiet": False,
             "_comment_quiet": "Suppress non-essential output",
             "max_retries": 5,
@@ -1226,6 +1263,14 @@ def generate_config_template() -> dict[str, Any]:
         "test": {
             "timeout": None,
             "_comment_timeout": "Test timeout in seconds",
+            "cache": False,
+            "_comment_cache": "Reuse passing test results for an unchanged tree, command and container config (ignored files are not part of the key)",
+            "parallel": 1,
+            "_comment_parallel": "Max test commands of one task run at once (setup/teardown are barriers)",
+            "fail_fast": True,
+            "_comment_fail_fast": "Stop a retryable attempt's tests at the first failing command",
+            "compress_logs": False,
+            "_comment_compress_logs": "Gzip each attempt's test log (.log.gz) once the step finishes",
         },
         "paths": {
             "worktrees": "worktrees",
@@ -28,5 +28,7 @@ TRAILER_TEST_PASSED = f"{TRAILER_PREFIX}-Test-Passed"
 TRAILER_TEST_FAILED = f"{TRAILER_PREFIX}-Test-Failed"
 TRAILER_TEST_SKIPPED = f"{TRAILER_PREFIX}-Test-Skipped"
 TRAILER_TEST_RUNTIME = f"{TRAILER_PREFIX}-Test-Runtime"
+TRAILER_TEST_CACHED = f"{TRAILER_PREFIX}-Test-Cached"
+TRAILER_TEST_SKIPPED_SUITES = f"{TRAILER_PREFIX}-Test-Skipped-Suites"
 
 DEFAULT_MAX_RETRIES = 5
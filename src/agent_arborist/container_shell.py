@@ -0,0 +1,262 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Long-lived shell agent inside a devcontainer.
+
+One ``docker exec -i`` runs a small POSIX sh loop (``AGENT_SCRIPT``) for
+the whole session; commands are sent to it over stdin instead of paying a
+process and container attach per command. Only ``sh`` is required in the
+image.
+
+Protocol, one line per field:
+
+- request: ``<id>`` then the command with ``\\`` and newlines escaped for
+  ``printf %b``
+- replies: ``R`` (ready), ``P <id> <pid>`` (started; with ``setsid`` the
+  pid leads the command's process group), ``O <id> <line>`` / ``E <id> <line>`` (stdout / stderr),
+  ``X <id> <exit code>`` (finished)
+
+The agent runs one command at a time; ``ContainerShell.run`` returns None
+while it is busy or after it died, and callers fall back to a plain exec.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import shlex
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# How often a running command checks its stop event.
+POLL_SECS = 0.1
+# How long a killed command gets to report its exit before the agent is dropped.
+KILL_GRACE_SECS = 5.0
+
+# Each command runs under ``setsid`` (util-linux or busybox) so it leads
+# its own process group, and reports that pid itself; a timeout then kills
+# everything the command spawned. Without setsid only the command's own
+# shell can be killed.
+AGENT_SCRIPT = r"""exec 4>&1
+st="${TMPDIR:-/tmp}/arborist-shell.$$"
+if command -v setsid >/dev/null 2>&1; then ss=setsid; else ss=; fi
+tag() { while IFS= read -r l || [ -n "$l" ]; do printf '%s %s %s\n' "$1" "$2" "$l" >&4; done; }
+printf 'R\n' >&4
+while IFS= read -r id && IFS= read -r line; do
+  cmd=$(printf '%b' "$line")
+  { { $ss sh -c 'printf "P %s %s\n" "$1" "$$" >&4; exec 4>&-; exec sh -c "$2"' _ "$id" "$cmd" </dev/null
+      echo $? >"$st.$id"; } 2>&1 1>&3 | tag E "$id"; } 3>&1 | tag O "$id"
+  printf 'X %s %s\n' "$id" "$(cat "$st.$id" 2>/dev/null || echo 255)" >&4
+  rm -f "$st.$id"
+done
+"""
+
+OutputCallback = Callable[[str, str], None]
+
+
+def encode_command(cmd: list[str] | str) -> str:
+    """One request line for *cmd*; a list is shell-quoted like ``sh -c`` would need."""
+    if not isinstance(cmd, str):
+        cmd = shlex.join(cmd)
+    return cmd.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+@dataclass
+class ShellRun:
+    """How one command in the agent ended; its output went to ``on_output``."""
+
+    returncode: int | None  # None if timed out or stopped
+    timed_out: bool = False
+    stopped: bool = False
+
+
+class ContainerShell:
+    """Host side of the in-container shell agent.
+
+    *argv* starts ``sh -c AGENT_SCRIPT`` in the container with stdin open
+    (``docker exec -i ...``); *exec_argv* turns a shell string into a
+    one-off exec in the same container, used to kill timed-out commands.
+    """
+
+    def __init__(self, argv: list[str], exec_argv: Callable[[str], list[str]]):
+        self.argv = argv
+        self.exec_argv = exec_argv
+        self._proc: subprocess.Popen | None = None
+        self._reader: threading.Thread | None = None
+        self._events: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self, timeout: float = 30) -> bool:
+        """Start the agent and wait for it to report ready."""
+        try:
+            self._proc = subprocess.Popen(
+                self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, encoding="utf-8", errors="replace", bufsize=1,
+            )
+        except OSError as e:
+            logger.debug("Could not start container shell: %s", e)
+            return False
+        self._reader = threading.Thread(target=self._read, args=(self._proc,), daemon=True)
+        self._reader.start()
+        try:
+            event = self._events.get(timeout=timeout)
+        except queue.Empty:
+            event = None
+        if event != ("R",):
+            logger.debug("Container shell did not come up: %s", event)
+            self.close()
+            return False
+        logger.debug("Container shell started (pid %d)", self._proc.pid)
+        return True
+
+    def _read(self, proc: subprocess.Popen) -> None:
+        try:
+            for line in proc.stdout:
+                kind, _, rest = line.rstrip("\n").partition(" ")
+                if kind in ("O", "E"):
+                    cid, _, text = rest.partition(" ")
+                    self._events.put((kind, cid, text))
+                elif kind in ("P", "X"):
+                    self._events.put((kind, *rest.split(" ", 1)))
+                elif kind == "R":
+                    self._events.put(("R",))
+        except (OSError, ValueError):
+            pass  # stdout closed under us by close()
+        self._events.put(("EOF",))
+
+    def run(
+        self,
+        cmd: list[str] | str,
+        timeout: float,
+        *,
+        on_output: OutputCallback | None = None,
+        stop: threading.Event | None = None,
+    ) -> ShellRun | None:
+        """Run *cmd* in the agent, streaming ``(stream, line)`` to *on_output*.
+
+        Returns None without running anything if the agent is busy or not
+        running. On timeout or *stop* the command's process group is killed.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if not self.alive:
+                return None
+            self._next_id += 1
+            cid = str(self._next_id)
+            try:
+                self._proc.stdin.write(f"{cid}\n{encode_command(cmd)}\n")
+                self._proc.stdin.flush()
+            except (OSError, ValueError):
+                self.close()
+                return None
+            return self._wait(cid, time.monotonic() + timeout, on_output, stop)
+        finally:
+            self._lock.release()
+
+    async def arun(
+        self, cmd: list[str] | str, timeout: float, *, on_output: OutputCallback | None = None,
+    ) -> ShellRun | None:
+        """``run`` on a worker thread; cancelling the caller kills the command."""
+        stop = threading.Event()
+        try:
+            return await asyncio.to_thread(self.run, cmd, timeout, on_output=on_output, stop=stop)
+        except asyncio.CancelledError:
+            stop.set()
+            raise
+
+    def _wait(
+        self, cid: str, deadline: float,
+        on_output: OutputCallback | None, stop: threading.Event | None,
+    ) -> ShellRun:
+        pid: str | None = None
+        ending: ShellRun | None = None
+        grace_until = 0.0
+        while True:
+            now = time.monotonic()
+            if ending is None:
+                if stop is not None and stop.is_set():
+                    ending = ShellRun(None, stopped=True)
+                elif now >= deadline:
+                    ending = ShellRun(None, timed_out=True)
+                if ending is not None:
+                    self._kill(pid)
+                    grace_until = now + KILL_GRACE_SECS
+            elif now >= grace_until:
+                logger.warning("Container shell did not finish a killed command; dropping it")
+                self.close()
+                return ending
+            wait = (grace_until if ending is not None else deadline) - now
+            try:
+                event = self._events.get(timeout=max(0.0, min(wait, POLL_SECS)))
+            except queue.Empty:
+                continue
+            kind = event[0]
+            if kind == "EOF":
+                self.close()
+                return ending or ShellRun(-1)
+            if len(event) < 2 or event[1] != cid:
+                continue  # left over from an earlier, killed command
+            if kind == "P":
+                pid = event[2] if len(event) > 2 else None
+            elif kind in ("O", "E") and on_output is not None and ending is None:
+                on_output("stdout" if kind == "O" else "stderr", event[2] + "\n")
+            elif kind == "X":
+                if ending is not None:
+                    return ending
+                try:
+                    return ShellRun(int(event[2]))
+                except (IndexError, ValueError):
+                    return ShellRun(-1)
+
+    def _kill(self, pid: str | None) -> None:
+        if pid is None:
+            return
+        try:
+            subprocess.run(
+                self.exec_argv(f"kill -9 -{pid} 2>/dev/null || kill -9 {pid}"),
+                capture_output=True, timeout=KILL_GRACE_SECS,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning("Could not kill command in container shell: %s", e)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        reader, self._reader = self._reader, None
+        if reader is not None and reader is not threading.current_thread():
+            # EOF follows the exit unless a leftover process still holds the pipe.
+            reader.join(timeout=2)
+        proc.stdout.close()
@@ -0,0 +1,113 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Precomputed dashboard responses, reused until their inputs change.
+
+Each endpoint's JSON is cached against a key built from cheap probes (HEAD
+via the pooled cat-file process, directory mtimes via ``stat``), so an idle
+dashboard answers polls without running git or rereading files. Bodies carry
+strong ETags; a matching ``If-None-Match`` gets ``304 Not Modified``.
+
+``/api/logs`` is rebuilt per request instead: appending to a log does not
+touch its directory, and ``LogIndex`` already re-stats only active files.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from agent_arborist.git.repo import GitError, git_rev_parse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    key: Hashable
+    body: bytes
+    etag: str
+
+
+def head_sha(cwd: Path) -> str | None:
+    try:
+        return git_rev_parse("HEAD", cwd)
+    except GitError:
+        return None
+
+
+def dir_mtime(path: Path | None) -> int | None:
+    """``st_mtime_ns`` of a directory; changes when entries are added, removed or renamed."""
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def body_entry(model: BaseModel, key: Hashable = None) -> CachedBody:
+    """Serialize *model* with its ETag, for responses that aren't cached."""
+    body = model.model_dump_json().encode()
+    return CachedBody(key=key, body=body, etag=_etag(body))
+
+
+class ResponseCache:
+    """One cached JSON body per endpoint name, replaced when its key changes."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, CachedBody] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, key: Hashable, build: Callable[[], BaseModel]) -> CachedBody:
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None and entry.key == key:
+            return entry
+        logger.debug("Rebuilding dashboard %s", name)
+        entry = body_entry(build(), key)
+        with self._lock:
+            self._entries[name] = entry
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def cached_response(request: Request, entry: CachedBody) -> Response:
+    """The cached body, or an empty 304 if the client already has it."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,128 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Server-Sent Events for the dashboard.
+
+One ``EventHub`` per app runs a single watcher while at least one client
+is connected. The watcher probes cheap inputs (HEAD, directory mtimes)
+and publishes a bare ``changed`` event when they change; clients then
+refetch the (cached) REST endpoints.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event: str, data: dict, event_id: int | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class EventHub:
+    """Fans one watcher's change notifications out to any number of SSE clients.
+
+    *probe* must be cheap (it runs every *interval* seconds in a worker
+    thread); a new result is one ``changed`` event.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], Hashable],
+        *,
+        interval: float = 1.0,
+        keepalive: float = 15.0,
+    ):
+        self.probe = probe
+        self.interval = interval
+        self.keepalive = keepalive
+        self._subscribers: set[asyncio.Queue] = set()
+        self._watcher: asyncio.Task | None = None
+        self._next_id = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        # One slot: a client that hasn't read its pending "changed" yet
+        # needs no second one.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.add(queue)
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    def publish(self, event: str, data: dict) -> None:
+        self._next_id += 1
+        message = (self._next_id, event, data)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                pass
+
+    async def _watch(self) -> None:
+        key: Hashable = None
+        try:
+            key = await asyncio.to_thread(self.probe)
+        except Exception as e:
+            logger.warning("Dashboard watcher probe failed: %s", e)
+        logger.debug("Dashboard event watcher started")
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    new_key = await asyncio.to_thread(self.probe)
+                except Exception as e:
+                    logger.warning("Dashboard watcher probe failed: %s", e)
+                    continue
+                if new_key != key:
+                    key = new_key
+                    self.publish("changed", {})
+        finally:
+            logger.debug("Dashboard event watcher stopped")
+
+    async def stream(self, is_disconnected: Callable[[], Awaitable[bool]] | None = None) -> AsyncIterator[str]:
+        """SSE text for one client, until it disconnects."""
+        queue = self.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            yield format_event("hello", {})
+            while True:
+                try:
+                    event_id, event, data = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(event, data, event_id)
+        finally:
+            self.unsubscribe(queue)
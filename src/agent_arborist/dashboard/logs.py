@@ -12,51 +12,282 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Scan log files on disk, keyed by known task IDs."""
+"""Scan log files on disk, keyed by known task IDs, and read them in pieces."""
 
 from __future__ import annotations
 
+import asyncio
+import os
 import re
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
 
+CHUNK_SIZE = 64 * 1024
 
-def scan_log_files(
-    log_dir: Path,
-    task_ids: list[str],
-) -> dict[str, list[dict[str, str | int]]]:
-    """Find log files for the given task IDs.
 
-    Log filenames are written by ``_write_log`` as ``{task_id}_{phase}_{timestamp}.log``.
-    Task IDs are free-form, so we glob for ``{task_id}_*.log`` per ID rather than
-    trying to regex-parse the ID out of the filename.
+_TIMESTAMP = re.compile(r"_(\d{8}T\d{6})$")
 
-    Returns ``{task_id: [{phase, timestamp, filename, size}, ...]}``,
-    sorted by timestamp within each task.
+# Files modified this recently are re-statted on every lookup: they may
+# still be growing, and appends don't change the directory mtime.
+ACTIVE_WINDOW = 300.0
+
+
+@dataclass
+class _LogFile:
+    name: str
+    stem: str
+    size: int
+    mtime: float
+
+
+class LogIndex:
+    """Cached listing of one log directory, refreshed from its mtime.
+
+    A single ``os.scandir`` pass replaces per-task globbing. The listing is
+    reused while the directory mtime is unchanged; only recently modified
+    files are re-statted so growing logs report current sizes.
     """
-    if not log_dir.exists():
-        return {}
 
-    result: dict[str, list[dict[str, str | int]]] = {}
-    for tid in task_ids:
-        entries: list[dict[str, str | int]] = []
-        for fname in sorted(log_dir.glob(f"{tid}_*.log")):
-            suffix = fname.stem[len(tid) + 1:]  # strip "{tid}_"
-            ts_match = re.search(r"_(\d{8}T\d{6})$", suffix)
+    def __init__(self, log_dir: Path):
+        self.log_dir = log_dir
+        self._files: dict[str, _LogFile] = {}
+        self._dir_mtime: int | None = None
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        try:
+            dir_mtime = os.stat(self.log_dir).st_mtime_ns
+        except OSError:
+            self._files, self._dir_mtime = {}, None
+            return
+        now = time.time()
+        if dir_mtime != self._dir_mtime:
+            files: dict[str, _LogFile] = {}
+            with os.scandir(self.log_dir) as it:
+                for entry in it:
+                    stem = _log_stem(entry.name)
+                    if stem is None:
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    files[entry.name] = _LogFile(entry.name, stem, st.st_size, st.st_mtime)
+            self._files = files
+            # An mtime this close to now could hide a same-tick change; look again next time.
+            self._dir_mtime = dir_mtime if dir_mtime / 1e9 < now - 1.0 else None
+            return
+        for f in self._files.values():
+            if now - f.mtime < ACTIVE_WINDOW:
+                try:
+                    st = os.stat(self.log_dir / f.name)
+                except OSError:
+                    continue
+                f.size, f.mtime = st.st_size, st.st_mtime
+
+    def entries(self, task_ids: Iterable[str]) -> dict[str, list[dict[str, str | int]]]:
+        """Log entries per task ID, sorted by timestamp within each task.
+
+        Each file goes to the longest task ID that prefixes its name followed
+        by ``_``, so ``T1_a_test_*.log`` belongs to ``T1_a``, not ``T1``.
+        """
+        ids = set(task_ids)
+        with self._lock:
+            self._refresh()
+            files = list(self._files.values())
+
+        result: dict[str, list[dict[str, str | int]]] = {}
+        for f in files:
+            tid = _owning_task(f.stem, ids)
+            if tid is None:
+                continue
+            suffix = f.stem[len(tid) + 1:]
+            ts_match = _TIMESTAMP.search(suffix)
             if ts_match:
                 timestamp = ts_match.group(1)
                 phase = suffix[: ts_match.start()]
             else:
                 timestamp = ""
                 phase = suffix
-            entries.append({
+            result.setdefault(tid, []).append({
                 "task_id": tid,
                 "phase": phase,
                 "timestamp": timestamp,
-                "filename": fname.name,
-                "size": fname.stat().st_size,
+                "filename": f.name,
+                "size": f.size,
             })
-        if entries:
-            entries.sort(key=lambda e: e["timestamp"])
-            result[tid] = entries
+        for entries in result.values():
+            entries.sort(key=lambda e: (e["timestamp"], e["filename"]))
+        return result
+
+
+def _log_stem(name: str) -> str | None:
+    """Name without ``.log`` (or ``.log.gz`` for compressed test logs), else None."""
+    for ext in (".log", ".log.gz"):
+        if name.endswith(ext):
+            return name[: -len(ext)]
+    return None
+
 
-    return result
+def _owning_task(stem: str, ids: set[str]) -> str | None:
+    idx = stem.rfind("_")
+    while idx > 0:
+        if stem[:idx] in ids:
+            return stem[:idx]
+        idx = stem.rfind("_", 0, idx)
+    return None
+
+
+_indexes: dict[str, LogIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_log_index(log_dir: Path) -> LogIndex:
+    """Shared index for *log_dir*, created on first use."""
+    key = str(Path(log_dir).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = LogIndex(Path(key))
+        return index
+
+
+def scan_log_files(
+    log_dir: Path,
+    task_ids: list[str],
+) -> dict[str, list[dict[str, str | int]]]:
+    """Find log files for the given task IDs.
+
+    Log filenames are written by ``_write_log`` as ``{task_id}_{phase}_{timestamp}.log``
+    (``.log.gz`` once a test log is compressed).
+    Task IDs are free-form and may contain ``_``, so each file is matched to
+    the longest known ID that prefixes it (see ``LogIndex.entries``).
+
+    Returns ``{task_id: [{phase, timestamp, filename, size}, ...]}``,
+    sorted by timestamp within each task.
+    """
+    if not log_dir.exists():
+        return {}
+    return get_log_index(log_dir).entries(task_ids)
+
+
+class RangeNotSatisfiable(ValueError):
+    """The requested byte range lies outside the file."""
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` Range header into an inclusive ``(start, end)``.
+
+    Returns None when the header should be ignored (absent, malformed or
+    multi-range), which means serving the whole file.
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    first, _, last = spec.partition("-")
+    first, last = first.strip(), last.strip()
+    if not (first.isdigit() or first == "") or not (last.isdigit() or last == ""):
+        return None
+    if first == "":
+        if last == "":
+            return None
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable(spec)
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(spec)
+    return start, min(end, size - 1)
+
+
+def tail_offset(path: Path, lines: int) -> int:
+    """Byte offset where the last *lines* lines of the file begin.
+
+    Reads backwards from the end in blocks, so cost depends on the tail
+    size, not the file size.
+    """
+    if lines <= 0:
+        return path.stat().st_size
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        if pos == 0:
+            return 0
+        f.seek(pos - 1)
+        # A trailing newline ends the last line rather than starting a new one.
+        wanted = lines + 1 if f.read(1) == b"\n" else lines
+        while pos > 0:
+            step = min(CHUNK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            idx = len(block)
+            while True:
+                idx = block.rfind(b"\n", 0, idx)
+                if idx < 0:
+                    break
+                wanted -= 1
+                if wanted == 0:
+                    return pos + idx + 1
+        return 0
+
+
+def iter_file(path: Path, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+    """Yield ``path[start:end+1]`` (or to EOF) in ``CHUNK_SIZE`` pieces."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+            if not chunk:
+                return
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+async def follow_file(
+    path: Path,
+    start: int = 0,
+    *,
+    poll: float = 0.5,
+    idle_timeout: float = 30.0,
+    is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+) -> AsyncIterator[bytes]:
+    """Stream the file from *start*, then keep yielding bytes as it grows.
+
+    Stops once the file has not grown for *idle_timeout* seconds, when it
+    shrinks (rotated or rewritten), or when the client goes away.
+    """
+    pos = start
+    idle = 0.0
+    with open(path, "rb") as f:
+        while True:
+            f.seek(pos)
+            chunk = f.read(CHUNK_SIZE)
+            if chunk:
+                pos += len(chunk)
+                idle = 0.0
+                yield chunk
+                continue
+            if idle >= idle_timeout:
+                return
+            if is_disconnected is not None and await is_disconnected():
+                return
+            await asyncio.sleep(poll)
+            idle += poll
+            try:
+                if os.stat(path).st_size < pos:
+                    return
+            except OSError:
+                return
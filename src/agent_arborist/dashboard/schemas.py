@@ -15,7 +15,7 @@
 """Pydantic schemas for dashboard API responses."""
 
 from pydantic import BaseModel
-from typing import Dict, List, Literal
+from typing import Dict, List, Literal, Optional
 
 
 class TaskCommit(BaseModel):
@@ -47,6 +47,14 @@ class Report(BaseModel):
     task_id: str
     result: Literal["pass", "fail"]
     retries: int
+    spec_id: Optional[str] = None
+    duration_secs: Optional[float] = None
+    runner: Optional[str] = None
+    model: Optional[str] = None
+    tests_passed: Optional[int] = None
+    tests_failed: Optional[int] = None
+    tests_skipped: Optional[int] = None
+    completed_at: Optional[str] = None
 
 
 class ReportsOutput(BaseModel):
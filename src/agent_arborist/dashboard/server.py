@@ -14,9 +14,9 @@
 
 """Dashboard FastAPI server - read-only monitoring interface."""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, StreamingResponse
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
@@ -24,11 +24,13 @@ import json
 
 from rich.console import Console
 
-from agent_arborist.git.state import (
-    scan_task_states, get_task_commit_history,
-)
+from agent_arborist.git.state import scan_task_history
+from agent_arborist.reports import load_reports
 from agent_arborist.tree.model import TaskTree
 from agent_arborist.git.repo import git_current_branch, spec_id_from_branch
+from agent_arborist.dashboard.cache import ResponseCache, body_entry, cached_response, dir_mtime, head_sha
+from agent_arborist.dashboard.events import EventHub
+from agent_arborist.dashboard.logs import RangeNotSatisfiable, follow_file, iter_file, parse_range, tail_offset
 from agent_arborist.dashboard.schemas import (
     StatusOutput, ReportsOutput, LogsOutput, TaskStateData, TaskCommit,
     Report, LogEntry,
@@ -36,6 +38,8 @@ from agent_arborist.dashboard.schemas import (
 
 console = Console()
 
+LOG_MEDIA_TYPE = "text/plain; charset=utf-8"
+
 
 def create_app(tree_path: Path, report_dir: Optional[Path], log_dir: Optional[Path]) -> FastAPI:
     """Create and configure the FastAPI application."""
@@ -68,6 +72,23 @@ def create_app(tree_path: Path, report_dir: Optional[Path], log_dir: Optional[Pa
     report_dir = report_dir.resolve() if report_dir else None
     log_dir = log_dir.resolve() if log_dir else None
 
+    # Status and reports are rebuilt only when HEAD or the report listing changes.
+    cache = ResponseCache()
+    app.state.response_cache = cache
+
+    def _status_key() -> tuple:
+        return (head_sha(target),)
+
+    def _reports_key() -> tuple:
+        return (head_sha(target), dir_mtime(report_dir))
+
+    def _probe() -> tuple:
+        return (head_sha(target), dir_mtime(report_dir), dir_mtime(log_dir))
+
+    # One watcher for all /api/events clients, running only while any are connected.
+    hub = EventHub(_probe)
+    app.state.event_hub = hub
+
     @app.get("/", response_class=HTMLResponse)
     async def serve_dashboard():
         """Serve the dashboard HTML page."""
@@ -76,19 +97,27 @@ def create_app(tree_path: Path, report_dir: Optional[Path], log_dir: Optional[Pa
             return "<html><body><h1>Dashboard template not found</h1></body></html>"
         return template_path.read_text()
 
+    # The JSON endpoints are plain ``def``: FastAPI runs them in its thread
+    # pool, so git and sqlite work never stalls the event loop that serves
+    # /api/events and followed logs.
+
     @app.get("/api/status", response_model=StatusOutput)
-    async def get_status() -> StatusOutput:
+    def get_status(request: Request) -> Response:
         """Get task status data with per-task commit history."""
-        task_states, task_trailers = scan_task_states(tree, target, spec_id=spec_id)
+        return cached_response(request, cache.get("status", _status_key(), _build_status))
+
+    def _build_status() -> StatusOutput:
+        history = scan_task_history(tree, target, spec_id=spec_id)
+        task_states = history.states
 
         tasks: Dict[str, TaskStateData] = {}
         for node_id, node in tree.nodes.items():
-            trailers = task_trailers.get(node_id, {})
+            trailers = history.trailers.get(node_id, {})
             state = task_states.get(node_id)
 
             commits: List[TaskCommit] = []
             if node.is_leaf:
-                raw_commits = get_task_commit_history(node_id, target, spec_id=spec_id)
+                raw_commits = history.commits.get(node_id, [])
                 commits = [
                     TaskCommit(
                         sha=c["sha"],
@@ -120,31 +149,34 @@ def create_app(tree_path: Path, report_dir: Optional[Path], log_dir: Optional[Pa
         )
 
     @app.get("/api/reports", response_model=ReportsOutput)
-    async def get_reports() -> ReportsOutput:
+    def get_reports(request: Request) -> Response:
         """Get task execution reports."""
+        return cached_response(request, cache.get("reports", _reports_key(), _build_reports))
+
+    def _build_reports() -> ReportsOutput:
         if not report_dir.exists():
             return ReportsOutput(reports=[], summary={"total": 0, "passed": 0, "failed": 0, "avg_retries": 0})
 
+        # New JSON files are imported into the store; the summary is one query.
+        data, summary = load_reports(report_dir, target)
         reports: List[Report] = []
-        for fname in sorted(report_dir.glob("*.json")):
+        for item in data:
             try:
-                data = json.loads(fname.read_text())
-                reports.append(Report(**data))
+                reports.append(Report(**item))
             except Exception:
                 pass
 
-        summary = {
-            "total": len(reports),
-            "passed": sum(1 for r in reports if r.result == "pass"),
-            "failed": sum(1 for r in reports if r.result == "fail"),
-            "avg_retries": round(sum(r.retries for r in reports) / len(reports), 2) if reports else 0
-        }
-
         return ReportsOutput(reports=reports, summary=summary)
 
     @app.get("/api/logs", response_model=LogsOutput)
-    async def get_logs() -> LogsOutput:
-        """Get log file listing for detail viewing."""
+    def get_logs(request: Request) -> Response:
+        """Get log file listing for detail viewing.
+
+        Not cached: a growing log changes its size but not the directory.
+        """
+        return cached_response(request, body_entry(_build_logs()))
+
+    def _build_logs() -> LogsOutput:
         from agent_arborist.dashboard.logs import scan_log_files
 
         if not log_dir or not log_dir.exists():
@@ -157,9 +189,28 @@ def create_app(tree_path: Path, report_dir: Optional[Path], log_dir: Optional[Pa
 
         return LogsOutput(logs=logs)
 
+    @app.get("/api/events")
+    async def get_events(request: Request) -> StreamingResponse:
+        """Server-Sent Events: a ``changed`` event whenever HEAD, reports or logs change."""
+        return StreamingResponse(
+            hub.stream(request.is_disconnected),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     @app.get("/api/log/{filename:path}", response_class=PlainTextResponse)
-    async def get_log_file(filename: str) -> str:
-        """Get individual log file content securely."""
+    async def get_log_file(
+        filename: str,
+        request: Request,
+        tail: Optional[int] = Query(None, ge=0, description="Only the last N lines"),
+        follow: bool = Query(False, description="Keep streaming bytes appended to the file"),
+    ) -> Response:
+        """Get individual log file content securely.
+
+        Honours a single-range ``Range`` header (206), ``?tail=N`` and
+        ``?follow=true``; the file is streamed, never read whole. Compressed
+        ``.log.gz`` files are sent whole with ``Content-Encoding: gzip``.
+        """
         if not log_dir or not log_dir.exists():
             raise HTTPException(status_code=404, detail="Logs directory not found")
 
@@ -172,7 +223,38 @@ def create_app(tree_path: Path, report_dir: Optional[Path], log_dir: Optional[Pa
         if not log_file.exists() or not log_file.is_file():
             raise HTTPException(status_code=404, detail="Log file not found")
 
-        return log_file.read_text()
+        if log_file.name.endswith(".gz"):
+            # Compressed logs are finished; the browser inflates them.
+            return FileResponse(log_file, media_type=LOG_MEDIA_TYPE, headers={"Content-Encoding": "gzip"})
+
+        if follow:
+            start = tail_offset(log_file, tail) if tail is not None else 0
+            return StreamingResponse(
+                follow_file(log_file, start, is_disconnected=request.is_disconnected),
+                media_type=LOG_MEDIA_TYPE,
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        size = log_file.stat().st_size
+        headers = {"Accept-Ranges": "bytes"}
+        if tail is not None:
+            start = tail_offset(log_file, tail)
+            headers["Content-Length"] = str(size - start)
+            return StreamingResponse(iter_file(log_file, start, size - 1), media_type=LOG_MEDIA_TYPE, headers=headers)
+
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            raise HTTPException(status_code=416, detail="Range not satisfiable",
+                                headers={"Content-Range": f"bytes */{size}"})
+        if byte_range is None:
+            return FileResponse(log_file, media_type=LOG_MEDIA_TYPE, headers=headers)
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            iter_file(log_file, start, end), status_code=206, media_type=LOG_MEDIA_TYPE, headers=headers,
+        )
 
     return app
 
@@ -14,12 +14,34 @@
 
 """Devcontainer detection, mode resolution, and CLI wrapper."""
 
+import asyncio
+import atexit
+import concurrent.futures
+import hashlib
+import json
 import logging
+import os
+import re
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agent_arborist.container_shell import ContainerShell
 
 logger = logging.getLogger(__name__)
 
+# Seconds a successful liveness check is trusted before probing again.
+LIVENESS_TTL = 60.0
+
+# Whether new sessions start the in-container shell agent (see container_shell.py).
+_shell_enabled = False
+
 
 class DevcontainerError(Exception):
     """Base error for container operations."""
@@ -34,6 +56,57 @@ def has_devcontainer(cwd: Path) -> bool:
     return (cwd / ".devcontainer" / "devcontainer.json").is_file()
 
 
+# Strings are matched so that comment markers inside them are left alone.
+_JSONC_COMMENT = re.compile(r'"(?:\\.|[^"\\])*"|//[^\n]*|/\*.*?\*/', re.S)
+_JSONC_TRAILING_COMMA = re.compile(r'"(?:\\.|[^"\\])*"|,(?=\s*[}\]])')
+
+
+def _keep_strings(match: re.Match) -> str:
+    text = match.group(0)
+    return text if text.startswith('"') else ""
+
+
+def read_devcontainer_config(workspace_folder: Path) -> dict | None:
+    """Parsed ``.devcontainer/devcontainer.json`` (JSON with comments), or None."""
+    try:
+        text = (Path(workspace_folder) / ".devcontainer" / "devcontainer.json").read_text()
+        data = json.loads(_JSONC_TRAILING_COMMA.sub(_keep_strings, _JSONC_COMMENT.sub(_keep_strings, text)))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _dockerfile_path(workspace_folder: Path, config: dict) -> Path | None:
+    """The Dockerfile *config* builds from, resolved against ``.devcontainer/``."""
+    build = config.get("build") if isinstance(config.get("build"), dict) else {}
+    dockerfile = build.get("dockerfile") or config.get("dockerFile")
+    if not isinstance(dockerfile, str) or not dockerfile:
+        return None
+    return (workspace_folder / ".devcontainer" / dockerfile).resolve()
+
+
+def devcontainer_config_hash(workspace_folder: Path) -> str | None:
+    """Content hash of every file under ``.devcontainer/``, or None if absent.
+
+    Stands in for the image identity: the same config builds the same image.
+    A Dockerfile outside ``.devcontainer/`` counts too. Other files in the
+    build context (what ``COPY`` reads) do not; after changing those,
+    remove the cached tag to force a rebuild.
+    """
+    workspace_folder = Path(workspace_folder)
+    config_dir = workspace_folder / ".devcontainer"
+    if not config_dir.is_dir():
+        return None
+    h = hashlib.sha256()
+    for path in sorted(p for p in config_dir.rglob("*") if p.is_file()):
+        h.update(path.relative_to(config_dir).as_posix().encode() + b"\0")
+        h.update(path.read_bytes() + b"\0")
+    dockerfile = _dockerfile_path(workspace_folder, read_devcontainer_config(workspace_folder) or {})
+    if dockerfile is not None and dockerfile.is_file() and config_dir.resolve() not in dockerfile.parents:
+        h.update(b"dockerfile:" + dockerfile.read_bytes() + b"\0")
+    return h.hexdigest()
+
+
 def should_use_container(mode: str, cwd: Path) -> bool:
     """Resolve container mode against workspace detection.
 
@@ -63,19 +136,93 @@ def should_use_container(mode: str, cwd: Path) -> bool:
 # --- CLI wrapper ---
 
 
-def devcontainer_up(workspace_folder: Path, timeout: int = 300) -> None:
+def _up_result(stdout: str | None) -> dict:
+    """The JSON object ``devcontainer up`` prints last, or {} if there is none."""
+    for line in reversed((stdout or "").strip().splitlines()):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return {}
+
+
+# Keys the prebuilt image already covers; the rest of the config still applies.
+_BUILD_KEYS = frozenset({"build", "dockerFile", "context", "features", "overrideFeatureInstallOrder"})
+
+
+def _image_override(workspace_folder: Path, image: str) -> dict | None:
+    """The workspace config with its build replaced by *image*, or None for compose configs.
+
+    Features are not lost with their key: ``devcontainer build`` records
+    what they contribute (lifecycle hooks, ``remoteEnv``, mounts, ...) in
+    the image's ``devcontainer.metadata`` label, which ``up`` merges back in.
+    """
+    config = read_devcontainer_config(workspace_folder)
+    if config is None or "dockerComposeFile" in config:
+        return None
+    override = {k: v for k, v in config.items() if k not in _BUILD_KEYS}
+    override["image"] = image
+    return override
+
+
+def _git_mount_args(workspace_folder: Path) -> list[str]:
+    """``--mount`` args that make a linked worktree's repository visible in its container.
+
+    A worktree's ``.git`` file names the main repository's git dir by host
+    path, which the workspace mount alone doesn't cover; the common git dir
+    is bind-mounted at that same path. Empty for an ordinary checkout.
+    """
+    from agent_arborist.git.repo import _git_dir_of
+
+    if not (Path(workspace_folder) / ".git").is_file():
+        return []
+    git_dir = _git_dir_of(Path(workspace_folder))
+    if git_dir is None:
+        return []
+    try:
+        common = (git_dir / (git_dir / "commondir").read_text().strip()).resolve()
+    except OSError:
+        common = git_dir
+    return ["--mount", f"type=bind,source={common},target={common}"]
+
+
+def devcontainer_up(workspace_folder: Path, timeout: int = 300, *, image: str | None = None) -> dict:
     """Start container for workspace. Idempotent — safe to call if already running.
 
     Args:
         workspace_folder: Path to the workspace (must contain .devcontainer/).
         timeout: Timeout in seconds (default 300s / 5 min).
+        image: Prebuilt image for this config (see ``prebuild_image``). The
+            container starts from it, through ``--override-config``, instead
+            of being built; compose or unreadable configs only get it as
+            ``--cache-from``.
+
+    A linked git worktree also gets its repository's git dir mounted (see
+    ``_git_mount_args``), so git works inside the container.
+
+    Returns:
+        The JSON result ``devcontainer up`` reports (``containerId`` etc.).
     """
     logger.info("Starting devcontainer for %s (timeout=%ds)", workspace_folder, timeout)
+    with tempfile.TemporaryDirectory(prefix="arborist-up-") as tmp:
+        args = ["devcontainer", "up", "--workspace-folder", str(workspace_folder), *_git_mount_args(workspace_folder)]
+        override = _image_override(workspace_folder, image) if image else None
+        if override is not None:
+            # The CLI still labels the container with the workspace's own
+            # config file, so later exec and status checks find it.
+            override_file = Path(tmp) / "devcontainer.json"
+            override_file.write_text(json.dumps(override))
+            args += ["--override-config", str(override_file)]
+        elif image:
+            args += ["--cache-from", image]
+        return _run_up(args, workspace_folder, timeout)
+
+
+def _run_up(args: list[str], workspace_folder: Path, timeout: int) -> dict:
     try:
-        result = subprocess.run(
-            ["devcontainer", "up", "--workspace-folder", str(workspace_folder)],
-            capture_output=True, text=True, timeout=timeout,
-        )
+        result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
     except subprocess.TimeoutExpired:
         logger.error(
             "devcontainer up timed out after %ds for %s", timeout, workspace_folder
@@ -94,6 +241,125 @@ def devcontainer_up(workspace_folder: Path, timeout: int = 300) -> None:
             f"stdout: {result.stdout}\n"
             f"stderr: {result.stderr}"
         )
+    return _up_result(result.stdout)
+
+
+# --- Prebuilt images ---
+
+IMAGE_REPO = "arborist-devcontainer"
+
+
+def cached_image_tag(workspace_folder: Path) -> str | None:
+    """Tag of the prebuilt image for the workspace's ``.devcontainer/`` and build context."""
+    digest = devcontainer_config_hash(Path(workspace_folder))
+    return f"{IMAGE_REPO}:{digest[:16]}" if digest else None
+
+
+def _image_exists(tag: str, timeout: int) -> bool:
+    if shutil.which("docker") is None:
+        return False
+    try:
+        result = subprocess.run(
+            ["docker", "image", "inspect", "--format", "{{.Id}}", tag],
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def _cached_image(workspace_folder: Path, timeout_check: int) -> str | None:
+    """The prebuilt image tag if it exists, waiting for a prebuild in progress.
+
+    A background prebuild (``start_container_warmup``, ``ContainerPool``)
+    holds the image lock while it builds; ``up`` would otherwise start a
+    second, uncached build alongside it.
+    """
+    with _sessions_lock:
+        prebuilt = _prebuilds.get(_session_key(workspace_folder))
+    if prebuilt is not None:
+        # The warm-up thread may not have taken the image lock yet.
+        prebuilt.wait()
+    tag = cached_image_tag(workspace_folder)
+    if tag is None:
+        return None
+    with _session_lock(f"image:{tag}"):
+        return tag if _image_exists(tag, timeout_check) else None
+
+
+def prebuild_image(workspace_folder: Path, timeout: int = 300, timeout_check: int = 30) -> str | None:
+    """Build the workspace's image once per config and build context content.
+
+    The image is tagged ``arborist-devcontainer:<config hash>``; if that tag
+    exists already, from this run or an earlier one, nothing is built, and
+    ``devcontainer up`` starts from the tag without a build of its own.
+    Old tags are never pruned. Returns the tag, or None without a config or
+    if the build failed, in which case ``devcontainer up`` builds as usual.
+    """
+    tag = cached_image_tag(workspace_folder)
+    if tag is None:
+        return None
+    with _session_lock(f"image:{tag}"):
+        if _image_exists(tag, timeout_check):
+            logger.debug("Using cached image %s for %s", tag, workspace_folder)
+            return tag
+        logger.info("Building devcontainer image %s for %s", tag, workspace_folder)
+        try:
+            result = subprocess.run(
+                ["devcontainer", "build", "--workspace-folder", str(workspace_folder), "--image-name", tag],
+                capture_output=True, text=True, timeout=timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning("devcontainer build failed for %s: %s", workspace_folder, e)
+            return None
+        if result.returncode != 0:
+            logger.warning(
+                "devcontainer build failed (exit %d) for %s: %s",
+                result.returncode, workspace_folder, result.stderr,
+            )
+            return None
+    return tag
+
+
+def devcontainer_exec_args(cmd: list[str] | str, workspace_folder: Path) -> list[str]:
+    """Build the ``devcontainer exec`` argv for cmd (str is wrapped in ``sh -c``)."""
+    if isinstance(cmd, str):
+        cmd = ["sh", "-c", cmd]
+    return ["devcontainer", "exec", "--workspace-folder", str(workspace_folder), *cmd]
+
+
+def docker_exec_args(
+    cmd: list[str] | str, session: "ContainerSession", *, interactive: bool = False,
+) -> list[str]:
+    """Build a ``docker exec`` argv equivalent to ``devcontainer exec`` for *session*.
+
+    Uses the user, working directory and environment the devcontainer CLI
+    resolved when the session was registered; requires ``session.can_docker_exec``.
+    The environment is read from ``session.env_file`` so its values (tokens,
+    API keys) never appear on the command line. *interactive* keeps stdin
+    open (``-i``).
+    """
+    if isinstance(cmd, str):
+        cmd = ["sh", "-c", cmd]
+    args = ["docker", "exec", *(["-i"] if interactive else []), "-w", session.remote_workspace_folder]
+    if session.remote_user:
+        args += ["-u", session.remote_user]
+    if session.env_file is not None:
+        args += ["--env-file", str(session.env_file)]
+    return [*args, session.container_id, *cmd]
+
+
+def container_exec_args(cmd: list[str] | str, workspace_folder: Path) -> list[str]:
+    """argv to run *cmd* in the workspace's container.
+
+    ``docker exec`` straight into the registered container when the session
+    has everything it needs, skipping the devcontainer CLI's Node start and
+    config parsing; ``devcontainer exec`` otherwise.
+    """
+    session = get_container_session(workspace_folder)
+    if session is not None and session.can_docker_exec:
+        return docker_exec_args(cmd, session)
+    return devcontainer_exec_args(cmd, workspace_folder)
 
 
 def devcontainer_exec(
@@ -101,7 +367,7 @@ def devcontainer_exec(
     workspace_folder: Path,
     timeout: int | None = None,
 ) -> subprocess.CompletedProcess:
-    """Run command inside the container.
+    """Run command inside the container (via ``docker exec`` when possible).
 
     Args:
         cmd: Command as list or shell string. If str, wrapped in ["sh", "-c", cmd]
@@ -109,16 +375,32 @@ def devcontainer_exec(
         workspace_folder: Path to the workspace (must contain .devcontainer/).
         timeout: Optional timeout in seconds.
     """
-    if isinstance(cmd, str):
-        cmd = ["sh", "-c", cmd]
-    args = ["devcontainer", "exec", "--workspace-folder", str(workspace_folder)]
-    args += cmd
+    args = container_exec_args(cmd, workspace_folder)
     kwargs: dict = {"capture_output": True, "text": True, "stdin": subprocess.DEVNULL}
     if timeout is not None:
         kwargs["timeout"] = timeout
     return subprocess.run(args, **kwargs)
 
 
+def _probe_container(workspace_folder: Path, timeout: int) -> dict | None:
+    """``devcontainer up --expect-existing-container`` result, or None if not running."""
+    try:
+        result = subprocess.run(
+            ["devcontainer", "up", "--workspace-folder", str(workspace_folder),
+             "--expect-existing-container"],
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        logger.warning(
+            "Container status check timed out after %ds for %s",
+            timeout, workspace_folder,
+        )
+        return None
+    if result.returncode != 0:
+        return None
+    return _up_result(result.stdout)
+
+
 def is_container_running(workspace_folder: Path, timeout: int = 30) -> bool:
     """Check if a devcontainer is running for this workspace.
 
@@ -129,28 +411,231 @@ def is_container_running(workspace_folder: Path, timeout: int = 30) -> bool:
     Returns:
         True if container is running, False if not running or check timed out.
     """
+    return _probe_container(workspace_folder, timeout) is not None
+
+
+def _docker_is_running(container_id: str, timeout: int) -> bool:
+    """Ask docker directly whether *container_id* is running (no Node CLI start)."""
     try:
         result = subprocess.run(
-            ["devcontainer", "up", "--workspace-folder", str(workspace_folder),
-             "--expect-existing-container"],
+            ["docker", "inspect", "--format", "{{.State.Running}}", container_id],
             capture_output=True, text=True, timeout=timeout,
         )
-        return result.returncode == 0
-    except subprocess.TimeoutExpired:
-        logger.warning(
-            "Container status check timed out after %ds for %s",
-            timeout, workspace_folder,
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0 and result.stdout.strip() == "true"
+
+
+def _has_container(workspace_folder: Path, timeout: int) -> bool:
+    """Whether a container, running or stopped, exists for *workspace_folder*.
+
+    ``devcontainer up`` reuses such a container without building, so there
+    is no image to prebuild for it.
+    """
+    if get_container_session(workspace_folder) is not None:
+        return True
+    if shutil.which("docker") is None:
+        return False
+    label = f"devcontainer.local_folder={Path(workspace_folder).resolve()}"
+    try:
+        result = subprocess.run(
+            ["docker", "ps", "--all", "--quiet", "--filter", f"label={label}"],
+            capture_output=True, text=True, timeout=timeout,
         )
+    except (OSError, subprocess.TimeoutExpired):
         return False
+    return result.returncode == 0 and bool((result.stdout or "").strip())
+
+
+# --- Session registry ---
+
+
+@dataclass
+class ContainerSession:
+    """A container known to be up for one workspace, and when that was last checked."""
+
+    workspace_folder: Path
+    container_id: str | None = None
+    remote_user: str | None = None
+    remote_workspace_folder: str | None = None
+    exec_env: dict[str, str] | None = None  # what ``devcontainer exec`` sets
+    env_file: Path | None = None  # exec_env as a private ``docker exec --env-file``
+    checked_at: float = 0.0  # time.monotonic(); 0 forces a re-check
+    shell: "ContainerShell | None" = field(default=None, repr=False)
+
+    def is_fresh(self, ttl: float) -> bool:
+        return self.checked_at > 0 and time.monotonic() - self.checked_at < ttl
+
+    @property
+    def can_docker_exec(self) -> bool:
+        return bool(self.container_id and self.remote_workspace_folder and self.exec_env is not None)
+
+
+# Set per process by docker/the shell rather than by the devcontainer config.
+_EXEC_ENV_SKIP = frozenset({"HOSTNAME", "PWD", "OLDPWD", "SHLVL", "_"})
+
+
+def _resolve_exec_env(workspace_folder: Path, timeout: int) -> dict[str, str] | None:
+    """The environment ``devcontainer exec`` gives commands (user env probe + remoteEnv).
+
+    Resolved once per session through the CLI itself, so the ``docker exec``
+    fast path runs commands with the same PATH and variables. None if docker
+    is unavailable or the probe fails, which keeps the session on the CLI.
+    """
+    if shutil.which("docker") is None:
+        return None
+    try:
+        result = subprocess.run(
+            devcontainer_exec_args(["cat", "/proc/self/environ"], workspace_folder),
+            capture_output=True, timeout=timeout, stdin=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug("Could not resolve container env for %s: %s", workspace_folder, e)
+        return None
+    if result.returncode != 0:
+        return None
+    env: dict[str, str] = {}
+    for entry in result.stdout.decode("utf-8", errors="replace").split("\0"):
+        key, sep, value = entry.partition("=")
+        if sep and key and key not in _EXEC_ENV_SKIP:
+            env[key] = value
+    return env
+
+
+def _write_env_file(env: dict[str, str]) -> Path | None:
+    """Write *env* to a ``docker exec --env-file`` readable only by this user.
+
+    The format has no quoting, so multi-line values are left out. None if
+    the file can't be written, which keeps the session on the CLI.
+    """
+    lines = []
+    for key, value in env.items():
+        if "\n" in value:
+            logger.debug("Not passing multi-line %s to docker exec", key)
+            continue
+        lines.append(f"{key}={value}\n")
+    try:
+        fd, path = tempfile.mkstemp(prefix="arborist-env-")  # mode 0600
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+    except OSError as e:
+        logger.debug("Could not write container env file: %s", e)
+        return None
+    return Path(path)
+
+
+def _start_shell(session: ContainerSession, timeout: int) -> None:
+    from agent_arborist.container_shell import AGENT_SCRIPT, ContainerShell
+
+    shell = ContainerShell(
+        docker_exec_args(["sh", "-c", AGENT_SCRIPT], session, interactive=True),
+        lambda cmd: docker_exec_args(cmd, session),
+    )
+    if shell.start(timeout=timeout):
+        session.shell = shell
+    else:
+        logger.info("Container shell unavailable for %s; using exec per command", session.workspace_folder)
+
+
+def _release_session(session: ContainerSession | None) -> None:
+    """Close a forgotten session's shell and remove its env file."""
+    if session is None:
+        return
+    if session.shell is not None:
+        session.shell.close()
+        session.shell = None
+    if session.env_file is not None:
+        session.env_file.unlink(missing_ok=True)
+        session.env_file = None
+
+
+_sessions: dict[str, ContainerSession] = {}
+_session_locks: dict[str, threading.Lock] = {}
+_sessions_lock = threading.Lock()
+_warmups: dict[str, concurrent.futures.Future] = {}
+_prebuilds: dict[str, threading.Event] = {}  # set once a warm-up's prebuild step is over
+
+
+def _session_key(workspace_folder: Path) -> str:
+    return str(Path(workspace_folder).resolve())
+
+
+def _session_lock(key: str) -> threading.Lock:
+    with _sessions_lock:
+        lock = _session_locks.get(key)
+        if lock is None:
+            lock = _session_locks[key] = threading.Lock()
+        return lock
+
+
+def set_container_shell(enabled: bool) -> None:
+    """Start (or stop starting) a persistent shell agent with each new session."""
+    global _shell_enabled
+    _shell_enabled = enabled
+
+
+def container_shell(workspace_folder: Path) -> "ContainerShell | None":
+    """The running shell agent for *workspace_folder*'s container, if any."""
+    session = get_container_session(workspace_folder)
+    if session is None or session.shell is None or not session.shell.alive:
+        return None
+    return session.shell
+
+
+def get_container_session(workspace_folder: Path) -> ContainerSession | None:
+    """The registered session for *workspace_folder*, fresh or not."""
+    with _sessions_lock:
+        return _sessions.get(_session_key(workspace_folder))
+
+
+# Exit codes ``docker exec`` uses for its own failures (daemon error, command
+# can't be invoked, command not found) rather than the command's.
+EXEC_FAILURE_CODES = frozenset({125, 126, 127})
+
+
+def container_exec_failed(workspace_folder: Path) -> None:
+    """Note a failed exec: the next ``ensure_container_running`` re-checks liveness.
+
+    Only for failures of the exec itself (it couldn't spawn, exited with one
+    of ``EXEC_FAILURE_CODES``, or the shell agent died); a command that ran
+    and exited non-zero says nothing about the container. The session is
+    kept and only its TTL expired; the re-check is a cheap ``docker inspect``
+    when the container ID is known.
+    """
+    session = get_container_session(workspace_folder)
+    if session is not None:
+        session.checked_at = 0.0
+
+
+@atexit.register
+def clear_container_sessions() -> None:
+    """Forget every registered container (e.g. after tearing containers down)."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        _warmups.clear()
+        _prebuilds.clear()
+    for session in sessions:
+        _release_session(session)
 
 
 def ensure_container_running(
     workspace_folder: Path,
     timeout_up: int = 300,
     timeout_check: int = 30,
-) -> None:
+    *,
+    ttl: float = LIVENESS_TTL,
+) -> ContainerSession:
     """Lazy up: start container if not already running. Health check on first start.
 
+    The result is kept in a per-process registry: for *ttl* seconds after a
+    successful check, further calls return at once without running the
+    devcontainer CLI. After that, or after ``container_exec_failed``, the
+    known container ID is checked with ``docker inspect`` before falling
+    back to ``devcontainer up --expect-existing-container``. A new session
+    also resolves what ``docker_exec_args`` needs to bypass the CLI and,
+    after ``set_container_shell(True)``, starts the persistent shell agent.
+
     On first successful start, verifies git is available inside the container.
     Raises DevcontainerError if git is not found.
 
@@ -158,19 +643,186 @@ def ensure_container_running(
         workspace_folder: Path to the workspace.
         timeout_up: Timeout for devcontainer up in seconds.
         timeout_check: Timeout for container status check in seconds.
+        ttl: Seconds a liveness check stays valid.
     """
-    logger.debug("Checking container status for %s", workspace_folder)
-    if not is_container_running(workspace_folder, timeout=timeout_check):
-        devcontainer_up(workspace_folder, timeout=timeout_up)
-        # Health check: git must be available for AI agents to commit
-        logger.debug("Running git health check in container for %s", workspace_folder)
-        result = devcontainer_exec(["git", "--version"], workspace_folder, timeout=15)
-        if result.returncode != 0:
-            logger.error(
-                "git not available inside devcontainer for %s: %s",
-                workspace_folder, result.stderr,
-            )
-            raise DevcontainerError(
-                "git is not available inside the devcontainer. "
-                "AI agents need git to commit. Add git to your Dockerfile."
-            )
+    key = _session_key(workspace_folder)
+    with _session_lock(key):
+        session = get_container_session(workspace_folder)
+        if session is not None and session.is_fresh(ttl):
+            return session
+        if session is not None and session.container_id and _docker_is_running(session.container_id, timeout_check):
+            logger.debug("Container %s still running for %s", session.container_id[:12], workspace_folder)
+            session.checked_at = time.monotonic()
+            return session
+
+        # The known container is gone or unknown; later execs (starting with
+        # the health check) must not be routed to its ID.
+        _release_session(_forget_container_session(workspace_folder))
+        logger.debug("Checking container status for %s", workspace_folder)
+        up = _probe_container(workspace_folder, timeout_check)
+        if up is None:
+            image = _cached_image(workspace_folder, timeout_check)
+            up = devcontainer_up(workspace_folder, timeout=timeout_up, image=image)
+            # Health check: git must be available for AI agents to commit
+            logger.debug("Running git health check in container for %s", workspace_folder)
+            result = devcontainer_exec(["git", "--version"], workspace_folder, timeout=15)
+            if result.returncode != 0:
+                logger.error(
+                    "git not available inside devcontainer for %s: %s",
+                    workspace_folder, result.stderr,
+                )
+                raise DevcontainerError(
+                    "git is not available inside the devcontainer. "
+                    "AI agents need git to commit. Add git to your Dockerfile."
+                )
+        session = ContainerSession(
+            workspace_folder=Path(workspace_folder),
+            container_id=up.get("containerId"),
+            remote_user=up.get("remoteUser"),
+            remote_workspace_folder=up.get("remoteWorkspaceFolder"),
+        )
+        if session.container_id and session.remote_workspace_folder:
+            session.exec_env = _resolve_exec_env(workspace_folder, timeout_check)
+        if session.exec_env is not None:
+            session.env_file = _write_env_file(session.exec_env)
+            if session.env_file is None:
+                session.exec_env = None
+        if session.can_docker_exec:
+            logger.debug("Using docker exec into %s for %s", session.container_id[:12], workspace_folder)
+            if _shell_enabled:
+                _start_shell(session, timeout_check)
+        session.checked_at = time.monotonic()
+        with _sessions_lock:
+            previous = _sessions.get(key)
+            _sessions[key] = session
+        _release_session(previous)
+        return session
+
+
+def _forget_container_session(workspace_folder: Path) -> ContainerSession | None:
+    with _sessions_lock:
+        return _sessions.pop(_session_key(workspace_folder), None)
+
+
+def remove_container(workspace_folder: Path, timeout: int = 30) -> None:
+    """Force-remove the registered container for *workspace_folder*, if any."""
+    session = _forget_container_session(workspace_folder)
+    _release_session(session)
+    if session is None or not session.container_id:
+        return
+    logger.debug("Removing container %s for %s", session.container_id[:12], workspace_folder)
+    try:
+        result = subprocess.run(
+            ["docker", "rm", "--force", session.container_id],
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning("Could not remove container %s: %s", session.container_id[:12], e)
+        return
+    if result.returncode != 0:
+        logger.warning("docker rm failed for %s: %s", session.container_id[:12], result.stderr.strip())
+
+
+# --- Pool ---
+
+
+class ContainerPool:
+    """One warm container per workspace folder, leased to one task at a time.
+
+    Parallel tasks each need their own filesystem, so every folder (one git
+    worktree slot) gets its own container. ``start`` brings them all up
+    concurrently; a released folder keeps its container for the next task
+    leased it. ``close`` removes the containers.
+    """
+
+    def __init__(
+        self,
+        workspace_folders: list[Path],
+        *,
+        timeout_up: int = 300,
+        timeout_check: int = 30,
+    ):
+        self.workspace_folders = [Path(f) for f in workspace_folders]
+        self.timeout_up = timeout_up
+        self.timeout_check = timeout_check
+        self._free = list(self.workspace_folders)
+
+    @property
+    def available(self) -> int:
+        return len(self._free)
+
+    async def start(self) -> None:
+        """Build the shared image once, then bring up every container at once.
+
+        Raises the first failure.
+        """
+        logger.info("Warming %d containers", len(self.workspace_folders))
+        if self.workspace_folders:
+            await asyncio.to_thread(prebuild_image, self.workspace_folders[0], self.timeout_up, self.timeout_check)
+        await asyncio.gather(*(
+            asyncio.to_thread(ensure_container_running, f, self.timeout_up, self.timeout_check)
+            for f in self.workspace_folders
+        ))
+
+    def acquire(self) -> Path:
+        """Lease a free folder (and its container). Raises IndexError if none is free."""
+        folder = self._free.pop(0)
+        logger.debug("Leased container for %s", folder)
+        return folder
+
+    def release(self, folder: Path) -> None:
+        """Return *folder*'s container to the pool for the next task."""
+        if folder not in self._free:
+            self._free.append(folder)
+
+    def close(self) -> None:
+        """Remove every pooled container."""
+        for folder in self.workspace_folders:
+            remove_container(folder, timeout=self.timeout_check)
+
+
+def start_container_warmup(
+    workspace_folder: Path,
+    timeout_up: int = 300,
+    timeout_check: int = 30,
+    *,
+    start: bool = True,
+) -> concurrent.futures.Future:
+    """Prebuild the image and, with *start*, bring the container up in the background.
+
+    Lets callers overlap provisioning with their own setup; an
+    ``ensure_container_running`` that needs a new container meanwhile
+    waits for the image build, then starts from it. Runs once
+    per workspace per process, later calls get the same future. The
+    prebuild is skipped when a container already exists for the workspace,
+    since ``up`` will reuse it. A failure is only logged here and surfaces
+    again on the lazy path.
+    """
+    key = _session_key(workspace_folder)
+    with _sessions_lock:
+        future = _warmups.get(key)
+        if future is not None:
+            return future
+        future = _warmups[key] = concurrent.futures.Future()
+        prebuilt = _prebuilds[key] = threading.Event()
+
+    def warm() -> None:
+        future.set_running_or_notify_cancel()
+        try:
+            try:
+                if _has_container(workspace_folder, timeout_check):
+                    logger.debug("Container exists for %s; skipping image prebuild", workspace_folder)
+                else:
+                    prebuild_image(workspace_folder, timeout_up, timeout_check)
+            finally:
+                prebuilt.set()
+            session = ensure_container_running(workspace_folder, timeout_up, timeout_check) if start else None
+        except Exception as e:
+            logger.warning("Container warm-up failed for %s: %s", workspace_folder, e)
+            future.set_exception(e)
+        else:
+            future.set_result(session)
+
+    logger.debug("Warming container for %s in the background", workspace_folder)
+    threading.Thread(target=warm, name="arborist-container-warmup", daemon=True).start()
+    return future
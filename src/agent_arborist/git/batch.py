@@ -0,0 +1,205 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Long-lived ``git cat-file`` processes, one set per working tree.
+
+Ref and commit lookups go through a persistent pipe instead of forking a
+new ``git`` per query. ``BatchUnavailable`` means "ask the slow path": the
+subprocess wrappers in ``repo.py`` stay the fallback for anything the
+batch process can't answer.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class BatchUnavailable(Exception):
+    """The batch process could not answer; use the subprocess fallback."""
+
+
+@dataclass
+class CommitInfo:
+    """A commit object parsed from ``cat-file`` output."""
+
+    sha: str
+    tree: str
+    parents: list[str] = field(default_factory=list)
+    committer_time: int = 0
+    message: str = ""
+
+    @property
+    def subject(self) -> str:
+        return self.message.split("\n", 1)[0]
+
+    @property
+    def trailers(self) -> dict[str, str]:
+        """``Arborist-*`` trailers from the message."""
+        trailers: dict[str, str] = {}
+        for line in self.message.split("\n"):
+            line = line.strip()
+            if ": " in line and line.startswith("Arborist-"):
+                key, _, val = line.partition(": ")
+                trailers[key] = val.strip()
+        return trailers
+
+
+def _parse_commit(sha: str, raw: bytes) -> CommitInfo:
+    header, _, message = raw.decode("utf-8", errors="replace").partition("\n\n")
+    info = CommitInfo(sha=sha, tree="", message=message.strip())
+    for line in header.split("\n"):
+        key, _, val = line.partition(" ")
+        if key == "tree":
+            info.tree = val
+        elif key == "parent":
+            info.parents.append(val)
+        elif key == "committer":
+            # "Name <email> 1700000000 +0000"
+            parts = val.rsplit(" ", 2)
+            if len(parts) == 3 and parts[1].isdigit():
+                info.committer_time = int(parts[1])
+    return info
+
+
+# Ref lookups only need the object header; commit reads need the body too.
+_CHECK = "--batch-check"
+_CONTENTS = "--batch"
+
+
+class CatFileBatch:
+    """``git cat-file`` processes bound to one working tree.
+
+    Resolves go to a ``--batch-check`` process, which answers from the
+    object header without inflating the object; ``read_commit`` uses a
+    separate ``--batch`` process. Each starts on first use.
+    """
+
+    def __init__(self, cwd: Path):
+        self.cwd = cwd
+        self._lock = threading.Lock()
+        self._procs: dict[str, subprocess.Popen] = {}
+
+    def _ensure(self, mode: str) -> subprocess.Popen:
+        proc = self._procs.get(mode)
+        if proc is not None and proc.poll() is not None:
+            self._close_locked(mode)
+            proc = None
+        if proc is None:
+            logger.debug("Starting git cat-file %s in %s", mode, self.cwd)
+            proc = self._procs[mode] = subprocess.Popen(
+                ["git", "cat-file", mode],
+                cwd=self.cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return proc
+
+    def _query(self, rev: str, mode: str) -> tuple[str, str, bytes] | None:
+        """Return ``(sha, type, content)`` for rev, or None if it doesn't resolve.
+
+        content is empty for ``--batch-check``. Raises BatchUnavailable if
+        the process can't be used.
+        """
+        if not rev or "\n" in rev or rev.startswith("-"):
+            raise BatchUnavailable(f"unsupported revision {rev!r}")
+        with self._lock:
+            try:
+                proc = self._ensure(mode)
+                proc.stdin.write(rev.encode() + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline()
+                if not header:
+                    self._close_locked(mode)
+                    raise BatchUnavailable("git cat-file exited")
+                parts = header.split()
+                if len(parts) != 3:
+                    # "<rev> missing" / "<rev> ambiguous"
+                    return None
+                content = b""
+                if mode == _CONTENTS:
+                    size = int(parts[2])
+                    content = proc.stdout.read(size + 1)[:size]
+                return parts[0].decode(), parts[1].decode(), content
+            except (OSError, ValueError) as e:
+                logger.debug("cat-file %s failed in %s: %s", mode, self.cwd, e)
+                self._close_locked(mode)
+                raise BatchUnavailable(str(e)) from e
+
+    def resolve(self, rev: str) -> str | None:
+        """Resolve a revision to its full SHA."""
+        result = self._query(rev, _CHECK)
+        return result[0] if result else None
+
+    def read_commit(self, rev: str) -> CommitInfo | None:
+        result = self._query(rev, _CONTENTS)
+        if result is None or result[1] != "commit":
+            return None
+        return _parse_commit(result[0], result[2])
+
+    def _close_locked(self, mode: str) -> None:
+        proc = self._procs.pop(mode, None)
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        finally:
+            proc.stdout.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for mode in list(self._procs):
+                self._close_locked(mode)
+
+
+_batches: dict[str, CatFileBatch] = {}
+_batches_lock = threading.Lock()
+
+
+def get_batch(cwd: Path) -> CatFileBatch:
+    """Return the shared batch processes for cwd, creating them on first use."""
+    key = str(Path(cwd).resolve())
+    with _batches_lock:
+        batch = _batches.get(key)
+        if batch is None:
+            batch = _batches[key] = CatFileBatch(Path(key))
+        return batch
+
+
+def close_batch(cwd: Path) -> None:
+    """Stop the batch processes for cwd (e.g. before removing a worktree)."""
+    with _batches_lock:
+        batch = _batches.pop(str(Path(cwd).resolve()), None)
+    if batch is not None:
+        batch.close()
+
+
+@atexit.register
+def close_all() -> None:
+    with _batches_lock:
+        batches = list(_batches.values())
+        _batches.clear()
+    for batch in batches:
+        batch.close()
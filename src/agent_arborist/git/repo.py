@@ -12,14 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Thin git subprocess wrapper."""
+"""Thin git subprocess wrapper.
+
+Point lookups (refs, current branch) are answered by a long-lived
+``git cat-file --batch-check`` process from ``batch.py`` when possible;
+``_run`` remains the fallback.
+"""
 
 from __future__ import annotations
 
 import logging
+import os
 import subprocess
+import tempfile
+from collections.abc import Iterable
 from pathlib import Path
 
+from agent_arborist.git.batch import BatchUnavailable, get_batch
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,8 +37,8 @@ class GitError(Exception):
     """Error from a git command."""
 
 
-def _run(args: list[str], cwd: Path) -> str:
-    """Run a git command and return stdout."""
+def _run(args: list[str], cwd: Path, *, env: dict[str, str] | None = None) -> str:
+    """Run a git command and return stdout. *env* is added to the environment."""
     logger.debug("git %s", " ".join(args))
     try:
         result = subprocess.run(
@@ -37,12 +47,29 @@ def _run(args: list[str], cwd: Path) -> str:
             capture_output=True,
             text=True,
             check=True,
+            env={**os.environ, **env} if env else None,
         )
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
         raise GitError(f"git {' '.join(args)}: {e.stderr.strip()}") from e
 
 
+class _NoBatch(Exception):
+    """Internal: the batch process can't answer, fall back to ``_run``."""
+
+
+def _batch_resolve(rev: str, cwd: Path) -> str | None:
+    """Resolve rev via the pooled cat-file process. None means rev doesn't exist.
+
+    Raises _NoBatch when the pooled process is unusable.
+    """
+    logger.debug("git cat-file --batch-check %s", rev)
+    try:
+        return get_batch(cwd).resolve(rev)
+    except BatchUnavailable as e:
+        raise _NoBatch(str(e)) from e
+
+
 def git_toplevel(cwd: Path | None = None) -> Path:
     """Return the root of the git repository containing cwd."""
     return Path(_run(["rev-parse", "--show-toplevel"], cwd or Path.cwd()))
@@ -65,6 +92,10 @@ def git_checkout(branch: str, cwd: Path, *, create: bool = False, start_point: s
 
 
 def git_branch_exists(branch: str, cwd: Path) -> bool:
+    try:
+        return _batch_resolve(f"refs/heads/{branch}", cwd) is not None
+    except _NoBatch:
+        pass
     try:
         _run(["rev-parse", "--verify", f"refs/heads/{branch}"], cwd)
         return True
@@ -76,17 +107,58 @@ def git_add_all(cwd: Path) -> None:
     _run(["add", "-A"], cwd)
 
 
+def git_add(paths: Iterable[str | Path], cwd: Path) -> None:
+    _run(["add", "--", *(str(p) for p in paths)], cwd)
+
+
 def git_commit(message: str, cwd: Path, *, allow_empty: bool = False) -> str:
     """Commit and return the SHA."""
     args = ["commit", "-m", message]
     if allow_empty:
         args.append("--allow-empty")
     _run(args, cwd)
-    return _run(["rev-parse", "HEAD"], cwd)
+    return git_rev_parse("HEAD", cwd)
+
+
+def _exclude_pathspec(exclude: Iterable[str]) -> list[str]:
+    exclude = list(exclude)
+    if not exclude:
+        return []
+    return ["--", ".", *(f":(exclude){p}" for p in exclude)]
+
+
+def git_is_clean(cwd: Path, *, exclude: Iterable[str] = ()) -> bool:
+    """True if there are no staged, unstaged or untracked (non-ignored) changes.
+
+    One status pass; unlike ``add -A`` it never rewrites the index. Paths
+    in *exclude* (relative to *cwd*) are not looked at.
+    """
+    out = _run(
+        ["--no-optional-locks", "status", "--porcelain", "--untracked-files=all", *_exclude_pathspec(exclude)],
+        cwd,
+    )
+    return not out
+
+
+def git_tree_without(rev: str, paths: Iterable[str], cwd: Path) -> str:
+    """Tree SHA of *rev* with *paths* (relative to *cwd*) left out.
+
+    Built in a throwaway index; the real index and worktree are untouched.
+    """
+    with tempfile.TemporaryDirectory(prefix="arborist-index-") as tmp:
+        env = {"GIT_INDEX_FILE": str(Path(tmp) / "index")}
+        _run(["read-tree", rev], cwd, env=env)
+        _run(["rm", "--cached", "-r", "-q", "--ignore-unmatch", "--", *paths], cwd, env=env)
+        return _run(["write-tree"], cwd, env=env)
 
 
-def git_log(branch: str, fmt: str, cwd: Path, *, n: int | None = 1, grep: str | None = None, fixed_strings: bool = False) -> str:
+def git_log(
+    branch: str, fmt: str, cwd: Path, *, n: int | None = 1, grep: str | None = None,
+    fixed_strings: bool = False, exclude: list[str] | None = None,
+) -> str:
     args = ["log", branch, f"--format={fmt}"]
+    for rev in exclude or []:
+        args.append(f"^{rev}")
     if n is not None:
         args.append(f"-n{n}")
     if grep:
@@ -96,20 +168,95 @@ def git_log(branch: str, fmt: str, cwd: Path, *, n: int | None = 1, grep: str |
     return _run(args, cwd)
 
 
+def _git_dir_of(cwd: Path) -> Path | None:
+    """Return the git dir for a worktree root, without forking. None if unknown."""
+    dot_git = cwd / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = dot_git.read_text().strip()
+        if content.startswith("gitdir: "):
+            path = Path(content[len("gitdir: "):])
+            return path if path.is_absolute() else (cwd / path).resolve()
+    return None
+
+
+def _read_current_branch(cwd: Path) -> str | None:
+    """Read the branch from HEAD directly; None means use ``rev-parse``.
+
+    Only answers when the result is unambiguous: HEAD must point at an
+    existing commit and the short name must not collide with a tag.
+    """
+    git_dir = _git_dir_of(cwd)
+    if git_dir is None:
+        return None
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if _batch_resolve("HEAD", cwd) is None:
+            return None
+        if not head.startswith("ref: "):
+            return "HEAD"
+        ref = head[len("ref: "):]
+        if not ref.startswith("refs/heads/") or ref.endswith("/.invalid"):
+            return None
+        name = ref[len("refs/heads/"):]
+        if _batch_resolve(f"refs/tags/{name}", cwd) is not None:
+            return None
+        return name
+    except (OSError, _NoBatch):
+        return None
+
+
 def git_current_branch(cwd: Path) -> str:
+    branch = _read_current_branch(cwd)
+    if branch is not None:
+        return branch
     return _run(["rev-parse", "--abbrev-ref", "HEAD"], cwd)
 
 
-def git_merge(branch: str, cwd: Path, *, message: str = "", no_ff: bool = True) -> None:
+def git_merge(
+    branch: str, cwd: Path, *, message: str = "", no_ff: bool = True, no_commit: bool = False,
+) -> None:
     args = ["merge"]
     if no_ff:
         args.append("--no-ff")
+    if no_commit:
+        args.append("--no-commit")
     if message:
         args.extend(["-m", message])
     args.append(branch)
     _run(args, cwd)
 
 
+def git_merge_abort(cwd: Path) -> None:
+    _run(["merge", "--abort"], cwd)
+
+
+def git_common_dir(cwd: Path) -> Path:
+    """Return the shared ``.git`` directory, even when cwd is a linked worktree."""
+    path = Path(_run(["rev-parse", "--git-common-dir"], cwd))
+    return path if path.is_absolute() else (cwd / path).resolve()
+
+
+def git_worktree_add(path: Path, cwd: Path, *, start_point: str = "HEAD") -> None:
+    """Create a detached worktree at *path* checked out at *start_point*."""
+    _run(["worktree", "add", "--detach", str(path), start_point], cwd)
+
+
+def git_worktree_remove(path: Path, cwd: Path) -> None:
+    _run(["worktree", "remove", "--force", str(path)], cwd)
+
+
+def git_worktree_reset(path: Path, start_point: str) -> None:
+    """Check the worktree at *path* out detached at *start_point*, discarding all local state."""
+    _run(["checkout", "--quiet", "--force", "--detach", start_point], path)
+    _run(["clean", "-ffdxq"], path)
+
+
+def git_worktree_prune(cwd: Path) -> None:
+    _run(["worktree", "prune"], cwd)
+
+
 def git_diff(ref1: str, ref2: str, cwd: Path) -> str:
     return _run(["diff", f"{ref1}..{ref2}"], cwd)
 
@@ -131,6 +278,12 @@ def git_branch_list(cwd: Path, pattern: str | None = None) -> list[str]:
 
 def git_rev_parse(rev: str, cwd: Path) -> str:
     """Resolve a revision to its full SHA."""
+    try:
+        sha = _batch_resolve(rev, cwd)
+    except _NoBatch:
+        sha = None
+    if sha is not None:
+        return sha
     return _run(["rev-parse", rev], cwd)
 
 
@@ -146,6 +299,19 @@ def git_merge_base(branch1: str, branch2: str, cwd: Path) -> str | None:
         return None
 
 
+def git_is_ancestor(ancestor: str, descendant: str, cwd: Path) -> bool:
+    try:
+        _run(["merge-base", "--is-ancestor", ancestor, descendant], cwd)
+        return True
+    except GitError:
+        return False
+
+
+def git_commit_graph_write(cwd: Path) -> None:
+    """Update the commit-graph so history walks can use generation numbers."""
+    _run(["commit-graph", "write", "--reachable", "--split"], cwd)
+
+
 def git_log_since(
     rev: str,
     since: str,
@@ -154,7 +320,7 @@ def git_log_since(
     *,
     grep: str | None = None,
     fixed_strings: bool = False,
-    n: int = 500,
+    n: int | None = None,
 ) -> str:
     """Run git log for commits since branching point, returning formatted output.
 
@@ -165,12 +331,11 @@ def git_log_since(
         cwd: Working directory
         grep: Optional grep pattern
         fixed_strings: Use fixed string matching for grep
-        n: Maximum number of commits to return
+        n: Maximum number of commits to return (None = no limit)
     """
-    args = [
-        "log", f"{since}..{rev}", f"--format={fmt}%n---COMMIT_SEP---",
-        f"-n{n}",
-    ]
+    args = ["log", f"{since}..{rev}", f"--format={fmt}%n---COMMIT_SEP---"]
+    if n is not None:
+        args.append(f"-n{n}")
     if grep:
         args.extend(["--grep", grep])
         if fixed_strings:
@@ -17,6 +17,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
@@ -30,7 +31,12 @@ from agent_arborist.constants import (
     TRAILER_RETRY,
     TRAILER_REPORT,
 )
-from agent_arborist.git.repo import git_log, git_commit, git_merge_base, git_log_since, git_current_branch, GitError
+from agent_arborist.git.batch import BatchUnavailable, get_batch
+from agent_arborist.git.repo import (
+    git_log, git_commit, git_merge_base, git_log_since, git_current_branch,
+    git_is_ancestor, git_rev_parse, GitError,
+)
+from agent_arborist.git.state_index import StateIndex, index_path, load_index, save_index
 
 
 def get_run_start_sha(cwd: Path, *, spec_id: str, create: bool = True) -> str | None:
@@ -124,21 +130,14 @@ def is_task_complete(task_id: str, cwd: Path, *, spec_id: str) -> bool:
     return state == TaskState.COMPLETE
 
 
-def get_task_commit_history(task_id: str, cwd: Path, *, spec_id: str) -> list[dict[str, str]]:
-    """Get all commits for a task, each as a dict of trailers + commit metadata."""
-    grep_pattern = f"task({spec_id}@{task_id}"
-    try:
-        raw = git_log(
-            "HEAD",
-            "%h%n%s%n%(trailers)%n---COMMIT_SEP---",
-            cwd,
-            n=50,
-            grep=grep_pattern,
-            fixed_strings=True,
-        )
-    except GitError:
-        return []
+_COMMIT_FORMAT = "%h%n%s%n%(trailers)%n---COMMIT_SEP---"
+
+# Newest commits kept per task by the history views.
+HISTORY_PER_TASK = 50
 
+
+def _parse_commit_blocks(raw: str) -> list[dict]:
+    """Parse ``_COMMIT_FORMAT`` log output into commit dicts, newest first."""
     commits = []
     for block in raw.split("---COMMIT_SEP---"):
         block = block.strip()
@@ -166,24 +165,133 @@ def get_task_commit_history(task_id: str, cwd: Path, *, spec_id: str) -> list[di
     return commits
 
 
-def scan_task_states(
-    tree, cwd: Path, *, spec_id: str, base_branch: str = "main"
-) -> tuple[dict[str, TaskState], dict[str, dict[str, str]]]:
-    """Scan all leaf tasks on HEAD and return states and trailers for each.
+def get_task_commit_history(task_id: str, cwd: Path, *, spec_id: str) -> list[dict[str, str]]:
+    """Get all commits for a task, each as a dict of trailers + commit metadata."""
+    grep_pattern = f"task({spec_id}@{task_id}@"
+    try:
+        raw = git_log(
+            "HEAD",
+            _COMMIT_FORMAT,
+            cwd,
+            n=HISTORY_PER_TASK,
+            grep=grep_pattern,
+            fixed_strings=True,
+        )
+    except GitError:
+        return []
+    return _parse_commit_blocks(raw)
 
-    Uses a single git log call to fetch all task commits since branching,
-    then parses to determine state.
 
-    Returns:
-        Tuple of (task_states, task_trailers) where:
-        - task_states: dict mapping task_id -> TaskState
-        - task_trailers: dict mapping task_id -> trailers dict
+def scan_task_commits(
+    cwd: Path, *, spec_id: str, per_task: int = HISTORY_PER_TASK,
+) -> dict[str, list[dict]]:
+    """Commit lists for every task of *spec_id*, from one ``git log`` pass.
 
-    Commits are scoped by *spec_id* embedded in the commit prefix,
-    so only commits for the current spec are considered.
+    Same entries as ``get_task_commit_history``, newest first, grouped by
+    the task ID in each subject.
+    """
+    try:
+        raw = git_log(
+            "HEAD", _COMMIT_FORMAT, cwd,
+            n=None, grep=f"task({spec_id}@", fixed_strings=True,
+        )
+    except GitError:
+        return {}
+    by_task: dict[str, list[dict]] = {}
+    for commit in _parse_commit_blocks(raw):
+        task_id = _task_id_from_subject(commit["subject"], spec_id)
+        if task_id is None:
+            continue
+        commits = by_task.setdefault(task_id, [])
+        if len(commits) < per_task:
+            commits.append(commit)
+    return by_task
+
+
+def _task_id_from_subject(subject: str, spec_id: str) -> str | None:
+    """Task ID from a ``task(spec@id@step)`` subject; None for other commits.
+
+    Spec-level markers such as ``task(spec@@run-start)`` have no task ID.
     """
-    from agent_arborist.git.repo import GitError
+    prefix = f"task({spec_id}@"
+    if not subject.startswith(prefix):
+        return None
+    task_id, _, _ = subject[len(prefix):].partition("@")
+    return task_id or None
+
+
+def _parse_task_blocks(raw: str, spec_id: str) -> dict[str, dict[str, str]]:
+    """Parse ``%s%n%(trailers)`` log blocks, newest first, into latest trailers per task."""
+    task_trailers: dict[str, dict[str, str]] = {}
+    for block in raw.split("---COMMIT_SEP---"):
+        block = block.strip()
+        if not block:
+            continue
+        lines = block.split("\n")
+        if len(lines) < 2:
+            continue
+        task_id = _task_id_from_subject(lines[0].strip(), spec_id)
+        if task_id is None or task_id in task_trailers:
+            continue
+
+        trailers: dict[str, str] = {}
+        for line in lines[1:]:
+            line = line.strip()
+            if ": " in line and line.startswith("Arborist-"):
+                key, _, val = line.partition(": ")
+                trailers[key] = val.strip()
+        task_trailers[task_id] = trailers
+    return task_trailers
+
+
+# How far the no-fork first-parent walk goes before falling back to git log.
+_LINEAR_WALK_LIMIT = 200
+
 
+def _scan_new_commits(
+    last: str, head: str, cwd: Path, *, spec_id: str, exclude: list[str],
+) -> dict[str, dict[str, str]] | None:
+    """Latest trailers per task for commits in ``last..head``.
+
+    Returns None if *last* is no longer an ancestor of *head* (history was
+    rewritten). Linear history is walked through the pooled cat-file
+    process without forking; anything with merges falls back to one
+    ``git log`` over the new range.
+    """
+    task_trailers: dict[str, dict[str, str]] = {}
+    try:
+        batch = get_batch(cwd)
+        sha = head
+        for _ in range(_LINEAR_WALK_LIMIT):
+            info = batch.read_commit(sha)
+            if info is None or len(info.parents) != 1:
+                break
+            task_id = _task_id_from_subject(info.subject, spec_id)
+            if task_id is not None and task_id not in task_trailers:
+                task_trailers[task_id] = info.trailers
+            sha = info.parents[0]
+            if sha == last:
+                return task_trailers
+    except BatchUnavailable:
+        pass
+
+    if not git_is_ancestor(last, head, cwd):
+        return None
+    raw = git_log(
+        f"{last}..{head}",
+        "%s%n%(trailers)%n---COMMIT_SEP---",
+        cwd,
+        n=None,
+        grep=f"task({spec_id}@",
+        fixed_strings=True,
+        exclude=exclude,
+    )
+    return _parse_task_blocks(raw, spec_id)
+
+
+def _full_scan(
+    cwd: Path, *, spec_id: str, base_branch: str, is_on_base_branch: bool,
+) -> dict[str, dict[str, str]]:
     merge_base = git_merge_base(base_branch, "HEAD", cwd)
     if not merge_base:
         raise GitError(
@@ -195,72 +303,129 @@ def scan_task_states(
     if not branch_point:
         raise GitError(f"Merge-base for {base_branch} is empty")
 
-    current_branch = git_current_branch(cwd)
-
-    is_on_base_branch = (current_branch == base_branch)
-
+    exclude: list[str] = []
     if is_on_base_branch:
-        logger.debug("On base branch %s, scanning all commits", base_branch)
+        # No branch point to bound the walk, so stop at this spec's run-start
+        # marker: every task commit for the spec is a descendant of it.
         range_spec = "HEAD"
+        run_start = get_run_start_sha(cwd, spec_id=spec_id, create=False)
+        if run_start:
+            logger.debug("On base branch %s, scanning since run-start %s", base_branch, run_start[:12])
+            exclude = [f"{run_start}^@"]
+        else:
+            logger.debug("On base branch %s, no run-start marker, scanning all commits", base_branch)
     else:
         logger.debug("Scanning task status since branching from %s", base_branch)
         range_spec = f"{base_branch}..HEAD"
 
-    # When on a feature branch, range_spec already bounds the scan to
-    # commits since branching — no need for an arbitrary cap.  On the base
-    # branch we keep a safety limit to avoid scanning the entire history.
-    max_commits: int | None = 500 if is_on_base_branch else None
-
     try:
         raw = git_log(
             range_spec,
             "%s%n%(trailers)%n---COMMIT_SEP---",
             cwd,
-            n=max_commits,
+            n=None,
             grep=f"task({spec_id}@",
             fixed_strings=True,
+            exclude=exclude,
         )
     except GitError:
         logger.debug("No task commits found")
-        return {}, {}
+        return {}
+    return _parse_task_blocks(raw, spec_id)
 
-    task_states: dict[str, TaskState] = {}
-    task_trailers: dict[str, dict[str, str]] = {}
 
-    for block in raw.split("---COMMIT_SEP---"):
-        block = block.strip()
-        if not block:
-            continue
-        lines = block.split("\n")
-        if len(lines) < 2:
-            continue
-        subject = lines[0].strip()
+def scan_task_states(
+    tree, cwd: Path, *, spec_id: str, base_branch: str = "main", use_index: bool = True,
+) -> tuple[dict[str, TaskState], dict[str, dict[str, str]]]:
+    """Scan all leaf tasks on HEAD and return states and trailers for each.
 
-        if not subject.startswith(f"task({spec_id}@"):
-            continue
+    Uses a single git log call to fetch all task commits since branching,
+    then parses to determine state. With *use_index*, the result is cached
+    in a state index keyed by HEAD: an unchanged HEAD costs no git log at
+    all, and new commits are parsed incrementally from the last scanned
+    SHA. A rewritten history or moved base branch triggers a full rescan.
 
-        try:
-            rest = subject[len(f"task({spec_id}@"):]
-            task_id, _, _ = rest.partition("@")
-        except Exception:
-            continue
+    Returns:
+        Tuple of (task_states, task_trailers) where:
+        - task_states: dict mapping task_id -> TaskState
+        - task_trailers: dict mapping task_id -> trailers dict
 
-        if task_id in task_states:
-            continue
+    Commits are scoped by *spec_id* embedded in the commit prefix,
+    so only commits for the current spec are considered.
+    """
+    current_branch = git_current_branch(cwd)
+    is_on_base_branch = (current_branch == base_branch)
 
-        trailers: dict[str, str] = {}
-        for line in lines[1:]:
-            line = line.strip()
-            if ": " in line and line.startswith("Arborist-"):
-                key, _, val = line.partition(": ")
-                trailers[key] = val.strip()
+    task_trailers: dict[str, dict[str, str]] | None = None
+    index = path = head = base_tip = None
+    if use_index:
+        try:
+            head = git_rev_parse("HEAD", cwd)
+            base_tip = git_rev_parse(base_branch, cwd)
+        except GitError:
+            # Let the full scan raise the usual merge-base error.
+            head = None
+    if head is not None:
+        path = index_path(cwd, spec_id=spec_id, base_branch=base_branch)
+        index = load_index(path)
+        if index is not None and (
+            index.on_base != is_on_base_branch
+            or (not is_on_base_branch and index.base_tip != base_tip)
+        ):
+            logger.debug("State index stale (branch or base moved), rescanning")
+            index = None
+
+    if index is not None and index.head == head:
+        logger.debug("State index up to date at %s", head[:12])
+        task_trailers = index.trailers
+    elif index is not None:
+        exclude = [] if is_on_base_branch else [base_tip]
+        new = _scan_new_commits(index.head, head, cwd, spec_id=spec_id, exclude=exclude)
+        if new is None:
+            logger.debug("History rewritten since %s, rescanning", index.head[:12])
+        else:
+            logger.debug("State index: %d task(s) updated since %s", len(new), index.head[:12])
+            task_trailers = {**index.trailers, **new}
+
+    if task_trailers is None:
+        task_trailers = _full_scan(
+            cwd, spec_id=spec_id, base_branch=base_branch,
+            is_on_base_branch=is_on_base_branch,
+        )
 
-        state = task_state_from_trailers(trailers)
-        task_states[task_id] = state
-        task_trailers[task_id] = trailers
+    if path is not None and (index is None or index.head != head):
+        save_index(path, StateIndex(
+            head=head, on_base=is_on_base_branch, base_tip=base_tip,
+            trailers=task_trailers,
+        ))
 
+    task_states = {tid: task_state_from_trailers(t) for tid, t in task_trailers.items()}
     logger.debug("Scanned %d tasks", len(task_states))
-    return task_states, task_trailers
+    return task_states, dict(task_trailers)
+
+
+@dataclass
+class TaskHistory:
+    """States, latest trailers and commit lists for every task, built together."""
+
+    states: dict[str, TaskState] = field(default_factory=dict)
+    trailers: dict[str, dict[str, str]] = field(default_factory=dict)
+    commits: dict[str, list[dict]] = field(default_factory=dict)
+
+
+def scan_task_history(
+    tree, cwd: Path, *, spec_id: str, base_branch: str = "main",
+    per_task: int = HISTORY_PER_TASK,
+) -> TaskHistory:
+    """Everything the status and log views need, without a query per task.
+
+    State comes from ``scan_task_states`` (usually answered by the state
+    index); the commit lists come from one ``git log`` over all of the
+    spec's task commits.
+    """
+    states, trailers = scan_task_states(tree, cwd, spec_id=spec_id, base_branch=base_branch)
+    commits = scan_task_commits(cwd, spec_id=spec_id, per_task=per_task)
+    return TaskHistory(states=states, trailers=trailers, commits=commits)
 
 
 def scan_completed_tasks(
@@ -283,3 +448,48 @@ def scan_completed_tasks(
 
     logger.debug("Scan found %d completed tasks", len(completed))
     return completed
+
+
+DURATION_SCAN_LIMIT = 2000
+
+
+def scan_task_durations(
+    cwd: Path, *, spec_id: str, max_commits: int = DURATION_SCAN_LIMIT,
+) -> dict[str, float]:
+    """Estimate wall time per completed task from commit timestamps.
+
+    A task's span runs from the commit its first task commit was built on
+    to its ``complete`` commit; a ``failed`` commit ends the span without a
+    duration, so a re-run is timed on its own. One ``git log`` pass over the newest
+    *max_commits* commits; older history is ignored.
+    """
+    try:
+        raw = git_log("HEAD", "%H%x1f%P%x1f%ct%x1f%s", cwd, n=max_commits)
+    except GitError:
+        return {}
+
+    times: dict[str, int] = {}
+    entries: list[tuple[list[str], int, str]] = []
+    for line in raw.split("\n"):
+        parts = line.split("\x1f")
+        if len(parts) != 4 or not parts[2].isdigit():
+            continue
+        sha, parents, ct, subject = parts
+        times[sha] = int(ct)
+        entries.append((parents.split(), int(ct), subject))
+
+    started: dict[str, int] = {}
+    durations: dict[str, float] = {}
+    for parents, ct, subject in reversed(entries):  # oldest first
+        task_id = _task_id_from_subject(subject, spec_id)
+        if task_id is None:
+            continue
+        if task_id not in started:
+            base = times.get(parents[0]) if parents else None
+            started[task_id] = base if base is not None else ct
+        if subject.startswith(f"task({spec_id}@{task_id}@complete)"):
+            durations[task_id] = float(max(ct - started.pop(task_id), 0))
+        elif subject.startswith(f"task({spec_id}@{task_id}@failed)"):
+            # A later re-run starts its own span.
+            started.pop(task_id)
+    return durations
@@ -0,0 +1,99 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent per-worktree index of task trailers, keyed by the scanned HEAD.
+
+The index lives under the git common dir (``.git/arborist/state-index/``)
+rather than the working tree, so ``git add -A`` never picks it up. It is a
+cache: any mismatch or read error just means a full rescan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from agent_arborist.git.repo import git_common_dir
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+
+
+@dataclass
+class StateIndex:
+    """Latest trailers per task as of ``head``."""
+
+    head: str
+    on_base: bool
+    base_tip: str | None = None
+    trailers: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "head": self.head,
+            "on_base": self.on_base,
+            "base_tip": self.base_tip,
+            "trailers": self.trailers,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> StateIndex:
+        return cls(
+            head=data["head"],
+            on_base=data["on_base"],
+            base_tip=data.get("base_tip"),
+            trailers=data.get("trailers", {}),
+        )
+
+
+@lru_cache(maxsize=None)
+def _index_dir(cwd: str) -> Path:
+    return git_common_dir(Path(cwd)) / "arborist" / "state-index"
+
+
+def index_path(cwd: Path, *, spec_id: str, base_branch: str) -> Path:
+    """Index file for one (worktree, spec_id, base_branch) combination."""
+    resolved = str(Path(cwd).resolve())
+    key = hashlib.sha1(f"{resolved}\0{spec_id}\0{base_branch}".encode()).hexdigest()[:16]
+    return _index_dir(resolved) / f"{key}.json"
+
+
+def load_index(path: Path) -> StateIndex | None:
+    try:
+        data = json.loads(path.read_text())
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return StateIndex.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_index(path: Path, index: StateIndex) -> None:
+    """Write atomically so concurrent readers never see a partial file."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index.to_dict(), f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("Could not write state index %s: %s", path, e)
@@ -0,0 +1,301 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Append-only sqlite store of task run reports.
+
+The per-run JSON files in the report directory stay the record of truth
+(they are committed and referenced by ``Arborist-Report`` trailers); the
+store indexes them so listings and summaries are single queries. It lives
+under the git common dir (``.git/arborist/reports.sqlite``), shared by all
+worktrees and never picked up by ``git add -A``.
+
+Rows are keyed by the report directory relative to the worktree root plus
+the filename, so a report written from a parallel-mode worktree and the
+same file merged back into the main checkout are one row. Because every
+worktree shares the store, a key can hold rows for files that only exist
+on another branch, or that were deleted; ``load_reports`` therefore limits
+its queries to the files the directory holds right now.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+from collections.abc import Collection
+from contextlib import closing
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    dir TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    task_id TEXT,
+    spec_id TEXT,
+    result TEXT,
+    retries INTEGER NOT NULL DEFAULT 0,
+    duration_secs REAL,
+    runner TEXT,
+    model TEXT,
+    tests_passed INTEGER,
+    tests_failed INTEGER,
+    tests_skipped INTEGER,
+    completed_at TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (dir, filename)
+);
+CREATE INDEX IF NOT EXISTS reports_task ON reports (dir, task_id);
+CREATE INDEX IF NOT EXISTS reports_result ON reports (dir, result);
+CREATE INDEX IF NOT EXISTS reports_spec ON reports (spec_id);
+"""
+
+_COLUMNS = (
+    "task_id", "spec_id", "result", "retries", "duration_secs", "runner", "model",
+    "tests_passed", "tests_failed", "tests_skipped", "completed_at",
+)
+
+
+def store_path(cwd: Path) -> Path | None:
+    """The shared store for the repository containing *cwd*, or None outside git."""
+    from agent_arborist.git.repo import GitError, git_common_dir
+
+    try:
+        return git_common_dir(cwd) / "arborist" / "reports.sqlite"
+    except GitError:
+        return None
+
+
+def report_key_dir(report_dir: Path, cwd: Path) -> str:
+    """Store key for a report directory: relative to *cwd* when inside it."""
+    report_dir = Path(report_dir).resolve()
+    try:
+        return report_dir.relative_to(Path(cwd).resolve()).as_posix()
+    except ValueError:
+        return str(report_dir)
+
+
+class ReportStore:
+    """Reports indexed by (directory key, filename). Rows are never updated."""
+
+    def __init__(self, path: Path | str):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._memory = sqlite3.connect(":memory:") if self.path == ":memory:" else None
+        with self._conn() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # Only an index over the JSON files: rebuilt by the next import.
+                conn.execute("DROP TABLE IF EXISTS reports")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @classmethod
+    def for_repo(cls, cwd: Path) -> ReportStore:
+        path = store_path(cwd)
+        return cls(path if path is not None else ":memory:")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._memory is not None:
+            return self._memory
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _conn(self):
+        # In-memory stores keep one connection; file stores open one per call.
+        conn = self._connect()
+        if self._memory is not None:
+            return _Borrowed(conn)
+        return closing(conn)
+
+    def add(self, data: dict, *, dir: str, filename: str) -> bool:
+        """Insert one report; False if (dir, filename) is already stored.
+
+        Reports without a task ID or a pass/fail result are kept, with those
+        columns NULL, so listings still show every file.
+        """
+        row = _row(data)
+        if row[0] is None or row[2] is None:
+            logger.warning("Report %s has no task_id or pass/fail result", filename)
+        with self._conn() as conn, conn:
+            cur = conn.execute(
+                f"INSERT OR IGNORE INTO reports (dir, filename, {', '.join(_COLUMNS)}, data) "
+                f"VALUES (?, ?, {', '.join('?' for _ in _COLUMNS)}, ?)",
+                (dir, filename, *row, json.dumps(data)),
+            )
+            return cur.rowcount == 1
+
+    def import_dir(self, report_dir: Path, *, dir: str, names: Collection[str] | None = None) -> int:
+        """Import JSON reports from *report_dir* that the store doesn't have yet.
+
+        Only new filenames are read and parsed, so re-importing a large,
+        mostly known directory costs one listing. *names* is that listing,
+        if the caller already has it (see ``list_reports``).
+        """
+        if names is None:
+            names = list_reports(report_dir)
+        with self._conn() as conn:
+            known = {r[0] for r in conn.execute("SELECT filename FROM reports WHERE dir = ?", (dir,))}
+        added = 0
+        for name in sorted(set(names) - known):
+            try:
+                data = json.loads((Path(report_dir) / name).read_text())
+            except (OSError, ValueError):
+                continue
+            if isinstance(data, dict) and self.add(data, dir=dir, filename=name):
+                added += 1
+        if added:
+            logger.debug("Imported %d report(s) from %s", added, report_dir)
+        return added
+
+    def reports(
+        self, *, dir: str, task_id: str | None = None, filenames: Collection[str] | None = None,
+    ) -> list[dict]:
+        """Stored report JSON, ordered by filename (task, then run timestamp).
+
+        With *filenames*, only those files' rows are returned.
+        """
+        with self._conn() as conn, conn:
+            where, params = _where(conn, dir, task_id, filenames)
+            sql = f"SELECT data FROM reports {where} ORDER BY filename"
+            return [json.loads(r[0]) for r in conn.execute(sql, params)]
+
+    def summary(
+        self, *, dir: str, task_id: str | None = None, filenames: Collection[str] | None = None,
+    ) -> dict:
+        """Totals and averages in one aggregate query."""
+        with self._conn() as conn, conn:
+            where, params = _where(conn, dir, task_id, filenames)
+            sql = (
+                "SELECT COUNT(*), COALESCE(SUM(result = 'pass'), 0), COALESCE(SUM(result = 'fail'), 0), "
+                f"AVG(retries), AVG(duration_secs) FROM reports {where}"
+            )
+            total, passed, failed, avg_retries, avg_duration = conn.execute(sql, params).fetchone()
+        summary = {
+            "total": total,
+            "passed": passed,
+            "failed": failed,
+            "avg_retries": round(avg_retries, 2) if total else 0,
+        }
+        if avg_duration is not None:
+            summary["avg_duration_secs"] = round(avg_duration, 1)
+        return summary
+
+    def durations(self, *, dir: str, filenames: Collection[str] | None = None) -> dict[str, float]:
+        """Latest recorded ``duration_secs`` per task, from the indexed column."""
+        with self._conn() as conn, conn:
+            where, params = _where(conn, dir, None, filenames)
+            sql = (
+                f"SELECT task_id, duration_secs FROM reports {where} "
+                "AND task_id IS NOT NULL AND duration_secs IS NOT NULL ORDER BY filename"
+            )
+            # Filenames end in the run timestamp, so the newest run wins.
+            return {task_id: float(secs) for task_id, secs in conn.execute(sql, params)}
+
+
+def _where(
+    conn: sqlite3.Connection, dir: str, task_id: str | None, filenames: Collection[str] | None,
+) -> tuple[str, list]:
+    sql = "WHERE dir = ?"
+    params: list = [dir]
+    if task_id is not None:
+        sql += " AND task_id = ?"
+        params.append(task_id)
+    if filenames is not None:
+        # A temp table rather than one placeholder per file: a report
+        # directory can outgrow SQLite's host parameter limit.
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (filename TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.wanted")
+        conn.executemany("INSERT OR IGNORE INTO temp.wanted VALUES (?)", ((n,) for n in filenames))
+        sql += " AND filename IN (SELECT filename FROM temp.wanted)"
+    return sql, params
+
+
+def list_reports(report_dir: Path) -> set[str]:
+    """JSON report filenames in *report_dir*; empty if it can't be listed."""
+    try:
+        with os.scandir(report_dir) as it:
+            return {e.name for e in it if e.name.endswith(".json") and e.is_file()}
+    except OSError:
+        return set()
+
+
+class _Borrowed:
+    """Context manager that hands out a shared connection without closing it."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.conn
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+def _row(data: dict) -> tuple:
+    row = []
+    for col in _COLUMNS:
+        value = data.get(col)
+        if col == "task_id":
+            value = value or None
+        elif col == "result" and value not in ("pass", "fail"):
+            value = None
+        elif col == "retries":
+            try:
+                value = int(value or 0)
+            except (TypeError, ValueError):
+                value = 0
+        row.append(value)
+    return tuple(row)
+
+
+def load_reports(report_dir: Path, cwd: Path, *, task_id: str | None = None) -> tuple[list[dict], dict]:
+    """Import new JSON files from *report_dir*, then return ``(reports, summary)``.
+
+    Only files present in *report_dir* now are returned, whatever else the
+    shared store holds for the same directory key.
+    """
+    store = ReportStore.for_repo(cwd)
+    key = report_key_dir(report_dir, cwd)
+    names = list_reports(report_dir)
+    store.import_dir(report_dir, dir=key, names=names)
+    return (
+        store.reports(dir=key, task_id=task_id, filenames=names),
+        store.summary(dir=key, task_id=task_id, filenames=names),
+    )
+
+
+def load_durations(report_dir: Path, cwd: Path) -> dict[str, float]:
+    """Import new JSON files from *report_dir*, then return per-task durations."""
+    store = ReportStore.for_repo(cwd)
+    key = report_key_dir(report_dir, cwd)
+    names = list_reports(report_dir)
+    store.import_dir(report_dir, dir=key, names=names)
+    return store.durations(dir=key, filenames=names)
+
+
+def record_report(data: dict, report_file: Path, cwd: Path) -> None:
+    """Append a just-written report to the store; failures only cost the fast path."""
+    try:
+        store = ReportStore.for_repo(cwd)
+        store.add(data, dir=report_key_dir(report_file.parent, cwd), filename=report_file.name)
+    except (OSError, sqlite3.Error) as e:
+        logger.debug("Could not record report %s in store: %s", report_file, e)
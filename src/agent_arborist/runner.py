@@ -14,10 +14,19 @@
 
 """Runner abstraction for executing prompts via CLI tools."""
 
+import asyncio
+import codecs
+import inspect
 import logging
+import os
+import queue
+import signal
 import subprocess
 import shutil
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
@@ -93,6 +102,382 @@ class RunResult:
     exit_code: int = 0
 
 
+OutputCallback = Callable[[str, str], None]
+"""Called as ``on_output(stream, line)`` per line; stream is "stdout" or "stderr"."""
+
+_POSIX = os.name == "posix"
+
+# How much of each stream a streamed run keeps in memory for RunResult.
+DEFAULT_TAIL_CHARS = 64 * 1024
+
+
+class _Tail:
+    """The last ``limit`` characters of a line stream."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lines: deque[str] = deque()
+        self._size = 0
+
+    def append(self, line: str) -> None:
+        self._lines.append(line)
+        self._size += len(line)
+        while self._size > self.limit and len(self._lines) > 1:
+            self._size -= len(self._lines.popleft())
+
+    def text(self) -> str:
+        return "".join(self._lines)[-self.limit:]
+
+
+class _OutputSink:
+    """Tees output lines into a log file and callback, keeping a bounded tail.
+
+    Shared by the threaded (``_stream_command``) and asyncio
+    (``_astream_process``) readers.
+    """
+
+    def __init__(
+        self,
+        log_file: Path | None,
+        on_output: OutputCallback | None,
+        tail_chars: int,
+    ):
+        self.tails = {"stdout": _Tail(tail_chars), "stderr": _Tail(tail_chars)}
+        self._on_output = on_output
+        self._lock = threading.Lock()
+        self._log = None
+        if log_file is not None:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(log_file, "w", encoding="utf-8", buffering=1)
+
+    def feed(self, name: str, line: str) -> None:
+        with self._lock:
+            self.tails[name].append(line)
+            if self._log is not None and not self._log.closed:
+                if not line.endswith("\n"):
+                    line += "\n"
+                self._log.write(line if name == "stdout" else f"[stderr] {line}")
+            if self._on_output is not None:
+                try:
+                    self._on_output(name, line.rstrip("\n"))
+                except Exception as e:
+                    logger.warning("Output callback failed: %s", e)
+
+    def note(self, text: str) -> None:
+        """Append a marker line to the log (not the tails)."""
+        with self._lock:
+            if self._log is not None and not self._log.closed:
+                self._log.write(f"=== {text} ===\n")
+
+    def text(self, name: str) -> str:
+        with self._lock:
+            return self.tails[name].text()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+
+
+def _stream_command(
+    cmd: list[str],
+    timeout: int,
+    *,
+    cwd: Path | None = None,
+    stdin: int | None = None,
+    log_file: Path | None = None,
+    on_output: OutputCallback | None = None,
+    tail_chars: int = DEFAULT_TAIL_CHARS,
+) -> RunResult:
+    """Run cmd with Popen, teeing each output line to log_file and on_output.
+
+    Lines reach the log as they are produced, so a crash or timeout keeps
+    everything up to that point. Only a bounded tail of each stream is
+    held in memory for the returned RunResult. stderr lines are prefixed
+    with ``[stderr]`` in the log. The log is only created once cmd has
+    started, so a spawn failure leaves the caller to record the error.
+    On timeout the whole process group is killed, as in ``_astream_process``.
+    """
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=stdin,
+            cwd=cwd,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            start_new_session=_POSIX,
+        )
+    except Exception as e:
+        logger.warning("Command error: %s", e)
+        return RunResult(success=False, output="", error=str(e), exit_code=-1)
+
+    sink = _OutputSink(log_file, on_output, tail_chars)
+
+    def pump(name: str, pipe) -> None:
+        for line in pipe:
+            sink.feed(name, line)
+        pipe.close()
+
+    try:
+        threads = [
+            threading.Thread(target=pump, args=("stdout", proc.stdout), daemon=True),
+            threading.Thread(target=pump, args=("stderr", proc.stderr), daemon=True),
+        ]
+        for t in threads:
+            t.start()
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(proc)
+            proc.wait()
+            # Anything outside the group may still hold the pipes open; don't wait on it forever.
+            for t in threads:
+                t.join(timeout=5)
+            logger.warning("Command timed out after %ds: %s", timeout, cmd[0])
+            sink.note(f"timed out after {timeout} seconds")
+            return RunResult(
+                success=False,
+                output=sink.text("stdout").strip(),
+                error=f"Timeout after {timeout} seconds",
+                exit_code=-1,
+            )
+        except BaseException:
+            # Its own session doesn't get the terminal's Ctrl-C; don't leave it running.
+            _kill_process_group(proc)
+            raise
+        for t in threads:
+            t.join()
+    finally:
+        sink.close()
+
+    output = sink.text("stdout")
+    logger.debug("Command output tail length: %d chars", len(output))
+    return RunResult(
+        success=returncode == 0,
+        output=output.strip(),
+        error=sink.text("stderr").strip() if returncode != 0 else None,
+        exit_code=returncode,
+    )
+
+
+def _shell_command(
+    shell,
+    cmd: list[str],
+    timeout: int,
+    *,
+    log_file: Path | None = None,
+    on_output: OutputCallback | None = None,
+    stop: threading.Event | None = None,
+    tail_chars: int = DEFAULT_TAIL_CHARS,
+) -> RunResult | None:
+    """Run cmd through a container shell agent, streaming like ``_stream_command``.
+
+    Returns None if the agent is busy or gone; the caller then execs instead.
+    Setting *stop* kills the command (used when an async caller is cancelled).
+    """
+    sink = _OutputSink(log_file, on_output, tail_chars)
+    try:
+        ran = shell.run(cmd, timeout, on_output=sink.feed, stop=stop)
+        if ran is None:
+            return None
+        if ran.returncode is None:
+            logger.warning("Command timed out after %ds: %s", timeout, cmd[0])
+            sink.note(f"timed out after {timeout} seconds")
+            return RunResult(
+                success=False,
+                output=sink.text("stdout").strip(),
+                error=f"Timeout after {timeout} seconds",
+                exit_code=-1,
+            )
+    finally:
+        sink.close()
+    return RunResult(
+        success=ran.returncode == 0,
+        output=sink.text("stdout").strip(),
+        error=sink.text("stderr").strip() if ran.returncode != 0 else None,
+        exit_code=ran.returncode,
+    )
+
+
+def _exec_broke(result: RunResult) -> bool:
+    """Whether a container command failed to run at all, rather than ran and failed.
+
+    That is a spawn error (exit -1 other than a timeout) or one of the exit
+    codes ``docker exec`` keeps for its own failures.
+    """
+    from agent_arborist.devcontainer import EXEC_FAILURE_CODES
+
+    if result.exit_code == -1:
+        return not (result.error or "").startswith("Timeout after")
+    return result.exit_code in EXEC_FAILURE_CODES
+
+
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    """Kill proc and, on POSIX, everything it spawned (it leads its own session)."""
+    try:
+        if _POSIX:
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class _PipeProtocol(asyncio.SubprocessProtocol):
+    """Splits a child's stdout/stderr into lines for an ``_OutputSink``.
+
+    Output that arrives before ``attach`` is held back, so the sink (and
+    its log file) is only created once the command has started.
+    """
+
+    def __init__(self, tail_chars: int):
+        loop = asyncio.get_running_loop()
+        self.exited = loop.create_future()
+        self.drained = loop.create_future()  # stdout and stderr both closed
+        self._tail_chars = tail_chars
+        self._sink: _OutputSink | None = None
+        self._held: list[tuple[str, str]] = []
+        self._decoders = {fd: codecs.getincrementaldecoder("utf-8")(errors="replace") for fd in (1, 2)}
+        self._pending = {1: "", 2: ""}
+
+    def attach(self, sink: _OutputSink) -> None:
+        self._sink = sink
+        for name, line in self._held:
+            sink.feed(name, line)
+        self._held.clear()
+
+    def _feed(self, fd: int, line: str) -> None:
+        name = "stdout" if fd == 1 else "stderr"
+        if self._sink is None:
+            self._held.append((name, line))
+        else:
+            self._sink.feed(name, line)
+
+    def pipe_data_received(self, fd: int, data: bytes) -> None:
+        *lines, pending = (self._pending[fd] + self._decoders[fd].decode(data)).split("\n")
+        for line in lines:
+            self._feed(fd, line.rstrip("\r") + "\n")
+        if len(pending) > self._tail_chars:
+            self._feed(fd, pending)
+            pending = ""
+        self._pending[fd] = pending
+
+    def pipe_connection_lost(self, fd: int, exc: Exception | None) -> None:
+        if fd not in self._pending:
+            return
+        pending = self._pending.pop(fd) + self._decoders[fd].decode(b"", final=True)
+        if pending:
+            self._feed(fd, pending)
+        if not self._pending and not self.drained.done():
+            self.drained.set_result(None)
+
+    def process_exited(self) -> None:
+        if not self.exited.done():
+            self.exited.set_result(None)
+
+
+async def _astream_process(
+    cmd: list[str] | str,
+    timeout: float | None,
+    *,
+    cwd: Path | None = None,
+    stdin: int | None = None,
+    log_file: Path | None = None,
+    on_output: OutputCallback | None = None,
+    tail_chars: int = DEFAULT_TAIL_CHARS,
+) -> tuple[int | None, str, str]:
+    """Run cmd on the event loop, streaming output like ``_stream_command``.
+
+    A str cmd runs through the shell. Returns ``(returncode, stdout_tail,
+    stderr_tail)``; returncode is None if the timeout expired. On timeout
+    or cancellation the whole process group is killed before returning
+    (or re-raising CancelledError). Raises OSError if cmd can't start,
+    before *log_file* is created.
+
+    Spawned with ``loop.subprocess_exec`` rather than
+    ``create_subprocess_exec`` so the transport can be closed once done;
+    left open, it is finalized after its loop is gone and warns "Event
+    loop is closed".
+    """
+    loop = asyncio.get_running_loop()
+    kwargs = dict(
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=stdin,
+        cwd=cwd,
+        start_new_session=_POSIX,
+    )
+
+    def factory() -> _PipeProtocol:
+        return _PipeProtocol(tail_chars)
+
+    if isinstance(cmd, str):
+        transport, protocol = await loop.subprocess_shell(factory, cmd, **kwargs)
+    else:
+        transport, protocol = await loop.subprocess_exec(factory, *cmd, **kwargs)
+    sink = None
+    try:
+        sink = _OutputSink(log_file, on_output, tail_chars)
+        protocol.attach(sink)
+        proc = transport.get_extra_info("subprocess")
+        try:
+            done, _ = await asyncio.wait({protocol.exited}, timeout=timeout)
+            if not done:
+                _kill_process_group(proc)
+                await protocol.exited
+                # Grandchildren may still hold the pipes open; don't wait on them forever.
+                await asyncio.wait({protocol.drained}, timeout=5)
+                sink.note(f"timed out after {timeout} seconds")
+                return None, sink.text("stdout"), sink.text("stderr")
+            await protocol.drained
+        except BaseException:
+            _kill_process_group(proc)
+            raise
+        return transport.get_returncode(), sink.text("stdout"), sink.text("stderr")
+    finally:
+        transport.close()
+        if sink is not None:
+            sink.close()
+
+
+async def _astream_command(
+    cmd: list[str],
+    timeout: int,
+    *,
+    cwd: Path | None = None,
+    stdin: int | None = None,
+    log_file: Path | None = None,
+    on_output: OutputCallback | None = None,
+) -> RunResult:
+    """``_astream_process`` wrapped into a RunResult, like ``_stream_command``."""
+    try:
+        returncode, stdout, stderr = await _astream_process(
+            cmd, timeout, cwd=cwd, stdin=stdin, log_file=log_file, on_output=on_output,
+        )
+    except OSError as e:
+        logger.warning("Command error: %s", e)
+        return RunResult(success=False, output="", error=str(e), exit_code=-1)
+    if returncode is None:
+        logger.warning("Command timed out after %ds: %s", timeout, cmd[0])
+        return RunResult(
+            success=False,
+            output=stdout.strip(),
+            error=f"Timeout after {timeout} seconds",
+            exit_code=-1,
+        )
+    logger.debug("Command output tail length: %d chars", len(stdout))
+    return RunResult(
+        success=returncode == 0,
+        output=stdout.strip(),
+        error=stderr.strip() if returncode != 0 else None,
+        exit_code=returncode,
+    )
+
+
 def _execute_command(
     cmd: list[str],
     timeout: int,
@@ -100,6 +485,9 @@ def _execute_command(
     container_workspace: Path | None = None,
     container_up_timeout: int | None = None,
     container_check_timeout: int | None = None,
+    *,
+    log_file: Path | None = None,
+    on_output: OutputCallback | None = None,
 ) -> RunResult:
     """Execute a command and return standardized result.
 
@@ -112,22 +500,58 @@ def _execute_command(
         container_workspace: If set, run inside devcontainer for this workspace
         container_up_timeout: Timeout for devcontainer up (None = use config default)
         container_check_timeout: Timeout for container check (None = use config default)
+        log_file: If set, stream output into this file as it is produced
+        on_output: If set, called with ``(stream, line)`` for every output line
+
+    With log_file or on_output the command is streamed (see
+    ``_stream_command``) and RunResult carries only the output tail.
 
     Returns:
         RunResult with success status, output, and error details
     """
     logger.info("Running %s (timeout=%ds)", cmd[0], timeout)
     logger.debug("Full command: %s", cmd)
+    streaming = log_file is not None or on_output is not None
 
     if container_workspace:
-        from agent_arborist.devcontainer import ensure_container_running, devcontainer_exec
+        from agent_arborist.devcontainer import (
+            EXEC_FAILURE_CODES,
+            container_exec_args,
+            container_exec_failed,
+            container_shell,
+            devcontainer_exec,
+            ensure_container_running,
+        )
         kwargs = {}
         if container_up_timeout is not None:
             kwargs["timeout_up"] = container_up_timeout
         if container_check_timeout is not None:
             kwargs["timeout_check"] = container_check_timeout
         ensure_container_running(container_workspace, **kwargs)
-        result = devcontainer_exec(cmd, container_workspace, timeout=timeout)
+        shell = container_shell(container_workspace)
+        if shell is not None:
+            shelled = _shell_command(shell, cmd, timeout, log_file=log_file, on_output=on_output)
+            if shelled is not None:
+                if not shell.alive:
+                    container_exec_failed(container_workspace)
+                return shelled
+        if streaming:
+            streamed = _stream_command(
+                container_exec_args(cmd, container_workspace), timeout,
+                stdin=subprocess.DEVNULL, log_file=log_file, on_output=on_output,
+            )
+            if _exec_broke(streamed):
+                container_exec_failed(container_workspace)
+            return streamed
+        try:
+            result = devcontainer_exec(cmd, container_workspace, timeout=timeout)
+        except OSError:
+            container_exec_failed(container_workspace)
+            raise
+        if result.returncode in EXEC_FAILURE_CODES:
+            container_exec_failed(container_workspace)
+    elif streaming:
+        return _stream_command(cmd, timeout, cwd=cwd, log_file=log_file, on_output=on_output)
     else:
         try:
             result = subprocess.run(
@@ -163,6 +587,72 @@ def _execute_command(
     )
 
 
+async def _aexecute_command(
+    cmd: list[str],
+    timeout: int,
+    cwd: Path | None = None,
+    container_workspace: Path | None = None,
+    container_up_timeout: int | None = None,
+    container_check_timeout: int | None = None,
+    *,
+    log_file: Path | None = None,
+    on_output: OutputCallback | None = None,
+) -> RunResult:
+    """Async counterpart of ``_execute_command``; output is always streamed.
+
+    Cancelling the awaiting task kills the command's process group.
+    """
+    logger.info("Running %s (timeout=%ds)", cmd[0], timeout)
+    logger.debug("Full command: %s", cmd)
+
+    if container_workspace:
+        from agent_arborist.devcontainer import (
+            container_exec_args,
+            container_exec_failed,
+            container_shell,
+            ensure_container_running,
+        )
+        kwargs = {}
+        if container_up_timeout is not None:
+            kwargs["timeout_up"] = container_up_timeout
+        if container_check_timeout is not None:
+            kwargs["timeout_check"] = container_check_timeout
+        await asyncio.to_thread(ensure_container_running, container_workspace, **kwargs)
+        shell = container_shell(container_workspace)
+        if shell is not None:
+            stop = threading.Event()
+            try:
+                shelled = await asyncio.to_thread(
+                    _shell_command, shell, cmd, timeout, log_file=log_file, on_output=on_output, stop=stop,
+                )
+            except asyncio.CancelledError:
+                stop.set()
+                raise
+            if shelled is not None:
+                if not shell.alive:
+                    container_exec_failed(container_workspace)
+                return shelled
+        streamed = await _astream_command(
+            container_exec_args(cmd, container_workspace), timeout,
+            stdin=subprocess.DEVNULL, log_file=log_file, on_output=on_output,
+        )
+        if _exec_broke(streamed):
+            container_exec_failed(container_workspace)
+        return streamed
+    return await _astream_command(cmd, timeout, cwd=cwd, log_file=log_file, on_output=on_output)
+
+
+def _output_kwargs(run: Callable[..., RunResult], **kwargs) -> dict:
+    """The set *kwargs* (``log_file``, ``on_output``) that *run* accepts.
+
+    Runners written before these parameters existed take neither; they
+    are run without streaming and their log is written afterwards.
+    """
+    params = inspect.signature(run).parameters
+    open_kwargs = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+    return {k: v for k, v in kwargs.items() if v is not None and (open_kwargs or k in params)}
+
+
 class Runner(ABC):
     """Base class for prompt runners."""
 
@@ -178,6 +668,8 @@ class Runner(ABC):
         container_workspace: Path | None = None,
         container_up_timeout: int | None = None,
         container_check_timeout: int | None = None,
+        log_file: Path | None = None,
+        on_output: OutputCallback | None = None,
     ) -> RunResult:
         """Run a prompt and return the result.
 
@@ -188,14 +680,111 @@ class Runner(ABC):
             container_workspace: Workspace path for devcontainer execution
             container_up_timeout: Timeout for devcontainer up (None = config default)
             container_check_timeout: Timeout for container check (None = config default)
+            log_file: Stream output into this file while the runner executes
+            on_output: Callback invoked with ``(stream, line)`` per output line
+
+        ``log_file`` and ``on_output`` are only passed when set, and only
+        if ``run`` accepts them, so older subclasses without them still work.
         """
         pass
 
+    def stream(self, prompt: str, **kwargs) -> "RunStream":
+        """Run a prompt in the background, iterating output lines as they arrive.
+
+        Accepts the same keyword arguments as ``run``. See ``RunStream``.
+        """
+        return RunStream(self, prompt, kwargs)
+
+    def build_command(self, prompt: str) -> list[str] | None:
+        """CLI argv for a prompt, or None. Runners that provide it get a native ``arun``."""
+        return None
+
+    async def arun(
+        self,
+        prompt: str,
+        timeout: int = 600,
+        cwd: Path | None = None,
+        container_workspace: Path | None = None,
+        container_up_timeout: int | None = None,
+        container_check_timeout: int | None = None,
+        log_file: Path | None = None,
+        on_output: OutputCallback | None = None,
+    ) -> RunResult:
+        """Async ``run`` on the event loop via ``loop.subprocess_exec``.
+
+        Cancelling the awaiting task kills the runner's process group.
+        Runners without ``build_command`` fall back to ``run`` in a thread.
+        """
+        cmd = self.build_command(prompt)
+        if cmd is None:
+            return await asyncio.to_thread(
+                self.run, prompt, timeout=timeout, cwd=cwd,
+                container_workspace=container_workspace,
+                container_up_timeout=container_up_timeout,
+                container_check_timeout=container_check_timeout,
+                **_output_kwargs(self.run, log_file=log_file, on_output=on_output),
+            )
+        return await _aexecute_command(
+            cmd, timeout, cwd, container_workspace,
+            container_up_timeout, container_check_timeout,
+            log_file=log_file, on_output=on_output,
+        )
+
     def is_available(self) -> bool:
         """Check if this runner is available."""
         return shutil.which(self.command) is not None
 
 
+class RunStream:
+    """Iterator over ``(stream, line)`` pairs from a runner running in a thread.
+
+    Lines pass through a bounded queue, so a slow consumer throttles the
+    reader rather than buffering output. ``result`` is set once iteration
+    is exhausted. Breaking out early stops delivery; the run itself
+    continues to completion.
+    """
+
+    _DONE = object()
+
+    def __init__(self, runner: Runner, prompt: str, kwargs: dict, maxsize: int = 1024):
+        self.result: RunResult | None = None
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(runner, prompt, kwargs), daemon=True,
+        )
+        self._thread.start()
+
+    def _put(self, item) -> None:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self, runner: Runner, prompt: str, kwargs: dict) -> None:
+        try:
+            self.result = runner.run(
+                prompt, on_output=lambda stream, line: self._put((stream, line)), **kwargs,
+            )
+        except Exception as e:
+            self.result = RunResult(success=False, output="", error=str(e), exit_code=-1)
+        finally:
+            self._put(self._DONE)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is self._DONE:
+                    self._thread.join()
+                    return
+                yield item
+        finally:
+            self._closed.set()
+
+
 class ClaudeRunner(Runner):
     """Runner for Claude Code CLI."""
 
@@ -210,6 +799,12 @@ class ClaudeRunner(Runner):
         """
         self.model = model
 
+    def build_command(self, prompt: str) -> list[str]:
+        cmd = [self.command, "--dangerously-skip-permissions", "-p", prompt]
+        if self.model:
+            cmd.extend(["--model", self.model])
+        return cmd
+
     def run(
         self,
         prompt: str,
@@ -218,18 +813,17 @@ class ClaudeRunner(Runner):
         container_workspace: Path | None = None,
         container_up_timeout: int | None = None,
         container_check_timeout: int | None = None,
+        log_file: Path | None = None,
+        on_output: OutputCallback | None = None,
     ) -> RunResult:
         """Run a prompt using Claude CLI.
 
         If cwd is provided, Claude runs in that directory and can explore files there.
         """
-        cmd = [self.command, "--dangerously-skip-permissions", "-p", prompt]
-        if self.model:
-            cmd.extend(["--model", self.model])
-
         return _execute_command(
-            cmd, timeout, cwd, container_workspace,
+            self.build_command(prompt), timeout, cwd, container_workspace,
             container_up_timeout, container_check_timeout,
+            log_file=log_file, on_output=on_output,
         )
 
 
@@ -247,6 +841,15 @@ class OpencodeRunner(Runner):
         """
         self.model = model
 
+    def build_command(self, prompt: str) -> list[str]:
+        # OpenCode uses 'run' subcommand for non-interactive mode
+        # TODO: skip permissions can be set in target repo opencode.json file
+        cmd = [self.command, "run"]
+        if self.model:
+            cmd.extend(["-m", self.model])
+        cmd.append(prompt)
+        return cmd
+
     def run(
         self,
         prompt: str,
@@ -255,18 +858,14 @@ class OpencodeRunner(Runner):
         container_workspace: Path | None = None,
         container_up_timeout: int | None = None,
         container_check_timeout: int | None = None,
+        log_file: Path | None = None,
+        on_output: OutputCallback | None = None,
     ) -> RunResult:
         """Run a prompt using OpenCode CLI."""
-        # OpenCode uses 'run' subcommand for non-interactive mode
-        # TODO: skip permissions can be set in target repo opencode.json file
-        cmd = [self.command, "run"]
-        if self.model:
-            cmd.extend(["-m", self.model])
-        cmd.append(prompt)
-
         return _execute_command(
-            cmd, timeout, cwd, container_workspace,
+            self.build_command(prompt), timeout, cwd, container_workspace,
             container_up_timeout, container_check_timeout,
+            log_file=log_file, on_output=on_output,
         )
 
 
@@ -284,6 +883,14 @@ class GeminiRunner(Runner):
         """
         self.model = model
 
+    def build_command(self, prompt: str) -> list[str]:
+        # Gemini CLI uses positional prompt argument
+        cmd = [self.command, "--yolo"]
+        if self.model:
+            cmd.extend(["-m", self.model])
+        cmd.append(prompt)
+        return cmd
+
     def run(
         self,
         prompt: str,
@@ -292,17 +899,14 @@ class GeminiRunner(Runner):
         container_workspace: Path | None = None,
         container_up_timeout: int | None = None,
         container_check_timeout: int | None = None,
+        log_file: Path | None = None,
+        on_output: OutputCallback | None = None,
     ) -> RunResult:
         """Run a prompt using Gemini CLI."""
-        # Gemini CLI uses positional prompt argument
-        cmd = [self.command, "--yolo"]
-        if self.model:
-            cmd.extend(["-m", self.model])
-        cmd.append(prompt)
-
         return _execute_command(
-            cmd, timeout, cwd, container_workspace,
+            self.build_command(prompt), timeout, cwd, container_workspace,
             container_up_timeout, container_check_timeout,
+            log_file=log_file, on_output=on_output,
         )
 
 
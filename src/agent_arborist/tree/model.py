@@ -16,9 +16,12 @@
 
 from __future__ import annotations
 
+import heapq
 from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import Any
 
 
 class TestType(Enum):
@@ -77,6 +80,13 @@ class TaskTree:
     execution_order: list[str] = field(default_factory=list)
     spec_files: list[str] = field(default_factory=list)
 
+    def add_node(self, node: TaskNode) -> None:
+        """Insert *node*, appending it to its parent's children if the parent exists."""
+        self.nodes[node.id] = node
+        parent = self.nodes.get(node.parent) if node.parent else None
+        if parent is not None and node.id not in parent.children:
+            parent.children.append(node.id)
+
     @property
     def root_ids(self) -> list[str]:
         return [nid for nid, n in self.nodes.items() if n.parent is None]
@@ -112,40 +122,59 @@ class TaskTree:
             result.extend(self.leaves_under(child_id))
         return result
 
-    def _structural_sort_key(self, node_id: str) -> tuple:
-        """Return a sort key that respects tree structure order.
+    def structural_key(self) -> Callable[[str], tuple]:
+        """Return a sort key function that respects tree structure order.
 
-        Produces (root_index, child_index_path...) so that tasks under M2
+        Keys are (root_index, child_index_path...) so that tasks under M2
         sort before tasks under M10, matching the order roots and children
-        appear in the tree rather than lexicographic order.
+        appear in the tree rather than lexicographic order. Root and sibling
+        positions are indexed once per call and each key is computed once,
+        so the function describes the tree as it was when it was made.
         """
-        # Walk up to build the path from root to this node
-        path = [node_id]
-        nid = node_id
-        while self.nodes[nid].parent is not None:
-            nid = self.nodes[nid].parent
-            path.append(nid)
-        path.reverse()  # root first
-
-        # Convert each level to its index among siblings
-        key: list[int] = []
-        root_ids = self.root_ids
-        root = path[0]
-        key.append(root_ids.index(root) if root in root_ids else 0)
-        for i in range(1, len(path)):
-            parent = self.nodes[path[i - 1]]
-            child = path[i]
-            key.append(parent.children.index(child) if child in parent.children else 0)
-        return tuple(key)
-
-    def compute_execution_order(self) -> list[str]:
+        nodes = self.nodes
+        root_ordinal = {nid: i for i, nid in enumerate(self.root_ids)}
+        sibling_ordinal: dict[str, int] = {}
+        for pid, parent in nodes.items():
+            for i, cid in enumerate(parent.children):
+                child = nodes.get(cid)
+                if child is not None and child.parent == pid:
+                    sibling_ordinal.setdefault(cid, i)
+        keys: dict[str, tuple] = {}
+
+        def key(node_id: str) -> tuple:
+            # Walk up only to the nearest ancestor whose key is known.
+            pending = []
+            nid = node_id
+            while nid not in keys:
+                pending.append(nid)
+                parent = nodes[nid].parent
+                if parent is None:
+                    keys[pending.pop()] = (root_ordinal[nid],)
+                    break
+                nid = parent
+            found = keys[nid]
+            for nid in reversed(pending):
+                found = found + (sibling_ordinal.get(nid, 0),)
+                keys[nid] = found
+            return found
+
+        return key
+
+    def compute_execution_order(
+        self, priority: Callable[[str], Any] | None = None,
+    ) -> list[str]:
         """Compute topological execution order using Kahn's algorithm.
 
         Only includes leaf tasks (actual work items).
         Ties are broken by structural tree order (root_ids and children
         ordering) so that e.g. M2 tasks execute before M10 tasks.
+
+        With *priority*, the ready set is a heap instead: among tasks whose
+        dependencies are done, the lowest ``priority(task_id)`` goes next
+        (see ``tree.schedule`` for the critical-path policy).
         """
         leaves = [n.id for n in self.leaves()]
+        leaf_set = set(leaves)
 
         # Build in-degree map for leaf dependencies
         in_degree: dict[str, int] = {}
@@ -154,19 +183,33 @@ class TaskTree:
         for nid in leaves:
             node = self.nodes[nid]
             # Only count dependencies that are also leaves
-            deps = [d for d in node.depends_on if d in leaves]
+            deps = [d for d in node.depends_on if d in leaf_set]
             in_degree[nid] = len(deps)
             for d in deps:
                 dependents.setdefault(d, []).append(nid)
 
+        order: list[str] = []
+        if priority is not None:
+            heap = [(priority(nid), nid) for nid, deg in in_degree.items() if deg == 0]
+            heapq.heapify(heap)
+            while heap:
+                _, nid = heapq.heappop(heap)
+                order.append(nid)
+                for dep in dependents.get(nid, []):
+                    in_degree[dep] -= 1
+                    if in_degree[dep] == 0:
+                        heapq.heappush(heap, (priority(dep), dep))
+            self.execution_order = order
+            return order
+
         # Kahn's: start with nodes that have no dependencies
         # Use sorted order to break ties by structural position
+        position = self.structural_key()
         ready = sorted(
             (nid for nid, deg in in_degree.items() if deg == 0),
-            key=self._structural_sort_key,
+            key=position,
         )
         queue = deque(ready)
-        order: list[str] = []
 
         while queue:
             nid = queue.popleft()
@@ -176,7 +219,7 @@ class TaskTree:
                 in_degree[dep] -= 1
                 if in_degree[dep] == 0:
                     newly_ready.append(dep)
-            newly_ready.sort(key=self._structural_sort_key)
+            newly_ready.sort(key=position)
             queue.extend(newly_ready)
 
         self.execution_order = order
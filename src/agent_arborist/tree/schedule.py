@@ -0,0 +1,208 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Priority policies for the leaf execution order, and makespan prediction.
+
+A policy turns a tree plus per-task duration estimates (seconds, from past
+runs) into a priority key for ``TaskTree.compute_execution_order``; lower
+keys run first. ``critical_path_priority`` favours tasks with the longest
+weighted chain of dependents still behind them.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import statistics
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from agent_arborist.tree.model import TaskTree
+
+logger = logging.getLogger(__name__)
+
+PriorityKey = Callable[[str], Any]
+PriorityPolicy = Callable[[TaskTree, dict[str, float]], PriorityKey]
+
+# Used for every task when no run has recorded a duration yet.
+DEFAULT_TASK_SECS = 600.0
+
+
+def estimate_durations(
+    tree: TaskTree, durations: dict[str, float], *, default: float | None = None,
+) -> dict[str, float]:
+    """Seconds for every leaf: its recorded duration, else the median of known ones."""
+    leaves = [n.id for n in tree.leaves()]
+    known = [durations[nid] for nid in leaves if nid in durations]
+    if default is None:
+        default = statistics.median(known) if known else DEFAULT_TASK_SECS
+    return {nid: durations.get(nid, default) for nid in leaves}
+
+
+def _leaf_graph(tree: TaskTree, skip: Iterable[str] = ()) -> tuple[list[str], dict[str, list[str]], dict[str, int]]:
+    """Topological order, dependents and in-degrees over leaves not in *skip*."""
+    skip = set(skip)
+    leaves = {n.id for n in tree.leaves()} - skip
+    dependents: dict[str, list[str]] = {}
+    in_degree: dict[str, int] = {}
+    for nid in leaves:
+        deps = [d for d in tree.nodes[nid].depends_on if d in leaves]
+        in_degree[nid] = len(deps)
+        for d in deps:
+            dependents.setdefault(d, []).append(nid)
+
+    remaining = dict(in_degree)
+    queue = [nid for nid, deg in remaining.items() if deg == 0]
+    order: list[str] = []
+    while queue:
+        nid = queue.pop()
+        order.append(nid)
+        for dep in dependents.get(nid, []):
+            remaining[dep] -= 1
+            if remaining[dep] == 0:
+                queue.append(dep)
+    return order, dependents, in_degree
+
+
+def _downstream(order: list[str], dependents: dict[str, list[str]], weights: dict[str, float]) -> dict[str, float]:
+    lengths: dict[str, float] = {}
+    for nid in reversed(order):
+        tail = max((lengths[d] for d in dependents.get(nid, []) if d in lengths), default=0.0)
+        lengths[nid] = weights[nid] + tail
+    return lengths
+
+
+def downstream_lengths(tree: TaskTree, durations: dict[str, float]) -> dict[str, float]:
+    """Longest weighted chain starting at each leaf, its own duration included."""
+    order, dependents, _ = _leaf_graph(tree)
+    return _downstream(order, dependents, estimate_durations(tree, durations))
+
+
+def structural_priority(tree: TaskTree, durations: dict[str, float] | None = None) -> PriorityKey:
+    """Tree order only (the historical behaviour)."""
+    return tree.structural_key()
+
+
+def critical_path_priority(tree: TaskTree, durations: dict[str, float]) -> PriorityKey:
+    """Longest remaining weighted chain first; structural order breaks ties."""
+    lengths = downstream_lengths(tree, durations)
+    position = tree.structural_key()
+    return lambda nid: (-lengths.get(nid, 0.0), position(nid))
+
+
+POLICIES: dict[str, PriorityPolicy] = {
+    "structural": structural_priority,
+    "critical-path": critical_path_priority,
+}
+
+
+def get_policy(name: str) -> PriorityPolicy:
+    try:
+        return POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown schedule policy: {name!r} (choose from {', '.join(POLICIES)})") from None
+
+
+def load_task_durations(
+    cwd: Path, *, spec_id: str, report_dir: Path | None = None, git_history: bool = True,
+) -> dict[str, float]:
+    """Per-task wall time from past runs.
+
+    ``duration_secs`` comes from the report store (see ``reports``). With
+    *git_history*, commit timestamps also give a rough figure for completed
+    tasks that have no report; that costs one ``git log`` pass.
+    """
+    from agent_arborist.reports import load_durations
+
+    durations: dict[str, float] = {}
+    if git_history:
+        from agent_arborist.git.state import scan_task_durations
+
+        durations = scan_task_durations(cwd, spec_id=spec_id)
+    if report_dir is not None and report_dir.is_dir():
+        durations.update(load_durations(report_dir, cwd))
+    logger.debug("Loaded durations for %d tasks", len(durations))
+    return durations
+
+
+@dataclass
+class MakespanEstimate:
+    """Predicted wall time for the tasks that are not complete yet."""
+
+    makespan: float
+    workers: int
+    remaining: int
+    critical_path: list[str] = field(default_factory=list)
+    critical_path_secs: float = 0.0
+    estimated: list[str] = field(default_factory=list)  # tasks without history
+
+    def to_dict(self) -> dict:
+        return {
+            "makespan_secs": round(self.makespan, 1),
+            "workers": self.workers,
+            "remaining": self.remaining,
+            "critical_path": self.critical_path,
+            "critical_path_secs": round(self.critical_path_secs, 1),
+            "estimated": self.estimated,
+        }
+
+
+def predict_makespan(
+    tree: TaskTree,
+    durations: dict[str, float],
+    *,
+    workers: int = 1,
+    completed: Iterable[str] = (),
+    policy: PriorityPolicy = critical_path_priority,
+) -> MakespanEstimate:
+    """Simulate *workers* slots taking ready tasks in *policy* order."""
+    completed = set(completed)
+    weights = estimate_durations(tree, durations)
+    order, dependents, in_degree = _leaf_graph(tree, skip=completed)
+    lengths = _downstream(order, dependents, weights)
+    key = policy(tree, durations)
+
+    critical: list[str] = []
+    roots = [nid for nid in order if in_degree[nid] == 0]
+    position = tree.structural_key()
+    nid = max(roots, key=lambda n: (lengths[n], [-k for k in position(n)]), default=None)
+    while nid is not None:
+        critical.append(nid)
+        nid = max(dependents.get(nid, []), key=lambda n: lengths.get(n, 0.0), default=None)
+
+    pending = dict(in_degree)
+    ready = [(key(n), n) for n in roots]
+    heapq.heapify(ready)
+    running: list[tuple[float, str]] = []
+    now = 0.0
+    while ready or running:
+        while ready and len(running) < workers:
+            _, n = heapq.heappop(ready)
+            heapq.heappush(running, (now + weights[n], n))
+        now, n = heapq.heappop(running)
+        for dep in dependents.get(n, []):
+            pending[dep] -= 1
+            if pending[dep] == 0:
+                heapq.heappush(ready, (key(dep), dep))
+
+    return MakespanEstimate(
+        makespan=now,
+        workers=workers,
+        remaining=len(order),
+        critical_path=critical,
+        critical_path_secs=lengths[critical[0]] if critical else 0.0,
+        estimated=sorted(n for n in order if n not in durations),
+    )
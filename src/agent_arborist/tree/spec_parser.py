@@ -88,12 +88,12 @@ def parse_spec(path: Path) -> TaskTree:
             phase_id = f"phase{phase_num}"
 
             logger.debug("Phase %s: %s", phase_id, phase_name)
-            tree.nodes[phase_id] = TaskNode(
+            tree.add_node(TaskNode(
                 id=phase_id,
                 name=phase_name,
                 source_file=rel_path,
                 source_line=line_idx + 1,
-            )
+            ))
             group_stack.append((2, phase_id))
             continue
 
@@ -107,16 +107,13 @@ def parse_spec(path: Path) -> TaskTree:
             _pop_to_level(level)
             parent_id = _current_group_id()
 
-            tree.nodes[subgroup_id] = TaskNode(
+            tree.add_node(TaskNode(
                 id=subgroup_id,
                 name=subgroup_name,
                 parent=parent_id,
                 source_file=rel_path,
                 source_line=line_idx + 1,
-            )
-
-            if parent_id and parent_id in tree.nodes:
-                tree.nodes[parent_id].children.append(subgroup_id)
+            ))
 
             group_stack.append((level, subgroup_id))
             continue
@@ -137,10 +134,7 @@ def parse_spec(path: Path) -> TaskTree:
             )
 
             logger.debug("Task %s: %s (parent=%s)", task_id, description, parent_id)
-            tree.nodes[task_id] = node
-
-            if parent_id and parent_id in tree.nodes:
-                tree.nodes[parent_id].children.append(task_id)
+            tree.add_node(node)
             continue
 
     # Parse dependencies
@@ -16,9 +16,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
 import logging
-import re
 import subprocess
 import time
 from dataclasses import dataclass, field
@@ -40,6 +41,8 @@ from agent_arborist.constants import (
     TRAILER_TEST_FAILED,
     TRAILER_TEST_SKIPPED,
     TRAILER_TEST_RUNTIME,
+    TRAILER_TEST_CACHED,
+    TRAILER_TEST_SKIPPED_SUITES,
 )
 from agent_arborist.git.repo import (
     git_add_all,
@@ -50,6 +53,10 @@ from agent_arborist.git.repo import (
 )
 from agent_arborist.git.state import get_run_start_sha, scan_completed_tasks, TaskState
 from agent_arborist.tree.model import TaskNode, TaskTree, TestCommand, TestType
+from agent_arborist.worker.test_cache import (
+    OUTPUT_CHARS, TestCache, artifact_paths, cache_environment, worktree_tree,
+)
+from agent_arborist.worker.test_output import CommandOutput, CountParser, TestLog, gzip_log
 
 
 @dataclass
@@ -99,48 +106,124 @@ class TestResult:
     stderr: str
     runtime_secs: float
     counts: dict | None = None  # {"passed": N, "failed": N, "skipped": N} or None
+    cached: bool = False  # reused from an earlier run on the same tree
+    skipped: bool = False  # not run (or killed) after another command failed
 
 
 def _parse_test_counts(output: str, framework: str | None) -> dict | None:
     """Extract test counts from combined stdout+stderr based on framework."""
-    if not framework:
-        # Try all patterns
-        for fw in ("pytest", "jest", "go"):
-            result = _parse_test_counts(output, fw)
-            if result is not None:
-                return result
+    parser = CountParser(framework)
+    for line in output.splitlines(keepends=True):
+        parser.feed(line)
+    return parser.counts
+
+
+def _test_commands(
+    node: TaskNode, global_test_command: str, config_timeout: int | None,
+) -> list[tuple[str, str, str | None, int]]:
+    """(command, type, framework, timeout) for each test command of a node."""
+    if node.test_commands:
+        return [
+            (tc.command, tc.type.value, tc.framework, tc.timeout or config_timeout or 300)
+            for tc in node.test_commands
+        ]
+    return [(global_test_command, "unit", None, config_timeout or 300)]
+
+
+# Setup and teardown run for their side effects: each is a stage of its
+# own and never comes from the test cache.
+_SIDE_EFFECT_TYPES = (TestType.SETUP.value, TestType.TEARDOWN.value)
+
+
+def _test_stages(commands: list[tuple[str, str, str | None, int]]) -> list[list[int]]:
+    """Indices of *commands* grouped into stages that may run concurrently.
+
+    Each setup or teardown command is a stage of its own, so it runs after
+    everything listed before it and before everything listed after it.
+    Runs of other commands between barriers form one stage.
+    """
+    stages: list[list[int]] = []
+    group: list[int] = []
+    for i, (_, test_type, _, _) in enumerate(commands):
+        if test_type in _SIDE_EFFECT_TYPES:
+            if group:
+                stages.append(group)
+                group = []
+            stages.append([i])
+        else:
+            group.append(i)
+    if group:
+        stages.append(group)
+    return stages
+
+
+def _open_test_cache(
+    cwd: Path, container_workspace: Path | None, *artifact_dirs: Path | None,
+) -> TestCache | None:
+    """The repo's test cache; logs and reports in *artifact_dirs* don't count toward the tree."""
+    return TestCache.for_repo(
+        cwd, environment=cache_environment(container_workspace),
+        exclude=artifact_paths(cwd, *artifact_dirs),
+    )
+
+
+def _cached_test(cache: TestCache | None, key: str | None) -> TestResult | None:
+    data = cache.get(key) if cache is not None and key is not None else None
+    if data is None or not data.get("passed"):
+        return None
+    try:
+        return TestResult(**data, cached=True)
+    except TypeError:
         return None
 
-    if framework == "pytest":
-        # e.g. "5 passed, 2 failed, 1 skipped in 3.45s"
-        m = re.search(r"(\d+) passed", output)
-        f = re.search(r"(\d+) failed", output)
-        s = re.search(r"(\d+) skipped", output)
-        if m or f:
-            return {
-                "passed": int(m.group(1)) if m else 0,
-                "failed": int(f.group(1)) if f else 0,
-                "skipped": int(s.group(1)) if s else 0,
-            }
-
-    elif framework in ("jest", "vitest"):
-        # e.g. "Tests:  3 passed, 1 failed, 4 total"
-        m = re.search(r"Tests:\s+(\d+)\s+passed(?:,\s+(\d+)\s+failed)?(?:,\s+(\d+)\s+skipped)?", output)
-        if m:
-            return {
-                "passed": int(m.group(1)),
-                "failed": int(m.group(2)) if m.group(2) else 0,
-                "skipped": int(m.group(3)) if m.group(3) else 0,
-            }
-
-    elif framework == "go":
-        # e.g. "ok  	pkg	0.123s" or "FAIL	pkg	0.456s"
-        passed = len(re.findall(r"^ok\s+", output, re.MULTILINE))
-        failed = len(re.findall(r"^FAIL\s+", output, re.MULTILINE))
-        if passed or failed:
-            return {"passed": passed, "failed": failed, "skipped": 0}
 
-    return None
+def _cache_test(cache: TestCache | None, key: str | None, tr: TestResult) -> None:
+    """Store a passing result. Failures always rerun: they may come from the environment."""
+    if cache is None or key is None or not tr.passed:
+        return
+    cache.put(key, {
+        "passed": tr.passed, "test_type": tr.test_type,
+        "stdout": tr.stdout[-OUTPUT_CHARS:], "stderr": tr.stderr[-OUTPUT_CHARS:],
+        "runtime_secs": tr.runtime_secs, "counts": tr.counts,
+    })
+
+
+def _lookup_tests(
+    node: TaskNode, commands: list[tuple[str, str, str | None, int]],
+    cache: TestCache | None, tree: str | None,
+) -> tuple[list[str | None], list[TestResult | None]]:
+    """Cache keys and cached results (None where the command must run).
+
+    Setup and teardown commands run for their side effects and are never cached.
+    """
+    keys: list[str | None] = []
+    results: list[TestResult | None] = []
+    for cmd, test_type, _, _ in commands:
+        key = None
+        if cache is not None and tree is not None and test_type not in _SIDE_EFFECT_TYPES:
+            key = cache.key(tree, cmd, test_type)
+        hit = _cached_test(cache, key)
+        if hit is not None:
+            logger.info("Task %s %s tests cached for tree %s", node.id, test_type, tree[:12])
+        keys.append(key)
+        results.append(hit)
+    return keys, results
+
+
+def _container_kwargs(container_up_timeout: int | None, container_check_timeout: int | None) -> dict:
+    kwargs = {}
+    if container_up_timeout is not None:
+        kwargs["timeout_up"] = container_up_timeout
+    if container_check_timeout is not None:
+        kwargs["timeout_check"] = container_check_timeout
+    return kwargs
+
+
+def _skipped_test(command: tuple[str, str, str | None, int], elapsed: float = 0.0) -> TestResult:
+    return TestResult(
+        passed=False, test_type=command[1], stdout="", stderr="",
+        runtime_secs=round(elapsed, 3), skipped=True,
+    )
 
 
 def _run_tests(
@@ -148,52 +231,156 @@ def _run_tests(
     container_workspace: Path | None = None,
     container_up_timeout: int | None = None,
     container_check_timeout: int | None = None,
+    *,
+    cache: TestCache | None = None,
+    parallel: int = 1,
+    fail_fast: bool = False,
+    log_file: Path | None = None,
 ) -> list[TestResult]:
-    """Run test commands for a node. Falls back to global_test_command if no per-node tests."""
-    commands: list[tuple[str, str, str | None, int | None]] = []  # (command, type, framework, timeout)
-
-    if node.test_commands:
-        for tc in node.test_commands:
-            commands.append((tc.command, tc.type.value, tc.framework, tc.timeout))
-    else:
-        commands.append((global_test_command, "unit", None, None))
-
-    results: list[TestResult] = []
-    for cmd, test_type, framework, cmd_timeout in commands:
-        timeout = cmd_timeout or config_timeout or 300
-        start = time.monotonic()
-        try:
+    """``_arun_tests`` on a fresh event loop."""
+    return asyncio.run(_arun_tests(
+        node, cwd, global_test_command, config_timeout, container_workspace,
+        container_up_timeout, container_check_timeout,
+        cache=cache, parallel=parallel, fail_fast=fail_fast, log_file=log_file,
+    ))
+
+
+async def _arun_test_command(
+    command: tuple[str, str, str | None, int], cwd: Path, container_workspace: Path | None,
+    *, log: TestLog | None = None,
+) -> TestResult:
+    """Run one test command.
+
+    Output is streamed line by line into *log*, the count parser and a
+    bounded tail. Cancelling kills the command's process group. In a
+    container with a free shell agent the command runs there instead of
+    through a new exec.
+    """
+    from agent_arborist.runner import _astream_process
+
+    cmd, test_type, framework, timeout = command
+    out = CommandOutput(test_type, framework, log)
+    if log is not None:
+        log.note(f"{test_type}: {cmd}")
+    start = time.monotonic()
+    argv: list[str] | str = cmd
+    stdin = None
+    shell = None
+    if container_workspace:
+        from agent_arborist.devcontainer import container_exec_args, container_shell
+        argv = container_exec_args(cmd, container_workspace)
+        stdin = subprocess.DEVNULL
+        shell = container_shell(container_workspace)
+    exec_broke = False  # the exec itself failed, not the command
+    try:
+        ran = await shell.arun(cmd, timeout, on_output=out.feed) if shell is not None else None
+        if ran is not None:
+            returncode = ran.returncode
+            exec_broke = not shell.alive
+        else:
+            returncode, _, _ = await _astream_process(argv, timeout, cwd=cwd, stdin=stdin, on_output=out.feed)
             if container_workspace:
-                from agent_arborist.devcontainer import ensure_container_running, devcontainer_exec
-                kwargs = {}
-                if container_up_timeout is not None:
-                    kwargs["timeout_up"] = container_up_timeout
-                if container_check_timeout is not None:
-                    kwargs["timeout_check"] = container_check_timeout
-                ensure_container_running(container_workspace, **kwargs)
-                proc = devcontainer_exec(cmd, container_workspace, timeout=timeout)
-            else:
-                proc = subprocess.run(
-                    cmd, shell=True, cwd=cwd,
-                    capture_output=True, text=True, timeout=timeout,
-                )
-            elapsed = time.monotonic() - start
-            stdout = proc.stdout or ""
-            stderr = proc.stderr or ""
-            passed = proc.returncode == 0
-        except subprocess.TimeoutExpired:
-            elapsed = time.monotonic() - start
-            stdout = ""
-            stderr = f"Test timed out after {timeout}s"
-            passed = False
-
-        counts = _parse_test_counts(stdout + stderr, framework)
-        results.append(TestResult(
-            passed=passed, test_type=test_type,
-            stdout=stdout, stderr=stderr,
-            runtime_secs=round(elapsed, 3), counts=counts,
-        ))
+                from agent_arborist.devcontainer import EXEC_FAILURE_CODES
+                exec_broke = returncode in EXEC_FAILURE_CODES
+        stdout, stderr = out.text("stdout"), out.text("stderr")
+    except OSError as e:
+        returncode, stdout, stderr = -1, "", str(e)
+        exec_broke = True
+    except asyncio.CancelledError:
+        if log is not None:
+            log.note(f"{test_type} cancelled after {time.monotonic() - start:.1f}s")
+        raise
+    elapsed = time.monotonic() - start
+    if container_workspace and exec_broke:
+        from agent_arborist.devcontainer import container_exec_failed
+        container_exec_failed(container_workspace)
+    if returncode is None:
+        stdout, stderr = "", f"Test timed out after {timeout}s"
+    if log is not None:
+        log.note(f"{test_type} timed out after {timeout}s" if returncode is None
+                 else f"{test_type} exited {returncode} after {elapsed:.1f}s")
+    return TestResult(
+        passed=returncode == 0, test_type=test_type,
+        stdout=stdout, stderr=stderr,
+        runtime_secs=round(elapsed, 3), counts=out.parser.counts,
+    )
+
+
+async def _arun_tests(
+    node: TaskNode, cwd: Path, global_test_command: str, config_timeout: int | None,
+    container_workspace: Path | None = None,
+    container_up_timeout: int | None = None,
+    container_check_timeout: int | None = None,
+    *,
+    cache: TestCache | None = None,
+    parallel: int = 1,
+    fail_fast: bool = False,
+    log_file: Path | None = None,
+) -> list[TestResult]:
+    """Run test commands for a node. Falls back to global_test_command if no per-node tests.
+
+    With a *cache*, a command already run on this exact tree reuses its
+    result. Up to *parallel* commands of one stage (see ``_test_stages``)
+    run at once; results keep the command order. With *fail_fast*, the
+    first failure cancels commands still running and skips the rest,
+    except teardown commands, which always run. Output streams into
+    *log_file* as it is produced; only a bounded tail of each stream is
+    kept in the result.
+    """
+    commands = _test_commands(node, global_test_command, config_timeout)
+    tree = await asyncio.to_thread(worktree_tree, cwd, exclude=cache.exclude) if cache is not None else None
+    keys, results = _lookup_tests(node, commands, cache, tree)
+    stopped = False
+    if container_workspace and None in results:
+        from agent_arborist.devcontainer import ensure_container_running
+        await asyncio.to_thread(
+            ensure_container_running, container_workspace,
+            **_container_kwargs(container_up_timeout, container_check_timeout),
+        )
 
+    log = TestLog(log_file) if log_file is not None and None in results else None
+    slots = asyncio.Semaphore(parallel)
+
+    async def run(i: int, teardown: bool) -> TestResult:
+        nonlocal stopped
+        async with slots:
+            # Queued behind a command that just failed: don't start at all.
+            if stopped and not teardown:
+                return _skipped_test(commands[i])
+            tr = await _arun_test_command(commands[i], cwd, container_workspace, log=log)
+            stopped = stopped or (fail_fast and not tr.passed)
+            return tr
+
+    try:
+        for stage in _test_stages(commands):
+            todo = [i for i in stage if results[i] is None]
+            teardown = commands[stage[0]][1] == TestType.TEARDOWN.value
+            if stopped and not teardown:
+                for i in todo:
+                    results[i] = _skipped_test(commands[i])
+                continue
+            tasks = {asyncio.create_task(run(i, teardown)): i for i in todo}
+            started = time.monotonic()
+            try:
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        tr = task.result()
+                        results[tasks[task]] = tr
+                        _cache_test(cache, keys[tasks[task]], tr)
+                    if stopped and pending and not teardown:
+                        for task in pending:
+                            await _cancel(task)
+                            results[tasks[task]] = _skipped_test(commands[tasks[task]], time.monotonic() - started)
+                        pending = set()
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        await _cancel(task)
+    finally:
+        if log is not None:
+            log.close()
     return results
 
 
@@ -216,14 +403,30 @@ def _commit_with_trailers(
     return git_commit(message, cwd, allow_empty=True)
 
 
-def _write_log(log_dir: Path | None, task_id: str, step: str, result) -> Path | None:
-    """Write runner stdout/stderr to a log file. Returns the path written."""
+def _new_log_path(log_dir: Path | None, task_id: str, step: str) -> Path | None:
+    """Timestamped log file path for a step, or None without a log_dir."""
     if log_dir is None:
         return None
     from datetime import datetime, timezone
     log_dir.mkdir(parents=True, exist_ok=True)
     ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
-    log_file = log_dir / f"{task_id}_{step}_{ts}.log"
+    return log_dir / f"{task_id}_{step}_{ts}.log"
+
+
+def _write_log(
+    log_dir: Path | None, task_id: str, step: str, result,
+    *, log_file: Path | None = None,
+) -> Path | None:
+    """Write runner stdout/stderr to a log file. Returns the path written.
+
+    If the runner already streamed into *log_file*, it is kept as is.
+    """
+    if log_file is None:
+        log_file = _new_log_path(log_dir, task_id, step)
+        if log_file is None:
+            return None
+    elif log_file.exists():
+        return log_file
     parts = []
     if result.output:
         parts.append(f"=== stdout ===\n{result.output}")
@@ -286,6 +489,265 @@ def _collect_feedback_from_git(task_id: str, cwd: Path, *, spec_id: str) -> str:
     return "\n\nPrevious feedback from failed attempts:\n\n" + "\n\n".join(sections)
 
 
+def _resolve_task(
+    tree: TaskTree, cwd: Path, *, spec_id: str, task_id: str | None,
+) -> TaskNode | None:
+    if task_id is not None:
+        return tree.nodes[task_id]
+    return find_next_task(tree, cwd, spec_id=spec_id)
+
+
+def _runner_id(runner) -> str:
+    return f"{getattr(runner, 'name', '?')}/{getattr(runner, 'model', '?')}"
+
+
+def _implement_prompt(task: TaskNode, test_command: str, attempt: int, cwd: Path, *, spec_id: str) -> str:
+    test_cmd_info = ""
+    if task.test_commands:
+        cmds = [tc.command for tc in task.test_commands]
+        test_cmd_info = f"\n\nTest command(s) to validate: {cmds}"
+    elif test_command != "true":
+        test_cmd_info = f"\n\nTest command to validate: {test_command}"
+
+    prompt = (
+        f"Implement task {task.id}: {task.name}\n\n"
+        f"Description: {task.description}\n\n"
+        f"Work in the current directory. Make all necessary file changes.\n\n"
+        f"IMPORTANT: Before making changes, check whether this task has already been "
+        f"implemented (e.g. the files, variables, or state it requires already exist). "
+        f"If a previous step has deterministically verified the work is already done "
+        f"and shown its reasoning, you may confirm completion without making changes."
+        f"{test_cmd_info}"
+    )
+    if attempt > 0:
+        feedback = _collect_feedback_from_git(task.id, cwd, spec_id=spec_id)
+        if feedback:
+            prompt += feedback
+    logger.debug("Implement prompt: %.200s", prompt)
+    return prompt
+
+
+def _record_implement(
+    task: TaskNode, result, cwd: Path,
+    *, spec_id: str, attempt: int, max_retries: int, impl_id: str,
+) -> bool:
+    """Commit the implement step. Returns True if it passed."""
+    retry_trailer = str(attempt)
+    tname = _truncate_name(task.name)
+    if not result.success:
+        logger.info("Task %s implement failed (%s)", task.id, impl_id)
+        body = f"Runner error:\n{_truncate_output(result.error or result.output)}"
+        _commit_with_trailers(
+            task.id,
+            f'implement "{tname}" (failed, attempt {attempt + 1}/{max_retries})',
+            cwd, spec_id=spec_id, status="implement-fail", body=body,
+            **{TRAILER_STEP: "implement", TRAILER_RESULT: "fail", TRAILER_RETRY: retry_trailer},
+        )
+        return False
+
+    logger.info("Task %s implement passed (%s)", task.id, impl_id)
+    body = f"Runner output (truncated to 2000 chars):\n{_truncate_output(result.output)}"
+    _commit_with_trailers(
+        task.id, f'implement "{tname}"', cwd, spec_id=spec_id, status="implement-pass", body=body,
+        **{TRAILER_STEP: "implement", TRAILER_RESULT: "pass", TRAILER_RETRY: retry_trailer},
+    )
+    return True
+
+
+def _artifact_base(path: Path, cwd: Path, artifact_root: Path | None) -> Path:
+    """The checkout a log or report was written in: *artifact_root* if it holds *path*, else *cwd*."""
+    if artifact_root is not None and path.is_relative_to(artifact_root):
+        return artifact_root
+    return cwd
+
+
+def _artifact_path(path: Path, cwd: Path, artifact_root: Path | None) -> str:
+    """How commits reference a log or report: relative to the checkout it lies in."""
+    try:
+        return str(path.relative_to(_artifact_base(path, cwd, artifact_root)))
+    except ValueError:
+        return str(path)
+
+
+def _record_tests(
+    task: TaskNode, test_results: list[TestResult], cwd: Path,
+    *, spec_id: str, attempt: int, max_retries: int,
+    log_file: Path | None = None, compress_log: bool = False, artifact_root: Path | None = None,
+) -> bool:
+    """Commit the test step. Returns True if every test command passed.
+
+    *log_file* is the attempt's streamed test log; it is linked from the
+    commit whether the tests passed or not, gzipped first with *compress_log*.
+    """
+    retry_trailer = str(attempt)
+    tname = _truncate_name(task.name)
+    all_tests_passed = all(tr.passed for tr in test_results)
+    test_val = "pass" if all_tests_passed else "fail"
+    logger.info("Task %s test %s", task.id, test_val)
+
+    # Build combined test body and trailers for each result
+    test_body_parts = []
+    skipped = [tr.test_type for tr in test_results if tr.skipped]
+    for tr in test_results:
+        if tr.skipped:
+            continue
+        if not tr.passed and tr.stderr:
+            test_body_parts.append(f"Test ({tr.test_type}) stderr (last 1000 chars):\n{_truncate_output(tr.stderr, 1000)}")
+        if tr.stdout:
+            test_body_parts.append(f"Test ({tr.test_type}) stdout (last 1000 chars):\n{_truncate_output(tr.stdout, 1000)}")
+    if skipped:
+        test_body_parts.append(f"Not run after a failure (fail-fast): {', '.join(skipped)}")
+    test_body = "\n\n".join(test_body_parts) or None
+
+    test_subject = f'tests {test_val} for "{tname}"'
+    if not all_tests_passed:
+        test_subject += f" (attempt {attempt + 1}/{max_retries})"
+
+    test_log_path = None
+    if log_file is not None and log_file.exists():
+        if compress_log:
+            log_file = gzip_log(log_file)
+        test_log_path = _artifact_path(log_file, cwd, artifact_root)
+
+    test_status = "test-pass" if all_tests_passed else "test-fail"
+    test_trailers = {TRAILER_STEP: "test", TRAILER_TEST: test_val, TRAILER_RETRY: retry_trailer}
+    if test_log_path:
+        test_trailers[TRAILER_TEST_LOG] = test_log_path
+    # Enhanced trailers from first (or only) test result
+    if test_results:
+        tr0 = test_results[0]
+        test_trailers[TRAILER_TEST_TYPE] = tr0.test_type
+        test_trailers[TRAILER_TEST_RUNTIME] = str(tr0.runtime_secs)
+        if tr0.counts is not None:
+            test_trailers[TRAILER_TEST_PASSED] = str(tr0.counts["passed"])
+            test_trailers[TRAILER_TEST_FAILED] = str(tr0.counts["failed"])
+            test_trailers[TRAILER_TEST_SKIPPED] = str(tr0.counts["skipped"])
+    cached = [tr.test_type for tr in test_results if tr.cached]
+    if cached:
+        test_trailers[TRAILER_TEST_CACHED] = ",".join(cached)
+    if skipped:
+        test_trailers[TRAILER_TEST_SKIPPED_SUITES] = ",".join(skipped)
+    _commit_with_trailers(
+        task.id, test_subject, cwd, spec_id=spec_id, status=test_status,
+        body=test_body,
+        **test_trailers,
+    )
+    return all_tests_passed
+
+
+def _review_prompt(task: TaskNode, start_sha: str, cwd: Path, *, tests_passed: bool = True) -> str:
+    try:
+        diff_stat = git_diff_stat(start_sha, "HEAD", cwd)
+    except Exception:
+        diff_stat = "(no diff available)"
+
+    tests_note = (
+        "Tests have already passed." if tests_passed
+        else "Tests are running separately; judge the changes themselves."
+    )
+    return (
+        f"Review the changes for task {task.id}: {task.name}\n\n"
+        f"Task description: {task.description}\n\n"
+        f"Files changed since run start:\n{diff_stat}\n\n"
+        f"Focus on whether the right files are present and changed for this task. "
+        f"{tests_note}\n\n"
+        f"NOTE: If the implement step made no file changes but deterministically "
+        f"verified that the required state already exists (and showed its work), "
+        f"that is acceptable — approve if the task's goals are met.\n\n"
+        f"Reply APPROVED if the deliverables look correct, or REJECTED with reasons."
+    )
+
+
+def _review_approved(review_result) -> bool:
+    return review_result.success and "APPROVED" in review_result.output.upper()
+
+
+def _record_review(
+    task: TaskNode, review_result, review_log_file: Path | None, cwd: Path,
+    *, spec_id: str, attempt: int, max_retries: int, rev_id: str, artifact_root: Path | None = None,
+) -> bool:
+    """Commit the review step. Returns True if the review approved."""
+    retry_trailer = str(attempt)
+    tname = _truncate_name(task.name)
+    approved = _review_approved(review_result)
+
+    logger.info("Task %s review %s (%s)", task.id, "approved" if approved else "rejected", rev_id)
+    review_val = "approved" if approved else "rejected"
+    review_body = f"Review:\n{_truncate_output(review_result.output)}"
+    review_subject = f'review {review_val} for "{tname}"'
+    if not approved:
+        review_subject += f" (attempt {attempt + 1}/{max_retries})"
+
+    review_status = "review-approved" if approved else "review-rejected"
+    review_trailers = {TRAILER_STEP: "review", TRAILER_REVIEW: review_val, TRAILER_RETRY: retry_trailer}
+    if review_log_file is not None:
+        review_trailers[TRAILER_REVIEW_LOG] = _artifact_path(review_log_file, cwd, artifact_root)
+    _commit_with_trailers(
+        task.id, review_subject, cwd, spec_id=spec_id, status=review_status,
+        body=review_body,
+        **review_trailers,
+    )
+    return approved
+
+
+def _test_totals(test_results: list[TestResult] | None) -> dict:
+    counted = [tr.counts for tr in test_results or () if tr.counts is not None]
+    if not counted:
+        return {}
+    return {f"tests_{k}": sum(c[k] for c in counted) for k in ("passed", "failed", "skipped")}
+
+
+def _record_complete(
+    task: TaskNode, cwd: Path, *, spec_id: str, attempt: int, report_dir: Path | None,
+    started: float | None = None, runner=None, test_results: list[TestResult] | None = None,
+    artifact_root: Path | None = None,
+) -> GardenResult:
+    from datetime import datetime, timezone
+
+    from agent_arborist.reports import record_report
+
+    now = datetime.now(timezone.utc)
+    ts = now.strftime("%Y%m%dT%H%M%S")
+    effective_report_dir = report_dir if report_dir is not None else cwd / "spec" / "reports"
+    effective_report_dir.mkdir(parents=True, exist_ok=True)
+    report_filename = f"{task.id}_run_{ts}.json"
+    report = {"task_id": task.id, "result": "pass", "retries": attempt}
+    # Wall time from task pick-up to completion; feeds the scheduler's estimates.
+    if started is not None:
+        report["duration_secs"] = round(time.monotonic() - started, 3)
+    report["spec_id"] = spec_id
+    for key, attr in (("runner", "name"), ("model", "model")):
+        value = getattr(runner, attr, None)
+        if isinstance(value, str):
+            report[key] = value
+    report.update(_test_totals(test_results))
+    report["completed_at"] = now.isoformat(timespec="seconds")
+    abs_report = effective_report_dir / report_filename
+    abs_report.write_text(json.dumps(report, indent=2))
+    record_report(report, abs_report, _artifact_base(abs_report, cwd, artifact_root))
+    report_path = _artifact_path(abs_report, cwd, artifact_root)
+
+    complete_body = f"Completed after {attempt + 1} attempt(s). Report: {report_path}"
+    _commit_with_trailers(
+        task.id, f'complete "{_truncate_name(task.name)}"', cwd, spec_id=spec_id, status="complete",
+        body=complete_body,
+        **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass", TRAILER_REPORT: report_path},
+    )
+
+    logger.info("Task %s complete", task.id)
+    return GardenResult(task_id=task.id, success=True)
+
+
+def _record_failed(task: TaskNode, cwd: Path, *, spec_id: str, max_retries: int) -> GardenResult:
+    logger.info("Task %s failed after %d retries", task.id, max_retries)
+    _commit_with_trailers(
+        task.id, f'failed "{_truncate_name(task.name)}" after {max_retries} retries', cwd,
+        spec_id=spec_id, status="failed",
+        **{TRAILER_STEP: "complete", TRAILER_RESULT: "fail"},
+    )
+    return GardenResult(task_id=task.id, success=False, error=f"failed after {max_retries} retries")
+
+
 def garden(
     tree: TaskTree,
     cwd: Path,
@@ -304,223 +766,239 @@ def garden(
     container_check_timeout: int | None = None,
     spec_id: str,
     run_start_sha: str | None = None,
+    task_id: str | None = None,
+    pipelined: bool = False,
+    test_cache: bool = False,
+    test_parallel: int = 1,
+    test_fail_fast: bool = True,
+    test_compress_logs: bool = False,
+) -> GardenResult:
+    """Execute one task through the implement → test → review pipeline.
+
+    If *task_id* is given that task is run directly; otherwise the next
+    ready task is picked from git state. With *pipelined*, review runs
+    concurrently with the tests. With *test_cache*, test commands already
+    run on an identical tree reuse their result (see
+    ``worker/test_cache.py``). *test_parallel* caps how many of a task's
+    test commands run at once. With *test_fail_fast*, an attempt that can
+    still be retried stops its tests at the first failure; the last attempt
+    always runs every command. Test output streams into a log per attempt
+    under *log_dir*, gzipped afterwards with *test_compress_logs*.
+
+    This is ``agarden`` on a fresh event loop; call that instead from code
+    that already runs one.
+    """
+    return asyncio.run(agarden(
+        tree, cwd, runner,
+        implement_runner=implement_runner,
+        review_runner=review_runner,
+        test_command=test_command,
+        max_retries=max_retries,
+        report_dir=report_dir,
+        log_dir=log_dir,
+        runner_timeout=runner_timeout,
+        test_timeout=test_timeout,
+        container_workspace=container_workspace,
+        container_up_timeout=container_up_timeout,
+        container_check_timeout=container_check_timeout,
+        spec_id=spec_id,
+        run_start_sha=run_start_sha,
+        task_id=task_id,
+        pipelined=pipelined,
+        test_cache=test_cache,
+        test_parallel=test_parallel,
+        test_fail_fast=test_fail_fast,
+        test_compress_logs=test_compress_logs,
+    ))
+
+
+async def _cancel(task: asyncio.Task) -> None:
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def _overlap_test_review(tests, review) -> tuple[list[TestResult] | None, object | None]:
+    """Run the test and review coroutines concurrently and reconcile them.
+
+    Returns ``(test_results, review_result)``; one side is None when it was
+    cancelled because the other already decided the attempt. A test failure
+    cancels a still-running review (its approval would be discarded
+    anyway) and a rejection cancels the tests. Both run to the end only
+    when neither fails.
+    """
+    test_task = asyncio.create_task(tests)
+    review_task = asyncio.create_task(review)
+    try:
+        pending = {test_task, review_task}
+        while pending:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if test_task.done() and not all(tr.passed for tr in test_task.result()):
+                if not review_task.done():
+                    await _cancel(review_task)
+                    return test_task.result(), None
+                return test_task.result(), review_task.result()
+            if review_task.done() and not _review_approved(review_task.result()):
+                if not test_task.done():
+                    await _cancel(test_task)
+                    return None, review_task.result()
+        return test_task.result(), review_task.result()
+    finally:
+        for t in (test_task, review_task):
+            if not t.done():
+                await _cancel(t)
+
+
+async def _arun_runner(runner, prompt: str, **kwargs):
+    """Await ``runner.arun``, or run a plain ``run``-only runner in a thread.
+
+    ``log_file`` is dropped for runners whose ``run`` predates it.
+    """
+    arun = getattr(runner, "arun", None)
+    if inspect.iscoroutinefunction(arun):
+        return await arun(prompt, **kwargs)
+    from agent_arborist.runner import _output_kwargs
+
+    log_file = kwargs.pop("log_file", None)
+    kwargs.update(_output_kwargs(runner.run, log_file=log_file))
+    return await asyncio.to_thread(runner.run, prompt, **kwargs)
+
+
+async def agarden(
+    tree: TaskTree,
+    cwd: Path,
+    runner=None,
+    *,
+    implement_runner=None,
+    review_runner=None,
+    test_command: str = "true",
+    max_retries: int = 3,
+    report_dir: Path | None = None,
+    log_dir: Path | None = None,
+    runner_timeout: int | None = None,
+    test_timeout: int | None = None,
+    container_workspace: Path | None = None,
+    container_up_timeout: int | None = None,
+    container_check_timeout: int | None = None,
+    spec_id: str,
+    run_start_sha: str | None = None,
+    task_id: str | None = None,
+    pipelined: bool = False,
+    test_cache: bool = False,
+    test_parallel: int = 1,
+    test_fail_fast: bool = True,
+    test_compress_logs: bool = False,
+    artifact_root: Path | None = None,
 ) -> GardenResult:
-    """Execute one task through the implement → test → review pipeline."""
-    # Resolve runners: explicit implement/review runners take precedence,
-    # then fall back to the single `runner` param for backward compatibility.
+    """Asyncio ``garden()``: same steps and commits, on the event loop.
+
+    Runner sessions, test commands and devcontainer execs are subprocesses
+    awaited on the loop, so many tasks can share one thread. Cancelling
+    the coroutine (e.g. ``asyncio.wait_for``) kills whatever is running;
+    the commits already made are the recovery point, as with a crash.
+    Git work (task lookup, prompts built from history, step commits) runs
+    in ``asyncio.to_thread`` so a slow commit on a big tree doesn't stall
+    the other tasks sharing the loop.
+
+    With *pipelined*, review starts against the implement commit while the
+    tests run (see ``_overlap_test_review``). *artifact_root* is the checkout
+    logs and reports are written in, when that isn't *cwd* (the parallel
+    gardener's worktrees); commits reference them relative to it.
+    """
     if implement_runner is None:
         implement_runner = runner
     if review_runner is None:
         review_runner = runner
 
-    task = find_next_task(tree, cwd, spec_id=spec_id)
+    task = await asyncio.to_thread(_resolve_task, tree, cwd, spec_id=spec_id, task_id=task_id)
     if task is None:
         return GardenResult(task_id="", success=False, error="no ready task")
+    started = time.monotonic()
 
-    _impl_id = f"{getattr(implement_runner, 'name', '?')}/{getattr(implement_runner, 'model', '?')}"
-    _rev_id = f"{getattr(review_runner, 'name', '?')}/{getattr(review_runner, 'model', '?')}"
+    _impl_id = _runner_id(implement_runner)
+    _rev_id = _runner_id(review_runner)
     logger.info("Starting task %s: %s (implement=%s, review=%s)", task.id, task.name, _impl_id, _rev_id)
 
-    # Use run-start SHA for scoping review diffs
     if run_start_sha is None:
-        run_start_sha = get_run_start_sha(cwd, spec_id=spec_id)
+        run_start_sha = await asyncio.to_thread(get_run_start_sha, cwd, spec_id=spec_id)
     start_sha = run_start_sha
 
-    try:
-        for attempt in range(max_retries):
-            retry_trailer = str(attempt)
-            logger.info("Task %s attempt %d/%d", task.id, attempt + 1, max_retries)
-
-            # --- implement ---
-            test_cmd_info = ""
-            if task.test_commands:
-                cmds = [tc.command for tc in task.test_commands]
-                test_cmd_info = f"\n\nTest command(s) to validate: {cmds}"
-            elif test_command != "true":
-                test_cmd_info = f"\n\nTest command to validate: {test_command}"
-
-            prompt = (
-                f"Implement task {task.id}: {task.name}\n\n"
-                f"Description: {task.description}\n\n"
-                f"Work in the current directory. Make all necessary file changes.\n\n"
-                f"IMPORTANT: Before making changes, check whether this task has already been "
-                f"implemented (e.g. the files, variables, or state it requires already exist). "
-                f"If a previous step has deterministically verified the work is already done "
-                f"and shown its reasoning, you may confirm completion without making changes."
-                f"{test_cmd_info}"
-            )
-            if attempt > 0:
-                feedback = _collect_feedback_from_git(task.id, cwd, spec_id=spec_id)
-                if feedback:
-                    prompt += feedback
-            logger.debug("Implement prompt: %.200s", prompt)
-            run_kwargs = {
-                "cwd": cwd,
-                "container_workspace": container_workspace,
-                "container_up_timeout": container_up_timeout,
-                "container_check_timeout": container_check_timeout,
-            }
-            if runner_timeout is not None:
-                run_kwargs["timeout"] = runner_timeout
-            result = implement_runner.run(prompt, **run_kwargs)
-            _write_log(log_dir, task.id, "implement", result)
-            tname = _truncate_name(task.name)
-            if not result.success:
-                logger.info("Task %s implement failed (%s)", task.id, _impl_id)
-                body = f"Runner error:\n{_truncate_output(result.error or result.output)}"
-                _commit_with_trailers(
-                    task.id,
-                    f'implement "{tname}" (failed, attempt {attempt + 1}/{max_retries})',
-                    cwd, spec_id=spec_id, status="implement-fail", body=body,
-                    **{TRAILER_STEP: "implement", TRAILER_RESULT: "fail", TRAILER_RETRY: retry_trailer},
-                )
-                continue
-
-            logger.info("Task %s implement passed (%s)", task.id, _impl_id)
-            body = f"Runner output (truncated to 2000 chars):\n{_truncate_output(result.output)}"
-            _commit_with_trailers(
-                task.id, f'implement "{tname}"', cwd, spec_id=spec_id, status="implement-pass", body=body,
-                **{TRAILER_STEP: "implement", TRAILER_RESULT: "pass", TRAILER_RETRY: retry_trailer},
-            )
+    run_kwargs = {
+        "cwd": cwd,
+        "container_workspace": container_workspace,
+        "container_up_timeout": container_up_timeout,
+        "container_check_timeout": container_check_timeout,
+    }
+    if runner_timeout is not None:
+        run_kwargs["timeout"] = runner_timeout
+    step = dict(spec_id=spec_id, max_retries=max_retries)
+    cache = None
+    if test_cache:
+        cache = await asyncio.to_thread(_open_test_cache, cwd, container_workspace, log_dir, report_dir)
+
+    for attempt in range(max_retries):
+        logger.info("Task %s attempt %d/%d", task.id, attempt + 1, max_retries)
+
+        # --- implement ---
+        prompt = await asyncio.to_thread(_implement_prompt, task, test_command, attempt, cwd, spec_id=spec_id)
+        impl_log = _new_log_path(log_dir, task.id, "implement")
+        result = await _arun_runner(implement_runner, prompt, log_file=impl_log, **run_kwargs)
+        _write_log(log_dir, task.id, "implement", result, log_file=impl_log)
+        if not await asyncio.to_thread(
+            _record_implement, task, result, cwd, attempt=attempt, impl_id=_impl_id, **step,
+        ):
+            continue
 
+        test_log = _new_log_path(log_dir, task.id, "test")
+        tests = _arun_tests(
+            task, cwd, test_command, test_timeout, container_workspace,
+            container_up_timeout, container_check_timeout,
+            cache=cache, parallel=test_parallel,
+            fail_fast=test_fail_fast and attempt + 1 < max_retries,
+            log_file=test_log,
+        )
+        if pipelined:
+            # --- test + review, overlapped ---
+            review_log = _new_log_path(log_dir, task.id, "review")
+            review_prompt = await asyncio.to_thread(_review_prompt, task, start_sha, cwd, tests_passed=False)
+            review = _arun_runner(review_runner, review_prompt, log_file=review_log, **run_kwargs)
+            test_results, review_result = await _overlap_test_review(tests, review)
+            if test_results is not None:
+                tests_ok = await asyncio.to_thread(
+                    _record_tests, task, test_results, cwd, attempt=attempt,
+                    log_file=test_log, compress_log=test_compress_logs, artifact_root=artifact_root, **step,
+                )
+                if not tests_ok:
+                    if review_result is not None and _review_approved(review_result):
+                        logger.info("Task %s tests failed, discarding review approval", task.id)
+                    continue
+            else:
+                logger.info("Task %s review rejected, tests cancelled", task.id)
+        else:
             # --- test ---
-            test_results = _run_tests(
-                task, cwd, test_command, test_timeout, container_workspace,
-                container_up_timeout, container_check_timeout,
-            )
-            all_tests_passed = all(tr.passed for tr in test_results)
-            test_val = "pass" if all_tests_passed else "fail"
-            logger.info("Task %s test %s", task.id, test_val)
-
-            # Build combined test body and trailers for each result
-            test_body_parts = []
-            for tr in test_results:
-                if not tr.passed and tr.stderr:
-                    test_body_parts.append(f"Test ({tr.test_type}) stderr (last 1000 chars):\n{_truncate_output(tr.stderr, 1000)}")
-                if tr.stdout:
-                    test_body_parts.append(f"Test ({tr.test_type}) stdout (last 1000 chars):\n{_truncate_output(tr.stdout, 1000)}")
-            test_body = "\n\n".join(test_body_parts) or None
-
-            test_subject = f'tests {test_val} for "{tname}"'
-            if not all_tests_passed:
-                test_subject += f" (attempt {attempt + 1}/{max_retries})"
-
-            # Write test log file on failure
-            test_log_path = None
-            if not all_tests_passed and log_dir is not None:
-                from datetime import datetime, timezone as _tz
-                log_dir.mkdir(parents=True, exist_ok=True)
-                _ts = datetime.now(_tz.utc).strftime("%Y%m%dT%H%M%S")
-                test_log_file = log_dir / f"{task.id}_test_{_ts}.log"
-                log_parts = []
-                for tr in test_results:
-                    log_parts.append(f"=== {tr.test_type} stdout ===\n{tr.stdout}\n=== {tr.test_type} stderr ===\n{tr.stderr}")
-                test_log_file.write_text("\n".join(log_parts))
-                try:
-                    test_log_path = str(test_log_file.relative_to(cwd))
-                except ValueError:
-                    test_log_path = str(test_log_file)
-
-            test_status = "test-pass" if all_tests_passed else "test-fail"
-            test_trailers = {TRAILER_STEP: "test", TRAILER_TEST: test_val, TRAILER_RETRY: retry_trailer}
-            if test_log_path:
-                test_trailers[TRAILER_TEST_LOG] = test_log_path
-            # Enhanced trailers from first (or only) test result
-            if test_results:
-                tr0 = test_results[0]
-                test_trailers[TRAILER_TEST_TYPE] = tr0.test_type
-                test_trailers[TRAILER_TEST_RUNTIME] = str(tr0.runtime_secs)
-                if tr0.counts is not None:
-                    test_trailers[TRAILER_TEST_PASSED] = str(tr0.counts["passed"])
-                    test_trailers[TRAILER_TEST_FAILED] = str(tr0.counts["failed"])
-                    test_trailers[TRAILER_TEST_SKIPPED] = str(tr0.counts["skipped"])
-            _commit_with_trailers(
-                task.id, test_subject, cwd, spec_id=spec_id, status=test_status,
-                body=test_body,
-                **test_trailers,
-            )
-
-            if not all_tests_passed:
+            test_results = await tests
+            if not await asyncio.to_thread(
+                _record_tests, task, test_results, cwd, attempt=attempt,
+                log_file=test_log, compress_log=test_compress_logs, artifact_root=artifact_root, **step,
+            ):
                 continue
 
             # --- review ---
-            try:
-                diff_stat = git_diff_stat(start_sha, "HEAD", cwd)
-            except Exception:
-                diff_stat = "(no diff available)"
-
-            review_prompt = (
-                f"Review the changes for task {task.id}: {task.name}\n\n"
-                f"Task description: {task.description}\n\n"
-                f"Files changed since run start:\n{diff_stat}\n\n"
-                f"Focus on whether the right files are present and changed for this task. "
-                f"Tests have already passed.\n\n"
-                f"NOTE: If the implement step made no file changes but deterministically "
-                f"verified that the required state already exists (and showed its work), "
-                f"that is acceptable — approve if the task's goals are met.\n\n"
-                f"Reply APPROVED if the deliverables look correct, or REJECTED with reasons."
-            )
-            review_result = review_runner.run(review_prompt, **run_kwargs)
-            review_log_file = _write_log(log_dir, task.id, "review", review_result)
-            approved = review_result.success and "APPROVED" in review_result.output.upper()
-
-            logger.info("Task %s review %s (%s)", task.id, "approved" if approved else "rejected", _rev_id)
-            review_val = "approved" if approved else "rejected"
-            review_body = f"Review:\n{_truncate_output(review_result.output)}"
-            review_subject = f'review {review_val} for "{tname}"'
-            if not approved:
-                review_subject += f" (attempt {attempt + 1}/{max_retries})"
-
-            review_status = "review-approved" if approved else "review-rejected"
-            review_trailers = {TRAILER_STEP: "review", TRAILER_REVIEW: review_val, TRAILER_RETRY: retry_trailer}
-            if review_log_file is not None:
-                try:
-                    review_trailers[TRAILER_REVIEW_LOG] = str(review_log_file.relative_to(cwd))
-                except ValueError:
-                    review_trailers[TRAILER_REVIEW_LOG] = str(review_log_file)
-            _commit_with_trailers(
-                task.id, review_subject, cwd, spec_id=spec_id, status=review_status,
-                body=review_body,
-                **review_trailers,
-            )
-
-            if not approved:
-                continue
+            review_prompt = await asyncio.to_thread(_review_prompt, task, start_sha, cwd)
+            review_log = _new_log_path(log_dir, task.id, "review")
+            review_result = await _arun_runner(review_runner, review_prompt, log_file=review_log, **run_kwargs)
+
+        review_log_file = _write_log(log_dir, task.id, "review", review_result, log_file=review_log)
+        if not await asyncio.to_thread(
+            _record_review, task, review_result, review_log_file, cwd, attempt=attempt, rev_id=_rev_id,
+            artifact_root=artifact_root, **step,
+        ):
+            continue
 
-            # --- complete (success) ---
-            from datetime import datetime, timezone
-            ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
-            effective_report_dir = report_dir if report_dir is not None else cwd / "spec" / "reports"
-            effective_report_dir.mkdir(parents=True, exist_ok=True)
-            report_filename = f"{task.id}_run_{ts}.json"
-            (effective_report_dir / report_filename).write_text(
-                json.dumps({"task_id": task.id, "result": "pass", "retries": attempt}, indent=2)
-            )
-            abs_report = effective_report_dir / report_filename
-            try:
-                report_path = str(abs_report.relative_to(cwd))
-            except ValueError:
-                report_path = str(abs_report)
-
-            complete_body = f"Completed after {attempt + 1} attempt(s). Report: {report_path}"
-            _commit_with_trailers(
-                task.id, f'complete "{tname}"', cwd, spec_id=spec_id, status="complete",
-                body=complete_body,
-                **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass", TRAILER_REPORT: report_path},
-            )
-
-            logger.info("Task %s complete", task.id)
-            return GardenResult(task_id=task.id, success=True)
-
-        logger.info("Task %s failed after %d retries", task.id, max_retries)
-        # --- exhausted retries ---
-        _commit_with_trailers(
-            task.id, f'failed "{_truncate_name(task.name)}" after {max_retries} retries', cwd,
-            spec_id=spec_id, status="failed",
-            **{TRAILER_STEP: "complete", TRAILER_RESULT: "fail"},
+        # --- complete (success) ---
+        return await asyncio.to_thread(
+            _record_complete, task, cwd, spec_id=spec_id, attempt=attempt, report_dir=report_dir,
+            started=started, runner=implement_runner, test_results=test_results, artifact_root=artifact_root,
         )
 
-        return GardenResult(task_id=task.id, success=False, error=f"failed after {max_retries} retries")
-
-    except Exception:
-        raise
+    # --- exhausted retries ---
+    return await asyncio.to_thread(_record_failed, task, cwd, spec_id=spec_id, max_retries=max_retries)
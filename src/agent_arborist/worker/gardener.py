@@ -16,15 +16,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
 from dataclasses import dataclass, field
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+from agent_arborist.git.batch import close_batch
+from agent_arborist.git.repo import (
+    GitError,
+    git_add,
+    git_commit,
+    git_commit_graph_write,
+    git_merge,
+    git_merge_abort,
+    git_rev_parse,
+    git_toplevel,
+    git_worktree_add,
+    git_worktree_prune,
+    git_worktree_remove,
+    git_worktree_reset,
+)
 from agent_arborist.git.state import get_run_start_sha, scan_completed_tasks
 from agent_arborist.tree.model import TaskTree
-from agent_arborist.worker.garden import garden, find_next_task
+from agent_arborist.worker.garden import _container_kwargs, agarden, garden, find_next_task, GardenResult
 
 
 @dataclass
@@ -52,14 +69,72 @@ def gardener(
     container_up_timeout: int | None = None,
     container_check_timeout: int | None = None,
     spec_id: str,
+    parallel: int = 1,
+    pipelined: bool = False,
+    test_cache: bool = False,
+    test_parallel: int = 1,
+    test_fail_fast: bool = True,
+    test_compress_logs: bool = False,
 ) -> GardenerResult:
-    """Run tasks in order until all complete or stalled."""
+    """Run tasks in order until all complete or stalled.
+
+    With ``parallel > 1``, up to that many ready leaves run at once, each in
+    its own git worktree, and are merged back as they finish. *pipelined*
+    and the ``test_*`` options are passed through to garden(). With a
+    container workspace, provisioning starts in the background right away
+    instead of on the first task's first command.
+    """
     result = GardenerResult(success=False)
     all_leaves = {n.id for n in tree.leaves()}
 
+    if container_workspace is not None:
+        from agent_arborist.devcontainer import start_container_warmup
+
+        # Parallel runs use per-slot containers; only the image is shared.
+        start_container_warmup(
+            container_workspace, start=parallel <= 1,
+            **_container_kwargs(container_up_timeout, container_check_timeout),
+        )
+
     # Create run-start marker once for the entire gardener run
     run_start_sha = get_run_start_sha(cwd, spec_id=spec_id)
 
+    # Keep the commit-graph current so the bounded state scans stay cheap
+    # on long histories. Best effort: it is only a cache.
+    try:
+        git_commit_graph_write(cwd)
+    except GitError as e:
+        logger.debug("commit-graph write skipped: %s", e)
+
+    if parallel > 1:
+        return _gardener_parallel(
+            tree, cwd, result,
+            parallel=parallel,
+            spec_id=spec_id,
+            max_retries=max_retries,
+            garden_kwargs=dict(
+                runner=runner,
+                implement_runner=implement_runner,
+                review_runner=review_runner,
+                test_command=test_command,
+                max_retries=max_retries,
+                report_dir=report_dir,
+                log_dir=log_dir,
+                runner_timeout=runner_timeout,
+                test_timeout=test_timeout,
+                container_workspace=container_workspace,
+                container_up_timeout=container_up_timeout,
+                container_check_timeout=container_check_timeout,
+                spec_id=spec_id,
+                run_start_sha=run_start_sha,
+                pipelined=pipelined,
+                test_cache=test_cache,
+                test_parallel=test_parallel,
+                test_fail_fast=test_fail_fast,
+                test_compress_logs=test_compress_logs,
+            ),
+        )
+
     while True:
         completed = scan_completed_tasks(tree, cwd, spec_id=spec_id)
         logger.debug("Completed tasks: %s", completed)
@@ -92,6 +167,11 @@ def gardener(
             container_check_timeout=container_check_timeout,
             spec_id=spec_id,
             run_start_sha=run_start_sha,
+            pipelined=pipelined,
+            test_cache=test_cache,
+            test_parallel=test_parallel,
+            test_fail_fast=test_fail_fast,
+            test_compress_logs=test_compress_logs,
         )
 
         if gr.success:
@@ -101,3 +181,259 @@ def gardener(
             logger.info("Task %s failed, stopping gardener", gr.task_id)
             result.error = f"task {gr.task_id} failed: {gr.error}"
             return result
+
+
+def _task_artifacts(task_id: str, cwd: Path, dirs: list[Path | None]) -> list[Path]:
+    """Logs and reports of *task_id* in *dirs* that lie inside *cwd*.
+
+    Only ``{task_id}_<step>_<timestamp>.*`` names match, so ``T1`` doesn't
+    pick up ``T1_a``'s files.
+    """
+    own = re.compile(rf"{re.escape(task_id)}_[a-z]+_\d{{8}}T\d{{6}}\.")
+    found: list[Path] = []
+    root = cwd.resolve()
+    for d in dirs:
+        if d is None or not Path(d).is_dir():
+            continue
+        d = Path(d).resolve()
+        if d != root and root not in d.parents:
+            continue
+        found.extend(sorted(p for p in d.glob(f"{task_id}_*") if own.match(p.name) and p.is_file()))
+    return found
+
+
+def _rebase_path(path: Path | None, cwd: Path, worktree: Path) -> Path | None:
+    """Map a path inside *cwd* to the same relative path inside *worktree*."""
+    if path is None:
+        return None
+    try:
+        return worktree / Path(path).relative_to(cwd)
+    except ValueError:
+        return path
+
+
+def _slot_root(cwd: Path, spec_id: str) -> Path:
+    """Where the parallel worktree slots go: next to the main checkout.
+
+    Not under ``.git``, which slot containers mount (see ``devcontainer_up``),
+    and not inside the checkout, where ``git add -A`` would pick the slots
+    up as embedded repositories.
+    """
+    top = git_toplevel(cwd)
+    return top.parent / f"{top.name}.arborist-worktrees" / spec_id
+
+
+def _create_slots(root: Path, cwd: Path, count: int) -> list[Path]:
+    """*count* detached worktrees under *root*, reused task after task."""
+    slots = []
+    for i in range(count):
+        wt = root / f"slot-{i}"
+        if wt.exists():
+            git_worktree_remove(wt, cwd)
+        wt.parent.mkdir(parents=True, exist_ok=True)
+        git_worktree_add(wt, cwd)
+        slots.append(wt)
+    return slots
+
+
+def _merge_worktree(
+    task_id: str, worktree: Path, cwd: Path, *, spec_id: str, artifacts: list[Path] = (),
+) -> bool:
+    """Merge a finished worktree's HEAD into cwd. Returns False on conflict.
+
+    The merge subject deliberately does not match ``task({spec_id}@`` so the
+    task's own trailer commits (reachable via the second parent) stay the
+    newest match for state scanning. *artifacts* (the task's logs and
+    reports, written straight into cwd) are committed with the merge.
+    """
+    sha = git_rev_parse("HEAD", worktree)
+    message = f"merge {task_id} ({spec_id}) from parallel worktree"
+    try:
+        if not artifacts:
+            git_merge(sha, cwd, message=message)
+            return True
+        git_merge(sha, cwd, message=message, no_commit=True)
+        git_add(artifacts, cwd)
+        git_commit(message, cwd)
+        return True
+    except GitError as e:
+        logger.warning("Merge of task %s conflicted, will re-run: %s", task_id, e)
+        try:
+            git_merge_abort(cwd)
+        except GitError:
+            pass
+        return False
+
+
+def _gardener_parallel(
+    tree: TaskTree,
+    cwd: Path,
+    result: GardenerResult,
+    *,
+    parallel: int,
+    spec_id: str,
+    max_retries: int,
+    garden_kwargs: dict,
+) -> GardenerResult:
+    """Run up to *parallel* ready leaves concurrently in isolated worktrees.
+
+    Each task runs the normal pipeline (``agarden``) in one of *parallel*
+    worktree slots, reset to the current HEAD when the task starts, all on
+    one event loop. With a container workspace, every slot gets its own
+    container from a ``ContainerPool``, warmed up front and kept across the
+    tasks that slot runs; the pool is torn down on exit. Finished tasks
+    are merged back into cwd in execution order, so git trailers stay the
+    only source of task state and an interrupted run recovers exactly like
+    the sequential loop: unmerged work is simply re-run.
+    """
+    return asyncio.run(_agardener_parallel(
+        tree, cwd, result,
+        parallel=parallel, spec_id=spec_id, max_retries=max_retries,
+        garden_kwargs=garden_kwargs,
+    ))
+
+
+async def _agardener_parallel(
+    tree: TaskTree,
+    cwd: Path,
+    result: GardenerResult,
+    *,
+    parallel: int,
+    spec_id: str,
+    max_retries: int,
+    garden_kwargs: dict,
+) -> GardenerResult:
+    all_leaves = {n.id for n in tree.leaves()}
+    order_index = {tid: i for i, tid in enumerate(tree.execution_order)}
+    # git runs in worker threads throughout so in-flight tasks keep streaming.
+    worktree_root = await asyncio.to_thread(_slot_root, cwd, spec_id)
+    await asyncio.to_thread(git_worktree_prune, cwd)
+    remaining = all_leaves - await asyncio.to_thread(scan_completed_tasks, tree, cwd, spec_id=spec_id)
+    slots = await asyncio.to_thread(_create_slots, worktree_root, cwd, max(1, min(parallel, len(remaining))))
+    free_slots = list(slots)
+
+    pool = None
+    container_workspace = garden_kwargs.get("container_workspace")
+    if container_workspace is not None:
+        from agent_arborist.devcontainer import ContainerPool
+
+        timeouts = _container_kwargs(
+            garden_kwargs.get("container_up_timeout"), garden_kwargs.get("container_check_timeout"),
+        )
+        pool = ContainerPool([_rebase_path(container_workspace, cwd, wt) for wt in slots], **timeouts)
+        slot_of = dict(zip(pool.workspace_folders, slots))
+        folder_of = dict(zip(slots, pool.workspace_folders))
+
+    in_flight: dict[asyncio.Task, tuple[str, Path]] = {}
+    conflicts: dict[str, int] = {}
+    error: str | None = None
+    crash: BaseException | None = None
+
+    def _lease() -> Path:
+        if pool is not None:
+            return slot_of[pool.acquire()]
+        return free_slots.pop(0)
+
+    def _release(wt: Path) -> None:
+        close_batch(wt)
+        if pool is not None:
+            pool.release(folder_of[wt])
+        else:
+            free_slots.append(wt)
+
+    def _reset(wt: Path) -> None:
+        git_worktree_reset(wt, git_rev_parse("HEAD", cwd))
+
+    def _merge(task_id: str, wt: Path) -> bool:
+        artifacts = _task_artifacts(task_id, cwd, [garden_kwargs.get("log_dir"), garden_kwargs.get("report_dir")])
+        return _merge_worktree(task_id, wt, cwd, spec_id=spec_id, artifacts=artifacts)
+
+    async def _start(task_id: str) -> None:
+        wt = _lease()
+        try:
+            await asyncio.to_thread(_reset, wt)
+        except BaseException:
+            _release(wt)
+            raise
+        kwargs = dict(garden_kwargs)
+        # Logs and reports stay in cwd so they are visible while the task runs;
+        # commits reference them relative to cwd, as in a sequential run.
+        kwargs["artifact_root"] = cwd
+        kwargs["container_workspace"] = _rebase_path(kwargs["container_workspace"], cwd, wt)
+        logger.info("[%d/%d] Running task %s in %s",
+                    result.tasks_completed + len(in_flight) + 1, len(all_leaves), task_id, wt)
+        task = asyncio.create_task(agarden(tree, wt, task_id=task_id, **kwargs))
+        in_flight[task] = (task_id, wt)
+
+    try:
+        if pool is not None:
+            await pool.start()
+        while True:
+            completed = await asyncio.to_thread(scan_completed_tasks, tree, cwd, spec_id=spec_id)
+
+            if error is None and crash is None:
+                if all_leaves <= completed and not in_flight:
+                    result.success = True
+                    return result
+                running = {tid for tid, _ in in_flight.values()}
+                ready = [n.id for n in tree.ready_leaves(completed) if n.id not in running]
+                ready.sort(key=lambda tid: order_index.get(tid, len(order_index)))
+                for task_id in ready[: len(slots) - len(in_flight)]:
+                    await _start(task_id)
+
+            if not in_flight:
+                if crash is not None:
+                    raise crash
+                if error is None:
+                    logger.info("Stalled: no ready tasks")
+                    error = "stalled: no ready tasks"
+                result.error = error
+                return result
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            finished = sorted(
+                (in_flight.pop(task) + (task,) for task in done),
+                key=lambda item: order_index.get(item[0], len(order_index)),
+            )
+            for task_id, wt, task in finished:
+                try:
+                    gr: GardenResult = task.result()
+                    # Failures are merged too so the failed trailer is recorded.
+                    merged = await asyncio.to_thread(_merge, task_id, wt)
+                except BaseException as e:
+                    logger.info("Task %s crashed, draining in-flight tasks", task_id)
+                    crash = crash or e
+                    continue
+                finally:
+                    _release(wt)
+
+                if not merged:
+                    conflicts[task_id] = conflicts.get(task_id, 0) + 1
+                    if conflicts[task_id] >= max_retries and error is None:
+                        error = f"task {task_id} failed: merge conflicts after {max_retries} re-runs"
+                    continue
+                if gr.success:
+                    result.tasks_completed += 1
+                    result.order.append(task_id)
+                elif error is None:
+                    logger.info("Task %s failed, draining in-flight tasks", task_id)
+                    error = f"task {task_id} failed: {gr.error}"
+    finally:
+        # Interrupted (e.g. Ctrl-C): cancelling kills the tasks' subprocesses.
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        if pool is not None:
+            await asyncio.to_thread(pool.close)
+        for wt in slots:
+            close_batch(wt)
+            try:
+                await asyncio.to_thread(git_worktree_remove, wt, cwd)
+            except GitError as e:
+                logger.warning("Could not remove worktree %s: %s", wt, e)
+        for d in (worktree_root, worktree_root.parent):
+            try:
+                d.rmdir()
+            except OSError:
+                break  # not empty: another spec's slots, or a worktree that wouldn't go
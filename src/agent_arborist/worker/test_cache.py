@@ -0,0 +1,139 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content-addressed cache of test command results.
+
+A result is keyed by the tree SHA of HEAD, the command, its test type and
+the environment it ran in (host, or a hash of the ``.devcontainer/``
+config). The tree is only trusted when the worktree is clean, so the key
+describes exactly the files the command saw. Arborist's own log and
+report directories are left out of both, since every attempt commits new
+files there without changing what the tests see. Entries live under the git
+common dir (``.git/arborist/test-cache/``), shared by worktrees and never
+committed; any read error is a miss.
+
+Ignored files (``.env``, ``node_modules``, build output), the host
+toolchain and environment variables are not part of the key, which is
+why the cache is opt-in.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from agent_arborist.git.repo import GitError, git_common_dir, git_is_clean, git_rev_parse, git_tree_without
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# Output kept per stream; commit bodies only show the last 1000 chars.
+OUTPUT_CHARS = 4000
+
+
+def artifact_paths(cwd: Path, *dirs: Path | None) -> list[str]:
+    """*dirs* that lie inside *cwd*, relative to it, for ``worktree_tree(exclude=...)``."""
+    root = Path(cwd).resolve()
+    paths = []
+    for d in dirs:
+        if d is None:
+            continue
+        try:
+            rel = Path(d).resolve().relative_to(root)
+        except ValueError:
+            continue
+        if rel.parts:
+            paths.append(rel.as_posix())
+    return paths
+
+
+def worktree_tree(cwd: Path, *, exclude: list[str] | None = None) -> str | None:
+    """Tree SHA of HEAD if the worktree matches it exactly, else None.
+
+    Paths in *exclude* are ignored by the cleanliness check and removed
+    from the tree the SHA is taken of.
+    """
+    try:
+        if not git_is_clean(cwd, exclude=exclude or ()):
+            return None
+        if exclude:
+            return git_tree_without("HEAD", exclude, cwd)
+        return git_rev_parse("HEAD^{tree}", cwd)
+    except GitError:
+        return None
+
+
+def cache_environment(container_workspace: Path | None) -> str:
+    if container_workspace is None:
+        return "host"
+    from agent_arborist.devcontainer import devcontainer_config_hash
+
+    return f"devcontainer:{devcontainer_config_hash(container_workspace)}"
+
+
+def cache_key(tree: str, command: str, test_type: str, environment: str) -> str:
+    payload = json.dumps([CACHE_VERSION, tree, command, test_type, environment])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class TestCache:
+    """Results by key, one JSON file each (``<key[:2]>/<key>.json``)."""
+
+    __test__ = False  # not a pytest class
+
+    def __init__(self, root: Path, *, environment: str = "host", exclude: list[str] | None = None):
+        self.root = root
+        self.environment = environment
+        self.exclude = exclude or []  # worktree paths left out of the tree key
+
+    @classmethod
+    def for_repo(
+        cls, cwd: Path, *, environment: str = "host", exclude: list[str] | None = None,
+    ) -> TestCache | None:
+        try:
+            return cls(git_common_dir(cwd) / "arborist" / "test-cache", environment=environment, exclude=exclude)
+        except GitError:
+            return None
+
+    def key(self, tree: str, command: str, test_type: str) -> str:
+        return cache_key(tree, command, test_type, self.environment)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        try:
+            data = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return None
+        return data.get("result")
+
+    def put(self, key: str, result: dict) -> None:
+        """Write atomically; concurrent writers of one key store the same result."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": CACHE_VERSION, "result": result}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug("Could not write test cache entry %s: %s", path, e)
@@ -0,0 +1,161 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming test command output: per-attempt log files and incremental counts.
+
+Each line a test command prints goes to the attempt's log file as it
+arrives, through an incremental ``CountParser`` and into a bounded tail;
+nothing holds a command's full output in memory.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+
+from agent_arborist.runner import _Tail
+
+logger = logging.getLogger(__name__)
+
+# Per stream and command, enough for commit bodies and the test cache.
+TAIL_CHARS = 64 * 1024
+
+_PYTEST = {k: re.compile(rf"(\d+) {k}") for k in ("passed", "failed", "skipped")}
+_JEST = re.compile(r"Tests:\s+(\d+)\s+passed(?:,\s+(\d+)\s+failed)?(?:,\s+(\d+)\s+skipped)?")
+_GO_OK = re.compile(r"ok\s+")
+_GO_FAIL = re.compile(r"FAIL\s+")
+
+# Tried in this order when the framework is unknown.
+_AUTO = ("pytest", "jest", "go")
+
+
+class CountParser:
+    """Test counts from output fed one line at a time.
+
+    Matches what a regex search over the whole output would find: the
+    first pytest/jest summary values, or every go ``ok``/``FAIL`` line.
+    """
+
+    def __init__(self, framework: str | None):
+        self.framework = "jest" if framework == "vitest" else framework
+        self._pytest: dict[str, int] = {}
+        self._jest: dict[str, int] | None = None
+        self._go = {"passed": 0, "failed": 0}
+
+    def feed(self, line: str) -> None:
+        frameworks = _AUTO if self.framework is None else (self.framework,)
+        if "pytest" in frameworks and len(self._pytest) < 3:
+            for key, pattern in _PYTEST.items():
+                if key not in self._pytest and (m := pattern.search(line)):
+                    self._pytest[key] = int(m.group(1))
+        if "jest" in frameworks and self._jest is None and (m := _JEST.search(line)):
+            self._jest = {
+                "passed": int(m.group(1)),
+                "failed": int(m.group(2)) if m.group(2) else 0,
+                "skipped": int(m.group(3)) if m.group(3) else 0,
+            }
+        if "go" in frameworks:
+            if _GO_OK.match(line):
+                self._go["passed"] += 1
+            elif _GO_FAIL.match(line):
+                self._go["failed"] += 1
+
+    def _result(self, framework: str) -> dict | None:
+        if framework == "pytest":
+            if "passed" in self._pytest or "failed" in self._pytest:
+                return {k: self._pytest.get(k, 0) for k in ("passed", "failed", "skipped")}
+        elif framework == "jest":
+            return self._jest
+        elif framework == "go":
+            if self._go["passed"] or self._go["failed"]:
+                return {**self._go, "skipped": 0}
+        return None
+
+    @property
+    def counts(self) -> dict | None:
+        for framework in _AUTO if self.framework is None else (self.framework,):
+            result = self._result(framework)
+            if result is not None:
+                return result
+        return None
+
+
+class TestLog:
+    """One attempt's test log; lines of concurrent commands are tagged by type."""
+
+    __test__ = False  # not a pytest class
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(text)
+
+    def line(self, test_type: str, stream: str, line: str) -> None:
+        tag = test_type if stream == "stdout" else f"{test_type}:stderr"
+        self.write(f"[{tag}] {line}" if line.endswith("\n") else f"[{tag}] {line}\n")
+
+    def note(self, text: str) -> None:
+        self.write(f"=== {text} ===\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def gzip_log(path: Path) -> Path:
+    """Gzip *path* next to itself (``.log.gz``) and remove the original."""
+    target = path.with_name(path.name + ".gz")
+    try:
+        with open(path, "rb") as src, gzip.open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(path)
+    except OSError as e:
+        logger.warning("Could not compress test log %s: %s", path, e)
+        return path
+    return target
+
+
+class CommandOutput:
+    """Sink for one command's lines: log, counts and bounded tails."""
+
+    def __init__(self, test_type: str, framework: str | None, log: TestLog | None):
+        self.test_type = test_type
+        self.parser = CountParser(framework)
+        self.log = log
+        self.tails = {"stdout": _Tail(TAIL_CHARS), "stderr": _Tail(TAIL_CHARS)}
+        self._lock = threading.Lock()
+
+    def feed(self, stream: str, line: str) -> None:
+        if not line.endswith("\n"):
+            line += "\n"
+        with self._lock:
+            self.tails[stream].append(line)
+            self.parser.feed(line)
+        if self.log is not None:
+            self.log.line(self.test_type, stream, line)
+
+    def text(self, stream: str) -> str:
+        with self._lock:
+            return self.tails[stream].text()
@@ -30,6 +30,17 @@ def _guard_project_repo(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
 
 
+@pytest.fixture(autouse=True)
+def _fresh_container_sessions():
+    """Each test starts without containers registered by earlier tests."""
+    from agent_arborist.devcontainer import clear_container_sessions, set_container_shell
+
+    clear_container_sessions()
+    yield
+    clear_container_sessions()
+    set_container_shell(False)
+
+
 @pytest.fixture
 def git_repo(tmp_path):
     """Create a fresh git repo in an isolated temp directory."""
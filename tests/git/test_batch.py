@@ -0,0 +1,123 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for git/batch.py and the pooled lookups in git/repo.py."""
+
+import subprocess
+
+import pytest
+
+from agent_arborist.git.batch import close_batch, get_batch
+from agent_arborist.git.repo import (
+    GitError,
+    git_branch_exists,
+    git_checkout,
+    git_commit,
+    git_current_branch,
+    git_init,
+    git_rev_parse,
+)
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_resolve_sees_new_commits(git_repo):
+    batch = get_batch(git_repo)
+    before = batch.resolve("HEAD")
+    sha = git_commit("next", git_repo, allow_empty=True)
+    assert batch.resolve("HEAD") == sha != before
+    assert sha == _git(git_repo, "rev-parse", "HEAD")
+
+
+def test_resolve_missing_returns_none(git_repo):
+    assert get_batch(git_repo).resolve("refs/heads/nope") is None
+
+
+def test_read_commit_parses_message_and_parents(git_repo):
+    parent = git_rev_parse("HEAD", git_repo)
+    sha = git_commit("task(main@T001@complete): done\n\nArborist-Step: complete", git_repo, allow_empty=True)
+
+    info = get_batch(git_repo).read_commit(sha)
+    assert info.parents == [parent]
+    assert info.subject == "task(main@T001@complete): done"
+    assert info.trailers == {"Arborist-Step": "complete"}
+    assert info.committer_time > 0
+
+
+def test_batch_restarts_after_close(git_repo):
+    sha = git_rev_parse("HEAD", git_repo)
+    close_batch(git_repo)
+    assert get_batch(git_repo).resolve("HEAD") == sha
+
+
+def test_resolve_and_read_commit_use_separate_processes(git_repo):
+    batch = get_batch(git_repo)
+    batch.close()
+    sha = batch.resolve("HEAD")
+    assert list(batch._procs) == ["--batch-check"]
+    assert batch.read_commit(sha).sha == sha
+    assert sorted(batch._procs) == ["--batch", "--batch-check"]
+    # Interleaving doesn't desync either pipe.
+    assert batch.resolve("HEAD") == sha
+    assert batch.read_commit("HEAD").sha == sha
+
+
+def test_batch_close_releases_pipes(git_repo):
+    batch = get_batch(git_repo)
+    sha = batch.resolve("HEAD")
+    batch.read_commit(sha)
+    procs = list(batch._procs.values())
+    batch.close()
+    for proc in procs:
+        assert proc.returncode is not None
+        assert proc.stdin.closed and proc.stdout.closed
+
+    # A process that died on its own is reaped before a new one starts
+    proc = batch._ensure("--batch-check")
+    proc.kill()
+    proc.wait()
+    assert batch.resolve("HEAD") == sha
+    assert proc.stdout.closed
+    batch.close()
+
+
+def test_rev_parse_missing_falls_back_to_git_error(git_repo):
+    with pytest.raises(GitError):
+        git_rev_parse("refs/heads/nope", git_repo)
+
+
+def test_branch_exists_via_batch(git_repo):
+    git_checkout("feature/x", git_repo, create=True)
+    assert git_branch_exists("feature/x", git_repo)
+    assert not git_branch_exists("feature/y", git_repo)
+
+
+def test_current_branch_detached(git_repo):
+    _git(git_repo, "checkout", "--detach")
+    assert git_current_branch(git_repo) == "HEAD"
+
+
+def test_current_branch_matches_rev_parse_when_tag_collides(git_repo):
+    _git(git_repo, "tag", "main")
+    assert git_current_branch(git_repo) == _git(git_repo, "rev-parse", "--abbrev-ref", "HEAD")
+
+
+def test_current_branch_unborn_repo_raises(tmp_path):
+    repo = tmp_path / "empty"
+    repo.mkdir()
+    git_init(repo)
+    with pytest.raises(GitError):
+        git_current_branch(repo)
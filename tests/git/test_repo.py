@@ -14,6 +14,8 @@
 
 """Tests for git/repo.py."""
 
+import subprocess
+
 import pytest
 
 from agent_arborist.git.repo import (
@@ -28,6 +30,9 @@ from agent_arborist.git.repo import (
     git_merge,
     git_diff,
     git_branch_list,
+    git_rev_parse,
+    git_worktree_add,
+    git_worktree_reset,
     spec_id_from_branch,
 )
 
@@ -130,3 +135,20 @@ def test_spec_id_from_branch():
     assert spec_id_from_branch("one-two") == "one-two"
     assert spec_id_from_branch("one-two-three") == "one-two"
     assert spec_id_from_branch("one-two--v1") == "one-two"
+
+
+def test_git_worktree_reset_discards_local_state(git_repo, tmp_path):
+    wt = tmp_path / "wt"
+    git_worktree_add(wt, git_repo)
+    (wt / "scratch.txt").write_text("left over")
+    (wt / "build").mkdir()
+    (wt / "build" / "out.o").write_text("x")
+    (git_repo / "new.txt").write_text("new")
+    git_add_all(git_repo)
+    git_commit("add new", git_repo)
+
+    git_worktree_reset(wt, git_rev_parse("HEAD", git_repo))
+    assert git_rev_parse("HEAD", wt) == git_rev_parse("HEAD", git_repo)
+    assert (wt / "new.txt").read_text() == "new"
+    assert not (wt / "scratch.txt").exists()
+    assert not (wt / "build").exists()
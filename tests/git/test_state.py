@@ -15,15 +15,21 @@
 """Tests for git/state.py."""
 
 import subprocess
+import time
 from pathlib import Path
 
+import pytest
+
 from agent_arborist.git.repo import git_add_all, git_commit, git_checkout, GitError
 from agent_arborist.git.state import (
     TaskState,
     get_task_trailers,
     task_state_from_trailers,
     is_task_complete,
+    get_task_commit_history,
     scan_completed_tasks,
+    scan_task_commits,
+    scan_task_history,
     scan_task_states,
 )
 from agent_arborist.constants import TRAILER_STEP, TRAILER_RESULT
@@ -421,3 +427,248 @@ def test_scan_task_states_base_branch_not_found_errors(git_repo):
         assert False, "Expected GitError"
     except GitError as e:
         assert "nonexistent" in str(e).lower() or "merge-base" in str(e).lower()
+
+
+# ============================================================================
+# State index (incremental scans)
+# ============================================================================
+
+
+def _two_task_tree():
+    tree = TaskTree()
+    tree.nodes["T001"] = TaskNode(id="T001", name="Task 1")
+    tree.nodes["T002"] = TaskNode(id="T002", name="Task 2")
+    return tree
+
+
+def test_state_index_written_outside_worktree(git_repo):
+    from agent_arborist.git.state_index import index_path
+
+    scan_task_states(_two_task_tree(), git_repo, spec_id="main")
+    path = index_path(git_repo, spec_id="main", base_branch="main")
+    assert path.exists()
+    assert git_repo / ".git" in path.parents
+
+
+def test_state_index_unchanged_head_skips_git_log(git_repo, monkeypatch):
+    tree = _two_task_tree()
+    _commit_task(git_repo, "T001", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    scan_task_states(tree, git_repo, spec_id="main")
+
+    def _boom(*args, **kwargs):
+        raise AssertionError("git log should not run")
+
+    monkeypatch.setattr("agent_arborist.git.state.git_log", _boom)
+    states, _ = scan_task_states(tree, git_repo, spec_id="main")
+    assert states["T001"] == TaskState.COMPLETE
+
+
+def test_state_index_picks_up_new_commits_incrementally(git_repo, monkeypatch):
+    tree = _two_task_tree()
+    _commit_task(git_repo, "T001", status="implement", **{TRAILER_STEP: "implement"})
+    states, _ = scan_task_states(tree, git_repo, spec_id="main")
+    assert states["T001"] == TaskState.IMPLEMENTING
+
+    _commit_task(git_repo, "T001", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    _commit_task(git_repo, "T002", status="test", **{TRAILER_STEP: "test"})
+
+    # Linear history is walked without a git log call.
+    def _boom(*args, **kwargs):
+        raise AssertionError("git log should not run")
+
+    monkeypatch.setattr("agent_arborist.git.state.git_log", _boom)
+    states, _ = scan_task_states(tree, git_repo, spec_id="main")
+    assert states["T001"] == TaskState.COMPLETE
+    assert states["T002"] == TaskState.TESTING
+
+
+def test_state_index_handles_merge_commits(git_repo):
+    tree = _two_task_tree()
+    scan_task_states(tree, git_repo, spec_id="main")
+
+    subprocess.run(["git", "checkout", "-q", "-b", "side"], cwd=git_repo, check=True)
+    _commit_task(git_repo, "T002", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=git_repo, check=True)
+    _commit_task(git_repo, "T001", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    subprocess.run(["git", "merge", "-q", "--no-ff", "-m", "merge side", "side"], cwd=git_repo, check=True)
+
+    states, _ = scan_task_states(tree, git_repo, spec_id="main")
+    assert states == {"T001": TaskState.COMPLETE, "T002": TaskState.COMPLETE}
+
+
+def test_state_index_rescans_after_history_rewrite(git_repo):
+    tree = _two_task_tree()
+    _commit_task(git_repo, "T001", status="implement", **{TRAILER_STEP: "implement"})
+    _commit_task(git_repo, "T001", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    states, _ = scan_task_states(tree, git_repo, spec_id="main")
+    assert states["T001"] == TaskState.COMPLETE
+
+    subprocess.run(["git", "reset", "-q", "--hard", "HEAD~1"], cwd=git_repo, check=True)
+    states, _ = scan_task_states(tree, git_repo, spec_id="main")
+    assert states["T001"] == TaskState.IMPLEMENTING
+
+
+def test_state_index_rescans_when_base_branch_moves(git_repo):
+    tree = _two_task_tree()
+    subprocess.run(["git", "checkout", "-q", "-b", "feature"], cwd=git_repo, check=True)
+    _commit_task(git_repo, "T001", branch="feature", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    states, _ = scan_task_states(tree, git_repo, spec_id="feature")
+    assert states["T001"] == TaskState.COMPLETE
+
+    # The feature work lands on main, so it is no longer "since branching".
+    subprocess.run(["git", "branch", "-f", "main", "feature"], cwd=git_repo, check=True)
+    states, _ = scan_task_states(tree, git_repo, spec_id="feature")
+    assert states == {}
+
+
+# ============================================================================
+# Base-branch scans bounded by the run-start marker
+# ============================================================================
+
+
+def _fast_import_commits(repo, messages):
+    """Append one empty commit per message on main using git fast-import."""
+    parent = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=repo, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    now = int(time.time())
+    lines = []
+    for i, msg in enumerate(messages):
+        data = msg.encode()
+        lines.append(b"commit refs/heads/main")
+        lines.append(b"committer Test <test@test.com> %d +0000" % (now + i))
+        lines.append(b"data %d" % len(data))
+        lines.append(data)
+        if i == 0:
+            lines.append(b"from " + parent.encode())
+        lines.append(b"")
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=repo, input=b"\n".join(lines) + b"\n", check=True)
+    subprocess.run(["git", "reset", "-q", "--hard", "main"], cwd=repo, check=True)
+
+
+def test_scan_on_base_branch_has_no_commit_cap(git_repo):
+    """Completions older than 500 matching commits are still found."""
+    from agent_arborist.git.state import get_run_start_sha
+
+    tree = _two_task_tree()
+    get_run_start_sha(git_repo, spec_id="main")
+    retries = [
+        f"task(main@T002@implement-fail): attempt {i}\n\n{TRAILER_STEP}: implement\n{TRAILER_RESULT}: fail"
+        for i in range(600)
+    ]
+    _fast_import_commits(
+        git_repo,
+        [f"task(main@T001@complete): done\n\n{TRAILER_STEP}: complete\n{TRAILER_RESULT}: pass"] + retries,
+    )
+
+    states, _ = scan_task_states(tree, git_repo, spec_id="main", use_index=False)
+    assert states["T001"] == TaskState.COMPLETE
+    assert states["T002"] == TaskState.IMPLEMENTING
+
+
+def test_scan_on_base_branch_ignores_commits_before_run_start(git_repo):
+    from agent_arborist.git.state import get_run_start_sha
+
+    tree = _two_task_tree()
+    _commit_task(git_repo, "T001", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    get_run_start_sha(git_repo, spec_id="main")
+    _commit_task(git_repo, "T002", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+
+    states, _ = scan_task_states(tree, git_repo, spec_id="main", use_index=False)
+    assert "T001" not in states
+    assert states["T002"] == TaskState.COMPLETE
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_scan_skips_run_start_marker(git_repo, use_index):
+    from agent_arborist.git.state import get_run_start_sha
+
+    tree = _two_task_tree()
+    scan_task_states(tree, git_repo, spec_id="main", use_index=use_index)
+    get_run_start_sha(git_repo, spec_id="main")
+    _commit_task(git_repo, "T001", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+
+    # Second scan is incremental when the index is on.
+    states, trailers = scan_task_states(tree, git_repo, spec_id="main", use_index=use_index)
+    assert states == {"T001": TaskState.COMPLETE}
+    assert set(trailers) == {"T001"}
+    assert "" not in scan_task_commits(git_repo, spec_id="main")
+
+
+@pytest.mark.slow
+def test_scan_on_base_branch_cost_independent_of_history_length(git_repo, tmp_path):
+    """Benchmark: a 10k-commit history before run-start doesn't slow the scan."""
+    from agent_arborist.git.state import get_run_start_sha
+
+    def _bench(repo):
+        get_run_start_sha(repo, spec_id="main")
+        _fast_import_commits(repo, [
+            f"task(main@T{i:03d}@complete): done\n\n{TRAILER_STEP}: complete"
+            for i in range(50)
+        ])
+        tree = _two_task_tree()
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            states, _ = scan_task_states(tree, repo, spec_id="main", use_index=False)
+            best = min(best, time.perf_counter() - start)
+        assert len(states) == 50
+        return best
+
+    small = _bench(git_repo)
+
+    big_repo = tmp_path / "big-repo"
+    subprocess.run(["git", "clone", "-q", str(git_repo), str(big_repo)], check=True)
+    subprocess.run(["git", "config", "user.email", "test@test.com"], cwd=big_repo, check=True)
+    subprocess.run(["git", "config", "user.name", "Test"], cwd=big_repo, check=True)
+    subprocess.run(["git", "reset", "-q", "--hard", "HEAD~51"], cwd=big_repo, check=True)
+    _fast_import_commits(big_repo, [f"unrelated commit {i}" for i in range(10_000)])
+    subprocess.run(["git", "commit-graph", "write", "--reachable"], cwd=big_repo, check=True)
+    big = _bench(big_repo)
+
+    # Both scans stop at the run-start marker, so cost stays flat.
+    assert big < small * 3 + 0.05, f"small={small:.4f}s big={big:.4f}s"
+
+
+def test_scan_task_commits_matches_per_task_history(git_repo):
+    for tid in ("T001", "T002", "T0010"):
+        _commit_task(git_repo, tid, status="implement", **{TRAILER_STEP: "implement", TRAILER_RESULT: "pass"})
+        _commit_task(git_repo, tid, **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    _commit_task(git_repo, "T001", branch="other", **{TRAILER_STEP: "complete"})
+
+    commits = scan_task_commits(git_repo, spec_id="main")
+    assert set(commits) == {"T001", "T002", "T0010"}
+    for tid in commits:
+        assert commits[tid] == get_task_commit_history(tid, git_repo, spec_id="main")
+    # T001 must not pick up T0010's commits
+    assert [c["step"] for c in commits["T001"]] == ["complete", "implement"]
+
+
+def test_scan_task_commits_caps_per_task(git_repo):
+    for i in range(5):
+        _commit_task(git_repo, "T001", status="implement", **{TRAILER_STEP: "implement", "Arborist-Retry": str(i)})
+    commits = scan_task_commits(git_repo, spec_id="main", per_task=3)
+    assert [c["retry"] for c in commits["T001"]] == ["4", "3", "2"]
+
+
+def test_scan_task_history_runs_one_log_for_all_tasks(git_repo, monkeypatch):
+    tree = _two_task_tree()
+    _commit_task(git_repo, "T001", **{TRAILER_STEP: "complete", TRAILER_RESULT: "pass"})
+    _commit_task(git_repo, "T002", status="implement", **{TRAILER_STEP: "implement", TRAILER_RESULT: "pass"})
+    scan_task_states(tree, git_repo, spec_id="main")  # warm the state index
+
+    import agent_arborist.git.state as state_mod
+    calls = []
+    real_log = state_mod.git_log
+
+    def _counting_log(*args, **kwargs):
+        calls.append(args)
+        return real_log(*args, **kwargs)
+
+    monkeypatch.setattr(state_mod, "git_log", _counting_log)
+    history = scan_task_history(tree, git_repo, spec_id="main")
+    assert len(calls) == 1
+    assert history.states["T001"] == TaskState.COMPLETE
+    assert history.states["T002"] == TaskState.IMPLEMENTING
+    assert history.trailers["T001"][TRAILER_STEP] == "complete"
+    assert len(history.commits["T001"]) == 1
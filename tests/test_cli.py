@@ -510,6 +510,12 @@ class TestTestingConfigNoCommand:
         assert "command" not in d
         assert d["timeout"] == 30
 
+    def test_testing_config_parallel_must_be_positive(self):
+        from agent_arborist.config import TestingConfig, ConfigValidationError
+        assert TestingConfig.from_dict({"parallel": 3}).parallel == 3
+        with pytest.raises(ConfigValidationError, match="parallel"):
+            TestingConfig(parallel=0).validate()
+
     def test_testing_config_strict_rejects_unknown_fields(self):
         from agent_arborist.config import TestingConfig, ConfigValidationError
         with pytest.raises(ConfigValidationError, match="Unknown fields"):
@@ -0,0 +1,93 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the container shell agent, run against a local sh."""
+
+import threading
+import time
+
+import pytest
+
+from agent_arborist.container_shell import AGENT_SCRIPT, ContainerShell, encode_command
+
+
+@pytest.fixture
+def shell():
+    sh = ContainerShell(["sh", "-c", AGENT_SCRIPT], lambda cmd: ["sh", "-c", cmd])
+    assert sh.start(timeout=10)
+    yield sh
+    sh.close()
+
+
+def _collect():
+    lines: list[tuple[str, str]] = []
+    return lines, lambda stream, line: lines.append((stream, line))
+
+
+def test_encode_command_quotes_lists_and_escapes():
+    assert encode_command(["echo", "a b"]) == "echo 'a b'"
+    assert encode_command("printf 'x\\n'\necho y") == "printf 'x\\\\n'\\necho y"
+
+
+def test_run_reports_exit_code_and_streams(shell):
+    lines, on_output = _collect()
+    ran = shell.run("echo out; echo err >&2; exit 3", 10, on_output=on_output)
+    assert ran.returncode == 3
+    assert ("stdout", "out\n") in lines
+    assert ("stderr", "err\n") in lines
+
+    assert shell.run(["true"], 10).returncode == 0
+
+
+def test_run_multiline_and_backslashes(shell):
+    lines, on_output = _collect()
+    ran = shell.run("printf '%s\\n' 'a\\b'\necho second", 10, on_output=on_output)
+    assert ran.returncode == 0
+    assert lines == [("stdout", "a\\b\n"), ("stdout", "second\n")]
+
+
+def test_timeout_kills_command_tree(shell):
+    start = time.monotonic()
+    ran = shell.run("sleep 30 & sleep 30; wait", 0.5)
+    assert ran.timed_out and ran.returncode is None
+    assert time.monotonic() - start < 10
+    # The agent survives and keeps serving commands.
+    assert shell.run("echo ok", 10).returncode == 0
+
+
+def test_stop_event_kills_command(shell):
+    stop = threading.Event()
+    threading.Timer(0.2, stop.set).start()
+    ran = shell.run("sleep 30", 60, stop=stop)
+    assert ran.stopped and ran.returncode is None
+
+
+def test_busy_or_closed_agent_returns_none(shell):
+    done = []
+
+    def long_run():
+        done.append(shell.run("sleep 1", 10, on_output=lambda *_: None, stop=None))
+
+    t = threading.Thread(target=long_run)
+    t.start()
+    time.sleep(0.2)
+    assert shell.run("true", 10) is None
+    t.join()
+    assert done[0].returncode == 0
+
+    proc, reader = shell._proc, shell._reader
+    shell.close()
+    assert not shell.alive
+    assert proc.stdout.closed and not reader.is_alive()
+    assert shell.run("true", 10) is None
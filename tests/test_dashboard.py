@@ -73,6 +73,69 @@ def test_dashboard_status_endpoint(tmp_path, minimal_tree):
         assert isinstance(task_data["commits"], list)
 
 
+def test_dashboard_status_includes_task_commits(tmp_path, minimal_tree, monkeypatch):
+    """/api/status groups task commits per leaf."""
+    import subprocess
+    from agent_arborist.dashboard.server import create_app
+
+    tree_path = tmp_path / "task-tree.json"
+    tree_path.write_text(json.dumps(minimal_tree))
+    _init_git(tmp_path)
+    for status, step in (("implement", "implement"), ("complete", "complete")):
+        msg = f"task(main@T001@{status}): step\n\nArborist-Step: {step}\nArborist-Result: pass"
+        subprocess.run(["git", "commit", "--allow-empty", "-m", msg], cwd=tmp_path, check=True, capture_output=True)
+    monkeypatch.chdir(tmp_path)
+
+    client = TestClient(create_app(tree_path, None, None))
+    data = client.get("/api/status").json()
+
+    assert data["tasks"]["T001"]["state"] == "complete"
+    assert [c["step"] for c in data["tasks"]["T001"]["commits"]] == ["complete", "implement"]
+    assert data["tasks"]["M1"]["commits"] == []
+
+
+def test_dashboard_status_does_not_block_event_loop(tmp_path, minimal_tree, monkeypatch):
+    """A slow git scan for /api/status runs off the loop; other requests still answer."""
+    import asyncio
+    import time
+
+    import httpx
+
+    from agent_arborist.dashboard import server
+
+    tree_path = tmp_path / "task-tree.json"
+    tree_path.write_text(json.dumps(minimal_tree))
+    _init_git(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    app = server.create_app(tree_path, None, None)
+    scan = server.scan_task_history
+
+    def slow_scan(*args, **kwargs):
+        time.sleep(0.5)
+        return scan(*args, **kwargs)
+
+    monkeypatch.setattr(server, "scan_task_history", slow_scan)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            done = []
+
+            async def get(path):
+                response = await client.get(path)
+                done.append(path)
+                return response
+
+            status = asyncio.create_task(get("/api/status"))
+            await asyncio.sleep(0.05)
+            html = await get("/")
+            assert done == ["/"]
+            assert html.status_code == 200
+            assert (await status).status_code == 200
+
+    asyncio.run(main())
+
+
 def test_dashboard_reports_endpoint(tmp_path):
     """Test /api/reports endpoint."""
     from agent_arborist.dashboard.server import create_app
@@ -122,6 +185,30 @@ def test_dashboard_logs_endpoint(tmp_path, minimal_tree):
     assert data["logs"]["T001"][0]["phase"] == "implement"
 
 
+def test_dashboard_logs_report_growing_file_size(tmp_path, minimal_tree):
+    """Appending to a log doesn't touch the directory; the listing still sees it."""
+    from agent_arborist.dashboard.server import create_app
+
+    tree_path = tmp_path / "task-tree.json"
+    tree_path.write_text(json.dumps(minimal_tree))
+    _init_git(tmp_path)
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    log = log_dir / "T001_test_20250101T120000.log"
+    log.write_text("start\n")
+    client = TestClient(create_app(tree_path, None, log_dir))
+
+    first = client.get("/api/logs")
+    assert first.json()["logs"]["T001"][0]["size"] == 6
+    assert client.get("/api/logs", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    with log.open("a") as f:
+        f.write("x" * 1000)
+    second = client.get("/api/logs", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["logs"]["T001"][0]["size"] == 1006
+
+
 def test_dashboard_log_file_security(tmp_path):
     """Test that log file serving prevents directory traversal."""
     from agent_arborist.dashboard.server import create_app
@@ -147,3 +234,271 @@ def test_dashboard_log_file_security(tmp_path):
 
     response = client.get("/api/log/../../test.txt")
     assert response.status_code in (403, 404)
+
+
+def test_dashboard_status_etag_and_304(tmp_path, minimal_tree, monkeypatch):
+    """Unchanged state answers If-None-Match with 304 and no git log."""
+    import subprocess
+    from agent_arborist.dashboard.server import create_app
+
+    tree_path = tmp_path / "task-tree.json"
+    tree_path.write_text(json.dumps(minimal_tree))
+    _init_git(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    client = TestClient(create_app(tree_path, None, None))
+
+    first = client.get("/api/status")
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+
+    def _boom(*args, **kwargs):
+        raise AssertionError("git log should not run for a cached poll")
+
+    monkeypatch.setattr("agent_arborist.git.state.git_log", _boom)
+    again = client.get("/api/status", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert client.get("/api/status").json() == first.json()
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+
+    msg = "task(main@T001@complete): done\n\nArborist-Step: complete\nArborist-Result: pass"
+    subprocess.run(["git", "commit", "--allow-empty", "-m", msg], cwd=tmp_path, check=True, capture_output=True)
+    changed = client.get("/api/status", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["tasks"]["T001"]["state"] == "complete"
+
+
+def test_dashboard_reports_cache_follows_report_dir(tmp_path):
+    """A new report file changes the directory mtime and the response."""
+    import os
+    from agent_arborist.dashboard.server import create_app
+
+    tree_path = tmp_path / "task-tree.json"
+    tree_path.write_text(json.dumps({"nodes": {}, "execution_order": [], "spec_files": []}))
+    _init_git(tmp_path)
+    report_dir = tmp_path / "reports"
+    report_dir.mkdir()
+    client = TestClient(create_app(tree_path, report_dir, None))
+
+    first = client.get("/api/reports")
+    assert first.json()["summary"]["total"] == 0
+    assert client.get("/api/reports", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    (report_dir / "T001_run_20250101T120000.json").write_text('{"task_id": "T001", "result": "pass", "retries": 0}')
+    # Make the mtime change visible even on coarse-grained filesystems.
+    st = os.stat(report_dir)
+    os.utime(report_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    second = client.get("/api/reports", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["summary"]["total"] == 1
+
+
+def test_event_hub_one_watcher_for_many_clients():
+    import asyncio
+    from agent_arborist.dashboard.events import EventHub
+
+    state = {"key": 1}
+    probes = []
+
+    def probe():
+        probes.append(state["key"])
+        return state["key"]
+
+    async def main():
+        hub = EventHub(probe, interval=0.02, keepalive=5)
+        streams = [hub.stream() for _ in range(3)]
+        for s in streams:
+            assert await s.__anext__() == "retry: 3000\n\n"
+            assert (await s.__anext__()).startswith("event: hello")
+        assert hub.subscriber_count == 3
+        await asyncio.sleep(0.1)
+        polled = len(probes)
+
+        state["key"] = 2
+        received = [await asyncio.wait_for(s.__anext__(), 5) for s in streams]
+        for s in streams:
+            await s.aclose()
+        assert hub.subscriber_count == 0
+        return polled, received
+
+    polled, received = asyncio.run(main())
+    for text in received:
+        assert "event: changed" in text
+    # One probe per interval, regardless of the number of clients.
+    assert polled < 10
+
+
+def test_event_hub_coalesces_pending_changes():
+    import asyncio
+    from agent_arborist.dashboard.events import EventHub
+
+    async def main():
+        hub = EventHub(lambda: 0, interval=60)
+        queue = hub.subscribe()
+        for _ in range(5):
+            hub.publish("changed", {})
+        items = []
+        while not queue.empty():
+            items.append(queue.get_nowait())
+        hub.unsubscribe(queue)
+        return items
+
+    items = asyncio.run(main())
+    # A client that hasn't read its notification yet is not sent another.
+    assert [name for _, name, _ in items] == ["changed"]
+
+
+def _log_app(tmp_path, content):
+    from agent_arborist.dashboard.server import create_app
+
+    tree_path = tmp_path / "task-tree.json"
+    tree_path.write_text(json.dumps({"nodes": {}, "execution_order": [], "spec_files": []}))
+    _init_git(tmp_path)
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "T001_implement.log").write_bytes(content)
+    return TestClient(create_app(tree_path, None, log_dir))
+
+
+def test_log_file_range_requests(tmp_path):
+    client = _log_app(tmp_path, b"0123456789")
+
+    full = client.get("/api/log/T001_implement.log")
+    assert full.status_code == 200
+    assert full.content == b"0123456789"
+    assert full.headers["accept-ranges"] == "bytes"
+
+    part = client.get("/api/log/T001_implement.log", headers={"Range": "bytes=2-5"})
+    assert part.status_code == 206
+    assert part.content == b"2345"
+    assert part.headers["content-range"] == "bytes 2-5/10"
+
+    assert client.get("/api/log/T001_implement.log", headers={"Range": "bytes=7-"}).content == b"789"
+    assert client.get("/api/log/T001_implement.log", headers={"Range": "bytes=-3"}).content == b"789"
+
+    bad = client.get("/api/log/T001_implement.log", headers={"Range": "bytes=50-"})
+    assert bad.status_code == 416
+    assert bad.headers["content-range"] == "bytes */10"
+
+
+def test_log_file_tail(tmp_path):
+    lines = b"".join(f"line {i}\n".encode() for i in range(20000))
+    client = _log_app(tmp_path, lines)
+
+    resp = client.get("/api/log/T001_implement.log?tail=3")
+    assert resp.status_code == 200
+    assert resp.text == "line 19997\nline 19998\nline 19999\n"
+    assert client.get("/api/log/T001_implement.log?tail=0").text == ""
+
+
+def test_compressed_log_file_served_with_gzip_encoding(tmp_path):
+    import gzip
+
+    client = _log_app(tmp_path, b"")
+    (tmp_path / "logs" / "T001_test_20250101T000000.log.gz").write_bytes(gzip.compress(b"[unit] ok\n"))
+
+    resp = client.get("/api/log/T001_test_20250101T000000.log.gz")
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.text == "[unit] ok\n"
+
+
+def test_tail_offset_edge_cases(tmp_path):
+    from agent_arborist.dashboard.logs import tail_offset
+
+    path = tmp_path / "x.log"
+    path.write_bytes(b"")
+    assert tail_offset(path, 5) == 0
+    path.write_bytes(b"a\nb\nc")  # no trailing newline
+    assert path.read_bytes()[tail_offset(path, 2):] == b"b\nc"
+    path.write_bytes(b"a\nb\nc\n")
+    assert path.read_bytes()[tail_offset(path, 2):] == b"b\nc\n"
+    assert tail_offset(path, 10) == 0
+
+
+def test_parse_range_ignores_unsupported_forms():
+    from agent_arborist.dashboard.logs import parse_range
+
+    assert parse_range(None, 10) is None
+    assert parse_range("items=0-1", 10) is None
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    assert parse_range("bytes=5-2", 10) is None
+    assert parse_range("bytes=0-99", 10) == (0, 9)
+
+
+def test_follow_file_streams_appended_bytes(tmp_path):
+    import asyncio
+    from agent_arborist.dashboard.logs import follow_file
+
+    path = tmp_path / "live.log"
+    path.write_bytes(b"start\n")
+
+    async def main():
+        chunks = []
+
+        async def writer():
+            await asyncio.sleep(0.1)
+            with open(path, "ab") as f:
+                f.write(b"more\n")
+
+        task = asyncio.create_task(writer())
+        async for chunk in follow_file(path, poll=0.02, idle_timeout=0.3):
+            chunks.append(chunk)
+        await task
+        return b"".join(chunks)
+
+    assert asyncio.run(main()) == b"start\nmore\n"
+
+
+def _age_dir(path, seconds=10):
+    import os
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_scan_log_files_longest_task_prefix_wins(tmp_path):
+    from agent_arborist.dashboard.logs import LogIndex
+
+    for name in ("T1_implement_20250101T000000.log", "T10_implement_20250101T000000.log",
+                 "T1_a_test_20250101T000001.log", "T1_review_20250101T000002.log",
+                 "T1_test_20250101T000003.log.gz", "notes.txt"):
+        (tmp_path / name).write_text("x")
+    result = LogIndex(tmp_path).entries(["T1", "T10", "T1_a"])
+    assert [e["filename"] for e in result["T1"]] == [
+        "T1_implement_20250101T000000.log", "T1_review_20250101T000002.log", "T1_test_20250101T000003.log.gz",
+    ]
+    assert [e["phase"] for e in result["T1"]] == ["implement", "review", "test"]
+    assert [e["filename"] for e in result["T10"]] == ["T10_implement_20250101T000000.log"]
+    assert [(e["phase"], e["timestamp"]) for e in result["T1_a"]] == [("test", "20250101T000001")]
+
+
+def test_log_index_reuses_listing_until_dir_changes(tmp_path, monkeypatch):
+    import os
+    from agent_arborist.dashboard import logs as logs_mod
+
+    (tmp_path / "T1_implement_20250101T000000.log").write_text("abc")
+    _age_dir(tmp_path)
+    index = logs_mod.LogIndex(tmp_path)
+    assert index.entries(["T1"])["T1"][0]["size"] == 3
+
+    real_scandir = os.scandir
+    scans = []
+
+    def counting_scandir(path):
+        scans.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(logs_mod.os, "scandir", counting_scandir)
+
+    # A growing file keeps the directory mtime; only its size is refreshed.
+    with open(tmp_path / "T1_implement_20250101T000000.log", "a") as f:
+        f.write("defg")
+    assert index.entries(["T1"])["T1"][0]["size"] == 7
+    assert scans == []
+
+    (tmp_path / "T1_review_20250101T000001.log").write_text("r")
+    entries = index.entries(["T1"])["T1"]
+    assert [e["phase"] for e in entries] == ["implement", "review"]
+    assert len(scans) == 1
@@ -14,6 +14,7 @@
 
 """Tests for devcontainer detection, mode resolution, and CLI wrapper."""
 
+import json
 import subprocess
 from pathlib import Path
 from unittest.mock import patch
@@ -23,8 +24,12 @@ import pytest
 from agent_arborist.devcontainer import (
     DevcontainerError,
     DevcontainerNotFoundError,
+    clear_container_sessions,
+    container_exec_args,
+    container_exec_failed,
     devcontainer_exec,
     ensure_container_running,
+    get_container_session,
     has_devcontainer,
     is_container_running,
     should_use_container,
@@ -166,3 +171,525 @@ def test_devcontainer_up_passes_timeout(mock_subprocess):
 def test_is_container_running_passes_timeout(mock_subprocess):
     is_container_running(Path("/repo"), timeout=60)
     assert mock_subprocess.call_args.kwargs["timeout"] == 60
+
+
+# --- Session registry ---
+
+UP_JSON = '{"outcome":"success","containerId":"abc123def456","remoteUser":"vscode"}'
+
+
+def _argv(call):
+    return call[0][0][:3]
+
+
+def test_ensure_container_running_records_container_id(mock_subprocess):
+    mock_subprocess.return_value = subprocess.CompletedProcess(
+        args=[], returncode=0, stdout="[1 ms] Dev Containers CLI\n" + UP_JSON + "\n",
+    )
+    session = ensure_container_running(Path("/repo"))
+    assert session.container_id == "abc123def456"
+    assert get_container_session(Path("/repo")) is session
+
+
+def test_ensure_container_running_reuses_fresh_session(mock_subprocess):
+    ensure_container_running(Path("/repo"))
+    ensure_container_running(Path("/repo"))
+    ensure_container_running(Path("/repo"))
+    assert mock_subprocess.call_count == 1
+
+
+def test_expired_session_checks_container_id_with_docker(mock_subprocess):
+    mock_subprocess.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout=UP_JSON)
+    ensure_container_running(Path("/repo"))
+    mock_subprocess.reset_mock()
+    mock_subprocess.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout="true\n")
+
+    ensure_container_running(Path("/repo"), ttl=0)
+    assert [c[0][0] for c in mock_subprocess.call_args_list] == [
+        ["docker", "inspect", "--format", "{{.State.Running}}", "abc123def456"],
+    ]
+
+
+def test_exec_failure_forces_recheck(mock_subprocess):
+    mock_subprocess.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout=UP_JSON)
+    ensure_container_running(Path("/repo"))
+    ensure_container_running(Path("/repo"))
+    assert mock_subprocess.call_count == 1
+
+    container_exec_failed(Path("/repo"))
+    mock_subprocess.side_effect = [
+        subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="No such object"),  # inspect
+        subprocess.CompletedProcess(args=[], returncode=1),  # not running
+        subprocess.CompletedProcess(args=[], returncode=0, stdout=UP_JSON.replace("abc123", "fff999")),  # up
+        subprocess.CompletedProcess(args=[], returncode=0, stdout="git version 2.x"),  # health
+    ]
+    session = ensure_container_running(Path("/repo"))
+    assert session.container_id == "fff999def456"
+    assert [_argv(c) for c in mock_subprocess.call_args_list[1:]] == [
+        ["docker", "inspect", "--format"],
+        ["devcontainer", "up", "--workspace-folder"],
+        ["devcontainer", "up", "--workspace-folder"],
+        ["devcontainer", "exec", "--workspace-folder"],
+    ]
+
+
+def test_missing_docker_falls_back_to_cli_probe(mock_subprocess):
+    mock_subprocess.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout=UP_JSON)
+    ensure_container_running(Path("/repo"))
+
+    def run(args, **kwargs):
+        if args[0] == "docker":
+            raise FileNotFoundError("docker")
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=UP_JSON)
+
+    mock_subprocess.side_effect = run
+    mock_subprocess.reset_mock()
+    ensure_container_running(Path("/repo"), ttl=0)
+    assert [_argv(c) for c in mock_subprocess.call_args_list] == [
+        ["docker", "inspect", "--format"],
+        ["devcontainer", "up", "--workspace-folder"],
+    ]
+
+
+def test_concurrent_callers_probe_once(mock_subprocess):
+    import threading
+    import time
+
+    def slow_probe(args, **kwargs):
+        time.sleep(0.05)
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=UP_JSON)
+
+    mock_subprocess.side_effect = slow_probe
+    threads = [threading.Thread(target=ensure_container_running, args=(Path("/repo"),)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert mock_subprocess.call_count == 1
+
+
+def test_execute_command_exec_failure_expires_session(mock_subprocess):
+    from agent_arborist.runner import _execute_command
+
+    mock_subprocess.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout=UP_JSON)
+    assert _execute_command(["true"], 10, container_workspace=Path("/repo")).success
+    assert get_container_session(Path("/repo")).is_fresh(60)
+
+    # The command ran and failed: nothing wrong with the container
+    mock_subprocess.return_value = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="boom")
+    assert not _execute_command(["false"], 10, container_workspace=Path("/repo")).success
+    assert get_container_session(Path("/repo")).is_fresh(60)
+
+    mock_subprocess.return_value = subprocess.CompletedProcess(
+        args=[], returncode=125, stdout="", stderr="Error response from daemon: No such container",
+    )
+    assert not _execute_command(["true"], 10, container_workspace=Path("/repo")).success
+    assert not get_container_session(Path("/repo")).is_fresh(60)
+
+
+# --- docker exec fast path ---
+
+FULL_UP_JSON = (
+    '{"outcome":"success","containerId":"abc123def456","remoteUser":"vscode",'
+    '"remoteWorkspaceFolder":"/workspaces/repo"}'
+)
+ENVIRON = b"PATH=/usr/local/bin:/usr/bin\0HOSTNAME=abc123\0API_KEY=a=b\0PWD=/workspaces/repo\0"
+
+
+@pytest.fixture
+def docker_on_path():
+    with patch("agent_arborist.devcontainer.shutil.which", return_value="/usr/bin/docker"):
+        yield
+
+
+def _up_then_env(args, **kwargs):
+    if args[:2] == ["devcontainer", "exec"]:
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=ENVIRON)
+    return subprocess.CompletedProcess(args=args, returncode=0, stdout=FULL_UP_JSON)
+
+
+def test_session_resolves_docker_exec_args(mock_subprocess, docker_on_path):
+    mock_subprocess.side_effect = _up_then_env
+    session = ensure_container_running(Path("/repo"))
+    assert session.can_docker_exec
+    assert session.exec_env == {"PATH": "/usr/local/bin:/usr/bin", "API_KEY": "a=b"}
+    env_probe = mock_subprocess.call_args_list[-1][0][0]
+    assert env_probe == ["devcontainer", "exec", "--workspace-folder", "/repo", "cat", "/proc/self/environ"]
+
+    assert container_exec_args("pytest -q", Path("/repo")) == [
+        "docker", "exec", "-w", "/workspaces/repo", "-u", "vscode",
+        "--env-file", str(session.env_file),
+        "abc123def456", "sh", "-c", "pytest -q",
+    ]
+
+
+def test_exec_env_stays_off_the_command_line(mock_subprocess, docker_on_path):
+    def up_then_env(args, **kwargs):
+        if args[:2] == ["devcontainer", "exec"]:
+            environ = b"API_KEY=sk-secret\0MULTI=a\nb\0"
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout=environ)
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=FULL_UP_JSON)
+
+    mock_subprocess.side_effect = up_then_env
+    session = ensure_container_running(Path("/repo"))
+    argv = container_exec_args(["env"], Path("/repo"))
+    assert not any("sk-secret" in arg for arg in argv)
+
+    env_file = session.env_file
+    assert env_file.stat().st_mode & 0o777 == 0o600
+    assert env_file.read_text() == "API_KEY=sk-secret\n"
+
+    clear_container_sessions()
+    assert not env_file.exists()
+
+
+def test_recreated_container_health_check_skips_dead_id(mock_subprocess, docker_on_path):
+    """A lost container is recreated; nothing is exec'd into the old ID meanwhile."""
+    state = {"id": "aaa", "running": True}
+
+    def docker_world(args, **kwargs):
+        if args[:2] == ["docker", "inspect"]:
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout="true" if state["running"] else "false")
+        if args[:2] == ["docker", "exec"]:
+            ok = state["id"] in args and state["running"]
+            return subprocess.CompletedProcess(args=args, returncode=0 if ok else 1, stdout=ENVIRON, stderr="")
+        if "--expect-existing-container" in args and not state["running"]:
+            return subprocess.CompletedProcess(args=args, returncode=1, stdout="")
+        if args[:2] == ["devcontainer", "exec"]:
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout=ENVIRON, stderr="")
+        up = FULL_UP_JSON.replace("abc123def456", state["id"])
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=up)
+
+    mock_subprocess.side_effect = docker_world
+    assert ensure_container_running(Path("/repo")).container_id == "aaa"
+    container_exec_failed(Path("/repo"))
+    state.update(id="bbb", running=False)
+
+    def up_creates(args, **kwargs):
+        if args[:2] == ["devcontainer", "up"] and "--expect-existing-container" not in args:
+            state["running"] = True
+        return docker_world(args, **kwargs)
+
+    mock_subprocess.side_effect = up_creates
+    session = ensure_container_running(Path("/repo"))
+    assert session.container_id == "bbb"
+    assert not any("aaa" in c[0][0] for c in mock_subprocess.call_args_list if c[0][0][:2] == ["docker", "exec"])
+
+
+def test_devcontainer_exec_uses_docker_when_session_ready(mock_subprocess, docker_on_path):
+    mock_subprocess.side_effect = _up_then_env
+    ensure_container_running(Path("/repo"))
+    mock_subprocess.side_effect = None
+    devcontainer_exec(["echo", "hi"], workspace_folder=Path("/repo"))
+    args = mock_subprocess.call_args[0][0]
+    assert args[:2] == ["docker", "exec"]
+    assert args[-3:] == ["abc123def456", "echo", "hi"]
+
+
+def test_exec_falls_back_to_cli_without_docker(mock_subprocess):
+    mock_subprocess.side_effect = _up_then_env
+    with patch("agent_arborist.devcontainer.shutil.which", return_value=None):
+        session = ensure_container_running(Path("/repo"))
+    assert not session.can_docker_exec
+    assert mock_subprocess.call_count == 1  # no env probe
+    assert container_exec_args(["ls"], Path("/repo")) == [
+        "devcontainer", "exec", "--workspace-folder", "/repo", "ls",
+    ]
+
+
+def test_exec_falls_back_to_cli_when_env_probe_fails(mock_subprocess, docker_on_path):
+    def run(args, **kwargs):
+        if args[:2] == ["devcontainer", "exec"]:
+            return subprocess.CompletedProcess(args=args, returncode=1, stdout=b"", stderr=b"nope")
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=FULL_UP_JSON)
+
+    mock_subprocess.side_effect = run
+    assert not ensure_container_running(Path("/repo")).can_docker_exec
+    assert container_exec_args(["ls"], Path("/repo"))[:2] == ["devcontainer", "exec"]
+
+
+def test_exec_without_session_uses_cli():
+    assert container_exec_args(["ls"], Path("/elsewhere"))[:2] == ["devcontainer", "exec"]
+
+
+# --- Container pool ---
+
+
+def _up_per_folder(args, **kwargs):
+    """devcontainer up reports a container ID derived from the workspace folder."""
+    if args[:2] == ["devcontainer", "up"]:
+        folder = args[args.index("--workspace-folder") + 1]
+        return subprocess.CompletedProcess(
+            args=args, returncode=0, stdout=f'{{"containerId":"id-{Path(folder).name}"}}',
+        )
+    return subprocess.CompletedProcess(args=args, returncode=0, stdout="", stderr="")
+
+
+def test_container_pool_warms_leases_and_removes(mock_subprocess):
+    import asyncio
+    from agent_arborist.devcontainer import ContainerPool
+
+    mock_subprocess.side_effect = _up_per_folder
+    pool = ContainerPool([Path("/wt/slot-0"), Path("/wt/slot-1")])
+    asyncio.run(pool.start())
+    assert get_container_session(Path("/wt/slot-0")).container_id == "id-slot-0"
+    assert get_container_session(Path("/wt/slot-1")).container_id == "id-slot-1"
+
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first, second} == {Path("/wt/slot-0"), Path("/wt/slot-1")}
+    assert pool.available == 0
+    with pytest.raises(IndexError):
+        pool.acquire()
+    pool.release(first)
+    assert pool.acquire() == first
+
+    mock_subprocess.reset_mock()
+    pool.close()
+    assert sorted(c[0][0][-1] for c in mock_subprocess.call_args_list) == ["id-slot-0", "id-slot-1"]
+    assert all(c[0][0][:3] == ["docker", "rm", "--force"] for c in mock_subprocess.call_args_list)
+    assert get_container_session(Path("/wt/slot-0")) is None
+
+
+def test_container_pool_reuses_warm_container(mock_subprocess):
+    import asyncio
+    from agent_arborist.devcontainer import ContainerPool
+
+    mock_subprocess.side_effect = _up_per_folder
+    pool = ContainerPool([Path("/wt/slot-0")])
+    asyncio.run(pool.start())
+    calls = mock_subprocess.call_count
+    folder = pool.acquire()
+    ensure_container_running(folder)
+    pool.release(folder)
+    ensure_container_running(pool.acquire())
+    assert mock_subprocess.call_count == calls
+
+
+# --- Shell agent ---
+
+
+def test_container_shell_starts_with_session_when_enabled(mock_subprocess, docker_on_path):
+    from agent_arborist.devcontainer import clear_container_sessions, container_shell, set_container_shell
+
+    mock_subprocess.side_effect = _up_then_env
+    set_container_shell(True)
+    with patch("agent_arborist.container_shell.ContainerShell.start", return_value=True) as start, \
+            patch("agent_arborist.container_shell.ContainerShell.alive", True), \
+            patch("agent_arborist.container_shell.ContainerShell.close") as close:
+        session = ensure_container_running(Path("/repo"))
+        start.assert_called_once()
+        assert session.shell.argv[:4] == ["docker", "exec", "-i", "-w"]
+        assert session.shell.argv[-3:-1] == ["sh", "-c"]
+        assert session.shell.exec_argv("kill 1")[-3:] == ["sh", "-c", "kill 1"]
+        assert container_shell(Path("/repo")) is session.shell
+
+        clear_container_sessions()
+        close.assert_called_once()
+    assert container_shell(Path("/repo")) is None
+
+
+def test_container_shell_off_by_default(mock_subprocess, docker_on_path):
+    from agent_arborist.devcontainer import container_shell
+
+    mock_subprocess.side_effect = _up_then_env
+    with patch("agent_arborist.container_shell.ContainerShell.start") as start:
+        ensure_container_running(Path("/repo"))
+    start.assert_not_called()
+    assert container_shell(Path("/repo")) is None
+
+
+# --- Prebuilt images and warm-up ---
+
+
+@pytest.fixture
+def config_repo(tmp_path):
+    (tmp_path / ".devcontainer").mkdir()
+    (tmp_path / ".devcontainer" / "devcontainer.json").write_text('{"image": "python:3.12"}')
+    return tmp_path
+
+
+def test_cached_image_tag_follows_config_content(config_repo, tmp_path):
+    from agent_arborist.devcontainer import cached_image_tag
+
+    tag = cached_image_tag(config_repo)
+    assert tag.startswith("arborist-devcontainer:")
+    assert cached_image_tag(config_repo) == tag
+    (config_repo / ".devcontainer" / "Dockerfile").write_text("FROM python:3.12\n")
+    assert cached_image_tag(config_repo) != tag
+    assert cached_image_tag(tmp_path / "missing") is None
+
+
+def test_prebuild_image_skips_build_when_tag_exists(mock_subprocess, docker_on_path, config_repo):
+    from agent_arborist.devcontainer import cached_image_tag, prebuild_image
+
+    assert prebuild_image(config_repo) == cached_image_tag(config_repo)
+    (call,) = mock_subprocess.call_args_list
+    assert call[0][0][:3] == ["docker", "image", "inspect"]
+
+
+def test_prebuild_image_builds_missing_tag(mock_subprocess, docker_on_path, config_repo):
+    from agent_arborist.devcontainer import cached_image_tag, prebuild_image
+
+    def inspect_misses(args, **kwargs):
+        return subprocess.CompletedProcess(args=args, returncode=1 if args[:2] == ["docker", "image"] else 0)
+
+    mock_subprocess.side_effect = inspect_misses
+    tag = cached_image_tag(config_repo)
+    assert prebuild_image(config_repo, timeout=600) == tag
+    build = mock_subprocess.call_args_list[-1]
+    assert build[0][0] == [
+        "devcontainer", "build", "--workspace-folder", str(config_repo), "--image-name", tag,
+    ]
+    assert build.kwargs["timeout"] == 600
+
+    mock_subprocess.side_effect = lambda args, **kwargs: subprocess.CompletedProcess(
+        args=args, returncode=1, stderr="no space left",
+    )
+    assert prebuild_image(config_repo) is None
+
+
+def _record_up(mock_subprocess):
+    """Fake a workspace without a container; return the override configs ``up`` was given."""
+    overrides = []
+
+    def up_without_container(args, **kwargs):
+        if "--expect-existing-container" in args:
+            return subprocess.CompletedProcess(args=args, returncode=1, stdout="")
+        if "--override-config" in args:
+            overrides.append(json.loads(Path(args[args.index("--override-config") + 1]).read_text()))
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=UP_JSON)
+
+    mock_subprocess.side_effect = up_without_container
+    return overrides
+
+
+def _up_argv(mock_subprocess):
+    return next(c[0][0] for c in mock_subprocess.call_args_list
+                if c[0][0][:2] == ["devcontainer", "up"] and "--expect-existing-container" not in c[0][0])
+
+
+def test_up_starts_from_cached_image(mock_subprocess, docker_on_path, config_repo):
+    from agent_arborist.devcontainer import cached_image_tag
+
+    (config_repo / ".devcontainer" / "devcontainer.json").write_text("""{
+        // built by arborist's prebuild
+        "build": {"dockerfile": "Dockerfile", "context": ".."},
+        "features": {"ghcr.io/devcontainers/features/node:1": {}},
+        "remoteEnv": {"URL": "http://example.com/*x*/"},
+    }""")
+    overrides = _record_up(mock_subprocess)
+    ensure_container_running(config_repo)
+    assert "--cache-from" not in _up_argv(mock_subprocess)
+    assert overrides == [{"remoteEnv": {"URL": "http://example.com/*x*/"}, "image": cached_image_tag(config_repo)}]
+
+
+def test_up_with_compose_config_uses_cache_from(mock_subprocess, docker_on_path, config_repo):
+    from agent_arborist.devcontainer import cached_image_tag
+
+    (config_repo / ".devcontainer" / "devcontainer.json").write_text(
+        '{"dockerComposeFile": "compose.yml", "service": "app"}'
+    )
+    overrides = _record_up(mock_subprocess)
+    ensure_container_running(config_repo)
+    assert _up_argv(mock_subprocess)[-2:] == ["--cache-from", cached_image_tag(config_repo)]
+    assert overrides == []
+
+
+def test_up_mounts_git_dir_for_linked_worktree(git_repo, tmp_path):
+    from agent_arborist.devcontainer import devcontainer_up
+    from agent_arborist.git.repo import git_worktree_add
+
+    wt = tmp_path / "slot-0"
+    git_worktree_add(wt, git_repo)
+    with patch("agent_arborist.devcontainer.subprocess.run") as mock_run:
+        mock_run.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout=UP_JSON)
+        devcontainer_up(git_repo)
+        assert "--mount" not in _up_argv(mock_run)
+
+        mock_run.reset_mock()
+        devcontainer_up(wt)
+        args = _up_argv(mock_run)
+    common = (git_repo / ".git").resolve()
+    assert args[args.index("--mount") + 1] == f"type=bind,source={common},target={common}"
+
+
+def test_cached_image_tag_covers_dockerfile_outside_config_dir(config_repo):
+    from agent_arborist.devcontainer import cached_image_tag
+
+    (config_repo / ".devcontainer" / "devcontainer.json").write_text(
+        '{"build": {"dockerfile": "../Dockerfile", "context": ".."}}'
+    )
+    (config_repo / "Dockerfile").write_text("FROM python:3.12\nCOPY . /app\n")
+    (config_repo / "app.py").write_text("print(1)\n")
+    tag = cached_image_tag(config_repo)
+
+    # The rest of the build context is not part of the key
+    (config_repo / "app.py").write_text("print(2)\n")
+    assert cached_image_tag(config_repo) == tag
+
+    (config_repo / "Dockerfile").write_text("FROM python:3.13\nCOPY . /app\n")
+    assert cached_image_tag(config_repo) != tag
+
+
+def test_container_warmup_runs_once_in_background(mock_subprocess):
+    from agent_arborist.devcontainer import start_container_warmup
+
+    mock_subprocess.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout=UP_JSON)
+    future = start_container_warmup(Path("/repo"))
+    assert start_container_warmup(Path("/repo")) is future
+    assert future.result(timeout=10).container_id == "abc123def456"
+    assert get_container_session(Path("/repo")) is future.result()
+
+    image_only = start_container_warmup(Path("/other"), start=False)
+    assert image_only.result(timeout=10) is None
+    assert get_container_session(Path("/other")) is None
+
+
+def test_lazy_up_waits_for_warmup_prebuild(mock_subprocess, docker_on_path, config_repo):
+    """A task that starts while the warm-up still builds waits for the image instead of building too."""
+    import threading
+    import time
+    from agent_arborist.devcontainer import start_container_warmup
+
+    built = threading.Event()
+
+    def slow_build(args, **kwargs):
+        if args[:3] == ["docker", "image", "inspect"]:
+            return subprocess.CompletedProcess(args=args, returncode=0 if built.is_set() else 1, stdout="")
+        if args[:2] == ["devcontainer", "build"]:
+            time.sleep(0.3)
+            built.set()
+        if args[:2] == ["docker", "ps"]:
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout="")
+        if "--expect-existing-container" in args:
+            return subprocess.CompletedProcess(args=args, returncode=1, stdout="")
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=UP_JSON)
+
+    mock_subprocess.side_effect = slow_build
+    future = start_container_warmup(config_repo)
+    ensure_container_running(config_repo)
+    future.result(timeout=10)
+
+    argvs = [c[0][0] for c in mock_subprocess.call_args_list]
+    assert [a[:2] for a in argvs].count(["devcontainer", "build"]) == 1
+    up = _up_argv(mock_subprocess)
+    assert argvs.index(up) > [a[:2] for a in argvs].index(["devcontainer", "build"])
+    assert "--override-config" in up
+
+
+def test_container_warmup_skips_prebuild_for_existing_container(mock_subprocess, docker_on_path, config_repo):
+    from agent_arborist.devcontainer import start_container_warmup
+
+    def existing_container(args, **kwargs):
+        if args[:2] == ["docker", "ps"]:
+            return subprocess.CompletedProcess(args=args, returncode=0, stdout="abc123def456\n")
+        return subprocess.CompletedProcess(args=args, returncode=1, stdout="")
+
+    mock_subprocess.side_effect = existing_container
+    assert start_container_warmup(config_repo, start=False).result(timeout=10) is None
+    argvs = [c[0][0] for c in mock_subprocess.call_args_list]
+    assert argvs == [[
+        "docker", "ps", "--all", "--quiet", "--filter",
+        f"label=devcontainer.local_folder={config_repo.resolve()}",
+    ]]
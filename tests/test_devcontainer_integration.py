@@ -29,9 +29,12 @@ from pathlib import Path
 import pytest
 
 from agent_arborist.devcontainer import (
+    container_exec_args,
     devcontainer_exec,
+    devcontainer_exec_args,
     devcontainer_up,
     ensure_container_running,
+    prebuild_image,
 )
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -125,6 +128,35 @@ class TestDevcontainerIntegration:
                                 cwd=project, capture_output=True, text=True)
         assert "from container" in result.stdout
 
+    @pytest.mark.slow
+    def test_docker_exec_fast_path_latency(self, tmp_path):
+        """Benchmark: docker exec into the session's container vs devcontainer exec."""
+        import time
+
+        fixture = FIXTURES / "devcontainers" / "minimal-opencode"
+        shutil.copytree(fixture, tmp_path / "project", dirs_exist_ok=True)
+        project = tmp_path / "project"
+        subprocess.run(["git", "init", str(project)], check=True, capture_output=True)
+
+        session = ensure_container_running(project)
+        assert session.can_docker_exec
+
+        def best_of(argv, n=5):
+            best = float("inf")
+            for _ in range(n):
+                start = time.perf_counter()
+                result = subprocess.run(argv, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+                best = min(best, time.perf_counter() - start)
+                assert result.returncode == 0, result.stderr
+            return best, result.stdout
+
+        cli, cli_out = best_of(devcontainer_exec_args("pwd; echo $PATH; id -un", project))
+        fast, fast_out = best_of(container_exec_args("pwd; echo $PATH; id -un", project))
+        print(f"\nper-exec latency: devcontainer exec {cli * 1000:.0f}ms, docker exec {fast * 1000:.0f}ms")
+        # Same working directory, PATH and user either way.
+        assert fast_out == cli_out
+        assert fast < cli
+
     def test_test_command_runs_inside_container(self, tmp_path):
         """Shell test commands execute inside the container."""
         fixture = FIXTURES / "devcontainers" / "minimal-opencode"
@@ -137,6 +169,35 @@ class TestDevcontainerIntegration:
         assert result.returncode == 0
         assert result.stdout.strip().startswith("v")
 
+    def test_cached_image_keeps_feature_contributions(self, tmp_path):
+        """Starting from the prebuilt tag still applies what the config's features add."""
+        fixture = FIXTURES / "devcontainers" / "minimal-opencode"
+        shutil.copytree(fixture, tmp_path / "project", dirs_exist_ok=True)
+        project = tmp_path / "project"
+        subprocess.run(["git", "init", str(project)], check=True, capture_output=True)
+        feature = project / ".devcontainer" / "marker"
+        feature.mkdir()
+        (feature / "devcontainer-feature.json").write_text(json.dumps({
+            "id": "marker", "version": "1.0.0", "name": "marker",
+            "containerEnv": {"ARBORIST_FEATURE": "1"},
+            "postCreateCommand": "touch /tmp/feature-post-create",
+        }))
+        (feature / "install.sh").write_text("#!/bin/sh\ntouch /opt/feature-installed\n")
+        (feature / "install.sh").chmod(0o755)
+        config = json.loads((project / ".devcontainer" / "devcontainer.json").read_text())
+        config["features"] = {"./marker": {}}
+        (project / ".devcontainer" / "devcontainer.json").write_text(json.dumps(config))
+
+        tag = prebuild_image(project)
+        assert tag is not None
+        devcontainer_up(project, image=tag)
+        result = devcontainer_exec(
+            'test -f /opt/feature-installed && test -f /tmp/feature-post-create && echo "$ARBORIST_FEATURE"',
+            workspace_folder=project,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "1"
+
 
 @pytest.mark.container
 class TestDevcontainerTimeouts:
@@ -131,6 +131,23 @@ class TestGardenCommitHistory:
         report = json.loads(reports[0].read_text())
         assert report["task_id"] == "T001"
         assert report["result"] == "pass"
+        assert report["spec_id"] == "main"
+        assert (report["runner"], report["model"]) == ("mock", "mock-model")
+        assert "completed_at" in report
+
+    def test_report_recorded_in_store(self, git_repo, tmp_path):
+        from agent_arborist.reports import load_reports
+
+        tree = _small_tree()
+        runner = _MockRunner(implement_ok=True, review_ok=True)
+        report_dir = tmp_path / "reports"
+
+        garden_fn(tree, git_repo, runner, report_dir=report_dir, spec_id="main")
+
+        assert (git_repo / ".git" / "arborist" / "reports.sqlite").exists()
+        reports, summary = load_reports(report_dir, git_repo)
+        assert [r["task_id"] for r in reports] == ["T001"]
+        assert summary["passed"] == 1
 
     def test_stays_on_base_branch(self, git_repo):
         tree = _small_tree()
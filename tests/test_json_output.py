@@ -39,6 +39,26 @@ def test_status_json_output(git_repo, minimal_tree):
     assert "completed" in data
     assert "tasks" in data
     assert isinstance(data["completed"], list)
+    assert "prediction" not in data
+
+
+def test_status_json_output_with_estimate(git_repo, minimal_tree):
+    """status --estimate adds the makespan prediction."""
+    from agent_arborist.cli import main
+
+    runner = CliRunner()
+    tree_path = Path("task-tree.json")
+
+    with runner.isolated_filesystem(temp_dir=git_repo):
+        tree_path.write_text(json.dumps(minimal_tree))
+        result = runner.invoke(
+            main, ["status", "--tree", str(tree_path), "--format", "json", "--estimate", "--parallel", "2"],
+        )
+
+    assert result.exit_code == 0
+    data = json.loads(result.output)
+    assert data["prediction"]["workers"] == 2
+    assert "makespan_secs" in data["prediction"]
 
 
 def test_reports_json_output(git_repo):
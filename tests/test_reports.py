@@ -0,0 +1,139 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for reports.py."""
+
+import json
+
+from agent_arborist.reports import ReportStore, load_durations, load_reports, report_key_dir, store_path
+
+
+def _write(report_dir, name, **data):
+    report_dir.mkdir(parents=True, exist_ok=True)
+    (report_dir / name).write_text(json.dumps(data))
+
+
+def test_add_is_append_only():
+    store = ReportStore(":memory:")
+    assert store.add({"task_id": "T001", "result": "pass", "retries": 0}, dir="r", filename="a.json")
+    assert not store.add({"task_id": "T001", "result": "fail", "retries": 2}, dir="r", filename="a.json")
+    assert store.reports(dir="r") == [{"task_id": "T001", "result": "pass", "retries": 0}]
+
+
+def test_add_keeps_reports_without_task_or_result(caplog):
+    store = ReportStore(":memory:")
+    assert store.add({"task_id": "T001"}, dir="r", filename="a.json")
+    assert store.add({"result": "pass", "duration_secs": 5}, dir="r", filename="b.json")
+    assert "a.json has no task_id or pass/fail result" in caplog.text
+    assert store.reports(dir="r") == [{"task_id": "T001"}, {"result": "pass", "duration_secs": 5}]
+    assert store.summary(dir="r") == {
+        "total": 2, "passed": 1, "failed": 0, "avg_retries": 0.0, "avg_duration_secs": 5.0,
+    }
+    assert store.durations(dir="r") == {}
+
+
+def test_filename_filter_beyond_parameter_limit():
+    store = ReportStore(":memory:")
+    names = [f"T{i:05d}_run.json" for i in range(40_000)]
+    for name in names[:3]:
+        store.add({"task_id": name[:6], "result": "pass"}, dir="r", filename=name)
+    assert len(store.reports(dir="r", filenames=names[1:])) == 2
+    assert store.summary(dir="r", filenames=names[:1])["total"] == 1
+
+
+def test_store_rebuilt_on_schema_change(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "reports.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE reports (id INTEGER PRIMARY KEY, task_id TEXT NOT NULL)")
+        conn.execute("PRAGMA user_version = 1")
+    store = ReportStore(path)
+    assert store.add({"result": "fail"}, dir="r", filename="a.json")
+
+
+def test_import_dir_only_reads_new_files(tmp_path):
+    report_dir = tmp_path / "reports"
+    _write(report_dir, "T001_run_20260101T000000.json", task_id="T001", result="pass", retries=0)
+    _write(report_dir, "T002_run_20260101T000000.json", task_id="T002", result="fail", retries=2)
+    (report_dir / "broken.json").write_text("{")
+    store = ReportStore(tmp_path / "reports.sqlite")
+    assert store.import_dir(report_dir, dir="reports") == 2
+
+    # A known file is not reparsed even if it changed on disk.
+    _write(report_dir, "T001_run_20260101T000000.json", task_id="T001", result="fail", retries=9)
+    _write(report_dir, "T003_run_20260101T000000.json", task_id="T003", result="pass", retries=1)
+    assert store.import_dir(report_dir, dir="reports") == 1
+    assert [r["task_id"] for r in store.reports(dir="reports")] == ["T001", "T002", "T003"]
+    assert store.reports(dir="reports", task_id="T001")[0]["result"] == "pass"
+
+
+def test_summary_aggregates():
+    store = ReportStore(":memory:")
+    store.add({"task_id": "T001", "result": "pass", "retries": 0, "duration_secs": 10}, dir="r", filename="1.json")
+    store.add({"task_id": "T002", "result": "pass", "retries": 1, "duration_secs": 30}, dir="r", filename="2.json")
+    store.add({"task_id": "T003", "result": "fail", "retries": 2}, dir="r", filename="3.json")
+    store.add({"task_id": "T004", "result": "pass", "retries": 5}, dir="other", filename="4.json")
+    assert store.summary(dir="r") == {
+        "total": 3, "passed": 2, "failed": 1, "avg_retries": 1.0, "avg_duration_secs": 20.0,
+    }
+    assert store.summary(dir="r", task_id="T002")["avg_retries"] == 1.0
+
+
+def test_durations_latest_run_per_task(git_repo):
+    report_dir = git_repo / "spec" / "reports"
+    _write(report_dir, "T001_run_20260101T000000.json", task_id="T001", result="fail", duration_secs=90)
+    _write(report_dir, "T001_run_20260102T000000.json", task_id="T001", result="pass", duration_secs=45.5)
+    _write(report_dir, "T002_run_20260101T000000.json", task_id="T002", result="pass")
+    assert load_durations(report_dir, git_repo) == {"T001": 45.5}
+
+    (report_dir / "T001_run_20260102T000000.json").unlink()
+    assert load_durations(report_dir, git_repo) == {"T001": 90.0}
+
+
+def test_load_reports_uses_shared_store(git_repo):
+    report_dir = git_repo / "spec" / "reports"
+    _write(report_dir, "T001_run_20260101T000000.json", task_id="T001", result="pass", retries=1)
+    reports, summary = load_reports(report_dir, git_repo)
+    assert [r["task_id"] for r in reports] == ["T001"]
+    assert summary["total"] == 1
+    assert store_path(git_repo) == git_repo / ".git" / "arborist" / "reports.sqlite"
+    assert report_key_dir(report_dir, git_repo) == "spec/reports"
+
+
+def test_load_reports_only_returns_files_on_disk(git_repo, tmp_path):
+    """Deleted reports and reports from other worktrees' branches are not listed."""
+    from agent_arborist.git.repo import git_worktree_add
+
+    report_dir = git_repo / "spec" / "reports"
+    _write(report_dir, "T001_run_20260101T000000.json", task_id="T001", result="pass")
+    _write(report_dir, "T002_run_20260101T000000.json", task_id="T002", result="fail")
+    assert load_reports(report_dir, git_repo)[1]["total"] == 2
+
+    (report_dir / "T002_run_20260101T000000.json").unlink()
+    reports, summary = load_reports(report_dir, git_repo)
+    assert [r["task_id"] for r in reports] == ["T001"]
+    assert summary == {"total": 1, "passed": 1, "failed": 0, "avg_retries": 0.0}
+
+    # Same "spec/reports" key in a worktree on another branch, sharing the store
+    wt = tmp_path / "wt"
+    git_worktree_add(wt, git_repo)
+    other = wt / "spec" / "reports"
+    _write(other, "T009_run_20260101T000000.json", task_id="T009", result="pass")
+    assert [r["task_id"] for r in load_reports(other, wt)[0]] == ["T009"]
+    assert [r["task_id"] for r in load_reports(report_dir, git_repo)[0]] == ["T001"]
+
+
+def test_store_path_outside_git(tmp_path):
+    assert store_path(tmp_path) is None
@@ -0,0 +1,325 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for streamed runner execution."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from agent_arborist.runner import (
+    Runner,
+    RunResult,
+    _Tail,
+    _astream_command,
+    _execute_command,
+    _shell_command,
+    _stream_command,
+)
+
+
+def _py(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+class ScriptRunner(Runner):
+    """Runs a python snippet instead of an AI CLI."""
+
+    name = "script"
+    command = sys.executable
+
+    def __init__(self, code: str):
+        self.code = code
+
+    def build_command(self, prompt):
+        return _py(self.code)
+
+    def run(self, prompt, timeout=60, cwd=None, container_workspace=None,
+            container_up_timeout=None, container_check_timeout=None,
+            log_file=None, on_output=None):
+        return _execute_command(
+            _py(self.code), timeout, cwd, log_file=log_file, on_output=on_output,
+        )
+
+
+def test_tail_keeps_last_chars():
+    tail = _Tail(10)
+    for i in range(100):
+        tail.append(f"line{i}\n")
+    assert tail.text() == "line99\n"
+
+
+def test_stream_writes_log_and_returns_result(tmp_path):
+    log = tmp_path / "logs" / "T001_implement.log"
+    result = _execute_command(
+        _py("import sys; print('out1'); print('err1', file=sys.stderr); print('out2'); sys.exit(3)"),
+        timeout=30, log_file=log,
+    )
+    assert not result.success
+    assert result.exit_code == 3
+    assert result.output == "out1\nout2"
+    assert result.error == "err1"
+    lines = log.read_text().splitlines()
+    assert "out1" in lines and "out2" in lines
+    assert "[stderr] err1" in lines
+
+
+def test_stream_output_tail_is_bounded(tmp_path):
+    log = tmp_path / "big.log"
+    result = _stream_command(
+        _py("for i in range(20000): print('x' * 50, i)"),
+        timeout=30, log_file=log, tail_chars=1000,
+    )
+    assert result.success
+    assert len(result.output) <= 1000
+    assert result.output.endswith("19999")
+    assert log.read_text().count("\n") == 20000
+
+
+def test_stream_timeout_keeps_partial_log(tmp_path):
+    log = tmp_path / "slow.log"
+    result = _execute_command(
+        _py("import time; print('started', flush=True); time.sleep(30)"),
+        timeout=1, log_file=log,
+    )
+    assert not result.success
+    assert result.error == "Timeout after 1 seconds"
+    assert result.output == "started"
+    text = log.read_text()
+    assert "started" in text
+    assert "timed out" in text
+
+
+def test_stream_missing_binary_returns_error(tmp_path):
+    log = tmp_path / "x.log"
+    result = _execute_command(["/nonexistent/binary"], timeout=5, log_file=log)
+    assert not result.success
+    assert result.exit_code == -1
+    assert "/nonexistent/binary" in result.error
+    # No empty log is left behind, so the caller writes the error into it.
+    assert not log.exists()
+
+
+def test_stream_missing_binary_writes_error_to_step_log(tmp_path):
+    from agent_arborist.worker.garden import _new_log_path, _write_log
+
+    log = _new_log_path(tmp_path / "logs", "T001", "implement")
+    result = asyncio.run(_astream_command(["/nonexistent/binary"], 5, log_file=log))
+    assert not log.exists()
+    assert _write_log(tmp_path / "logs", "T001", "implement", result, log_file=log) == log
+    assert "/nonexistent/binary" in log.read_text()
+
+
+def test_on_output_callback_sees_lines_in_order():
+    seen = []
+    result = _execute_command(
+        _py("for i in range(5): print(i)"), timeout=30,
+        on_output=lambda stream, line: seen.append((stream, line)),
+    )
+    assert result.success
+    assert seen == [("stdout", str(i)) for i in range(5)]
+
+
+def test_on_output_callback_errors_do_not_stop_run():
+    def boom(stream, line):
+        raise RuntimeError("callback failed")
+
+    result = _execute_command(_py("print('a'); print('b')"), timeout=30, on_output=boom)
+    assert result.success
+    assert result.output == "a\nb"
+
+
+def test_runner_stream_iterates_lines_then_result():
+    runner = ScriptRunner("import time\nfor i in range(3):\n    print(i, flush=True)\n    time.sleep(0.05)")
+    stream = runner.stream("ignored", timeout=30)
+    lines = [line for _, line in stream]
+    assert lines == ["0", "1", "2"]
+    assert isinstance(stream.result, RunResult)
+    assert stream.result.success
+    assert stream.result.output == "0\n1\n2"
+
+
+def test_runner_stream_early_break_does_not_hang():
+    runner = ScriptRunner("for i in range(10000): print(i)")
+    stream = runner.stream("ignored", timeout=30)
+    for _, line in stream:
+        break
+    stream._thread.join(timeout=10)
+    assert not stream._thread.is_alive()
+    assert stream.result.success
+
+
+# --- asyncio API ---
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Reaped zombies can't be signalled; unreaped ones show as 'Z'.
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != "Z"
+    except OSError:
+        return True
+
+
+def _wait_dead(pid: int, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not _pid_alive(pid):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+# Parent prints its child's pid, then both sleep.
+_SPAWNS_CHILD = (
+    "import subprocess, sys, time\n"
+    "c = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+    "print(c.pid, flush=True)\n"
+    "time.sleep(60)\n"
+)
+
+
+def test_arun_streams_and_returns_result(tmp_path):
+    runner = ScriptRunner("import sys; print('a'); print('oops', file=sys.stderr); print('b')")
+    seen = []
+    log = tmp_path / "arun.log"
+    result = asyncio.run(runner.arun(
+        "ignored", timeout=30, log_file=log,
+        on_output=lambda stream, line: seen.append((stream, line)),
+    ))
+    assert result.success
+    assert result.output == "a\nb"
+    assert ("stdout", "a") in seen and ("stderr", "oops") in seen
+    assert "[stderr] oops" in log.read_text()
+
+
+def test_arun_falls_back_to_run_in_thread():
+    class RunOnly(Runner):
+        name = "run-only"
+        command = "true"
+
+        def run(self, prompt, **kwargs):
+            return RunResult(success=True, output=f"ran {prompt}")
+
+    result = asyncio.run(RunOnly().arun("x", timeout=5))
+    assert result.output == "ran x"
+
+
+def test_arun_fallback_skips_output_kwargs_run_does_not_take():
+    class Legacy(Runner):
+        name = "legacy"
+        command = "true"
+
+        def run(self, prompt, timeout=600, cwd=None, container_workspace=None,
+                container_up_timeout=None, container_check_timeout=None):
+            return RunResult(success=True, output=f"ran {prompt}")
+
+    result = asyncio.run(Legacy().arun("x", timeout=5, log_file=None, on_output=print))
+    assert result.output == "ran x"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+def test_stream_timeout_kills_process_group():
+    lines = []
+    result = _stream_command(
+        _py(_SPAWNS_CHILD), timeout=1, on_output=lambda stream, line: lines.append(line),
+    )
+    assert not result.success
+    assert result.error == "Timeout after 1 seconds"
+    assert _wait_dead(int(lines[0]))
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+def test_arun_timeout_kills_process_group():
+    runner = ScriptRunner(_SPAWNS_CHILD)
+    lines = []
+    result = asyncio.run(runner.arun(
+        "ignored", timeout=1, on_output=lambda stream, line: lines.append(line),
+    ))
+    assert not result.success
+    assert result.error == "Timeout after 1 seconds"
+    assert _wait_dead(int(lines[0]))
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+def test_arun_cancel_kills_process_group():
+    runner = ScriptRunner(_SPAWNS_CHILD)
+    lines = []
+
+    async def main():
+        task = asyncio.create_task(runner.arun(
+            "ignored", timeout=60, on_output=lambda stream, line: lines.append(line),
+        ))
+        while not lines:
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(main(), 30))
+    assert _wait_dead(int(lines[0]))
+
+
+def test_arun_concurrent_sessions_overlap():
+    runner = ScriptRunner("import time; time.sleep(0.5); print('done')")
+
+    async def main():
+        return await asyncio.gather(*(runner.arun("x", timeout=30) for _ in range(4)))
+
+    start = time.monotonic()
+    results = asyncio.run(main())
+    assert all(r.success for r in results)
+    assert time.monotonic() - start < 1.5
+
+
+def test_arun_closes_transport():
+    import gc
+    import warnings
+
+    runner = ScriptRunner("print('done')")
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = asyncio.run(runner.arun("x", timeout=30))
+        gc.collect()
+    assert result.success
+    assert not [w for w in caught if "unclosed transport" in str(w.message)]
+
+
+def test_shell_command_matches_stream_command_result(tmp_path):
+    from agent_arborist.container_shell import AGENT_SCRIPT, ContainerShell
+
+    shell = ContainerShell(["sh", "-c", AGENT_SCRIPT], lambda cmd: ["sh", "-c", cmd])
+    assert shell.start(timeout=10)
+    try:
+        log_file = tmp_path / "run.log"
+        result = _shell_command(shell, ["sh", "-c", "echo hi; echo oops >&2; exit 2"], 10, log_file=log_file)
+        assert not result.success
+        assert result.exit_code == 2
+        assert result.output == "hi"
+        assert result.error == "oops"
+        assert "[stderr] oops" in log_file.read_text()
+
+        result = _shell_command(shell, ["sleep", "30"], 1)
+        assert result.exit_code == -1
+        assert result.error == "Timeout after 1 seconds"
+    finally:
+        shell.close()
+    assert _shell_command(shell, ["true"], 10) is None
@@ -15,6 +15,10 @@
 """Tests for tree/model.py."""
 
 import json
+import random
+import time
+
+import pytest
 
 from agent_arborist.tree.model import TaskNode, TaskTree, TestCommand, TestType
 
@@ -305,3 +309,96 @@ def test_from_dict_missing_test_commands_defaults_empty():
     }
     tree = TaskTree.from_dict(data)
     assert tree.nodes["T001"].test_commands == []
+
+
+def _reference_sort_key(tree, node_id):
+    """The original uncached walk, kept to check the indexed version against."""
+    path = [node_id]
+    nid = node_id
+    while tree.nodes[nid].parent is not None:
+        nid = tree.nodes[nid].parent
+        path.append(nid)
+    path.reverse()
+    root_ids = [n for n, node in tree.nodes.items() if node.parent is None]
+    key = [root_ids.index(path[0])]
+    for i in range(1, len(path)):
+        children = tree.nodes[path[i - 1]].children
+        key.append(children.index(path[i]) if path[i] in children else 0)
+    return tuple(key)
+
+
+def _generated_tree(n_leaves, *, fanout=10, seed=0):
+    """Milestones -> groups -> leaves, with random backward leaf deps."""
+    rng = random.Random(seed)
+    tree = TaskTree()
+    leaf_ids = []
+    n_groups = max(1, n_leaves // fanout)
+    for g in range(n_groups):
+        mid = f"M{g // fanout}"
+        if mid not in tree.nodes:
+            tree.nodes[mid] = TaskNode(id=mid, name=mid)
+        gid = f"G{g}"
+        tree.nodes[gid] = TaskNode(id=gid, name=gid, parent=mid)
+        tree.nodes[mid].children.append(gid)
+        for _ in range(fanout):
+            tid = f"T{len(leaf_ids):05d}"
+            deps = rng.sample(leaf_ids, min(2, len(leaf_ids))) if leaf_ids else []
+            tree.nodes[tid] = TaskNode(id=tid, name=tid, parent=gid, depends_on=deps)
+            tree.nodes[gid].children.append(tid)
+            leaf_ids.append(tid)
+    return tree
+
+
+def test_structural_key_matches_reference_walk():
+    tree = _generated_tree(300, fanout=4, seed=3)
+    # Shuffle insertion order so root and sibling ordinals aren't trivial.
+    items = list(tree.nodes.items())
+    random.Random(1).shuffle(items)
+    tree.nodes = dict(items)
+    key = tree.structural_key()
+    for nid in tree.nodes:
+        assert key(nid) == _reference_sort_key(tree, nid)
+
+
+def test_add_node_attaches_to_parent():
+    tree = _deep_tree()
+    assert tree.compute_execution_order() == ["T001", "T003", "T002"]
+
+    tree.add_node(TaskNode(id="T004", name="Sub", parent="T003"))
+    assert tree.nodes["T003"].children == ["T004"]
+    assert "T003" not in {n.id for n in tree.leaves()}
+    assert tree.compute_execution_order() == ["T001", "T004", "T002"]
+
+
+def test_execution_order_follows_in_place_edits():
+    """Nothing is cached between calls, so direct edits to nodes are always seen."""
+    tree = _deep_tree()
+    assert tree.compute_execution_order() == ["T001", "T003", "T002"]
+
+    tree.nodes["T000"] = TaskNode(id="T000", name="First", parent="phase1")
+    tree.nodes["phase1"].children.insert(0, "T000")
+    assert tree.compute_execution_order() == ["T000", "T001", "T003", "T002"]
+
+    tree.nodes["phase1"].children = ["T003", "group1", "T000"]
+    assert tree.structural_key()("T000") == (0, 2)
+    assert tree.compute_execution_order() == ["T003", "T001", "T000", "T002"]
+
+    tree.nodes["T000"].parent = None
+    assert tree.root_ids == ["phase1", "T000"]
+    assert tree.root_phase("T000") == "T000"
+    del tree.nodes["T000"]
+    tree.nodes["phase1"].children.remove("T000")
+    assert {n.id for n in tree.leaves()} == {"T001", "T002", "T003"}
+
+
+@pytest.mark.slow
+def test_execution_order_10k_leaves_is_fast():
+    """Benchmark: ordering a generated 10k-leaf tree takes milliseconds."""
+    tree = _generated_tree(10_000)
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        order = tree.compute_execution_order()
+        best = min(best, time.perf_counter() - start)
+    assert len(order) == 10_000
+    assert best < 0.5, f"ordering took {best:.3f}s"
@@ -0,0 +1,145 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for tree/schedule.py."""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+from agent_arborist.tree.model import TaskNode, TaskTree
+from agent_arborist.tree.schedule import (
+    critical_path_priority,
+    downstream_lengths,
+    get_policy,
+    load_task_durations,
+    predict_makespan,
+    structural_priority,
+)
+
+
+def _make_tree():
+    """phase1 -> A, B1, B2, B3 with B1 -> B2 -> B3 a chain; A independent."""
+    tree = TaskTree()
+    tree.nodes["phase1"] = TaskNode(id="phase1", name="P", children=["A", "B1", "B2", "B3"])
+    tree.nodes["A"] = TaskNode(id="A", name="A", parent="phase1")
+    tree.nodes["B1"] = TaskNode(id="B1", name="B1", parent="phase1")
+    tree.nodes["B2"] = TaskNode(id="B2", name="B2", parent="phase1", depends_on=["B1"])
+    tree.nodes["B3"] = TaskNode(id="B3", name="B3", parent="phase1", depends_on=["B2"])
+    return tree
+
+
+def test_priority_none_keeps_structural_order():
+    tree = _make_tree()
+    assert tree.compute_execution_order() == ["A", "B1", "B2", "B3"]
+    assert tree.compute_execution_order(structural_priority(tree)) == ["A", "B1", "B2", "B3"]
+
+
+def test_critical_path_runs_long_chain_first():
+    tree = _make_tree()
+    durations = {"A": 10, "B1": 10, "B2": 10, "B3": 10}
+    assert tree.compute_execution_order(critical_path_priority(tree, durations)) == ["B1", "B2", "A", "B3"]
+
+
+def test_critical_path_weights_by_duration():
+    tree = _make_tree()
+    durations = {"A": 100, "B1": 10, "B2": 10, "B3": 10}
+    order = tree.compute_execution_order(critical_path_priority(tree, durations))
+    assert order[0] == "A"
+
+
+def test_downstream_lengths_fill_unknown_with_median():
+    tree = _make_tree()
+    lengths = downstream_lengths(tree, {"A": 4, "B1": 2})
+    # Median of known durations is 3 for B2 and B3.
+    assert lengths == {"A": 4, "B1": 8, "B2": 6, "B3": 3}
+
+
+def test_predict_makespan_parallel_and_serial():
+    tree = _make_tree()
+    durations = {"A": 10, "B1": 10, "B2": 10, "B3": 10}
+    serial = predict_makespan(tree, durations, workers=1)
+    assert serial.makespan == 40
+    parallel = predict_makespan(tree, durations, workers=2)
+    assert parallel.makespan == 30
+    assert parallel.critical_path == ["B1", "B2", "B3"]
+    assert parallel.critical_path_secs == 30
+    assert parallel.estimated == []
+
+
+def test_predict_makespan_skips_completed():
+    tree = _make_tree()
+    estimate = predict_makespan(tree, {"B3": 5}, workers=2, completed={"A", "B1", "B2"})
+    assert estimate.remaining == 1
+    assert estimate.makespan == 5
+    assert estimate.critical_path == ["B3"]
+
+
+def test_predict_makespan_nothing_left():
+    tree = _make_tree()
+    estimate = predict_makespan(tree, {}, completed={"A", "B1", "B2", "B3"})
+    assert estimate.makespan == 0
+    assert estimate.critical_path == []
+
+
+def test_get_policy_unknown():
+    with pytest.raises(ValueError, match="Unknown schedule policy"):
+        get_policy("random")
+
+
+def _commit(repo, subject, when):
+    env = {"GIT_COMMITTER_DATE": f"{when} +0000", "GIT_AUTHOR_DATE": f"{when} +0000"}
+    subprocess.run(
+        ["git", "commit", "--allow-empty", "-m", subject], cwd=repo, check=True,
+        capture_output=True, env={**os.environ, **env},
+    )
+
+
+def test_load_task_durations_from_git_and_reports(git_repo, tmp_path):
+    _commit(git_repo, "task(main@@run-start): run started", 1_700_000_000)
+    _commit(git_repo, "task(main@T001@implement-pass): implement", 1_700_000_100)
+    _commit(git_repo, "task(main@T001@complete): complete", 1_700_000_130)
+    _commit(git_repo, "task(main@T002@implement-pass): implement", 1_700_000_200)
+    _commit(git_repo, "task(main@T002@complete): complete", 1_700_000_260)
+    _commit(git_repo, "task(other@T003@complete): complete", 1_700_000_300)
+
+    assert load_task_durations(git_repo, spec_id="main") == {"T001": 130.0, "T002": 130.0}
+
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "T002_run_20260101T000000.json").write_text(
+        json.dumps({"task_id": "T002", "result": "pass", "duration_secs": 40}))
+    (reports / "T002_run_20260102T000000.json").write_text(
+        json.dumps({"task_id": "T002", "result": "pass", "duration_secs": 55.5}))
+    (reports / "T001_run_20260101T000000.json").write_text(
+        json.dumps({"task_id": "T001", "result": "pass", "retries": 0}))
+    durations = load_task_durations(git_repo, spec_id="main", report_dir=reports)
+    assert durations == {"T001": 130.0, "T002": 55.5}
+
+    # Without the git history, only durations from the report store remain.
+    assert load_task_durations(git_repo, spec_id="main", report_dir=reports, git_history=False) == {"T002": 55.5}
+
+
+def test_task_durations_restart_after_failed_run(git_repo):
+    _commit(git_repo, "task(main@@run-start): run started", 1_700_000_000)
+    _commit(git_repo, "task(main@T001@implement-pass): implement", 1_700_000_100)
+    _commit(git_repo, "task(main@T001@failed): failed after 3 retries", 1_700_000_200)
+    _commit(git_repo, "task(main@T002@complete): complete", 1_700_050_000)
+    _commit(git_repo, "task(main@T001@implement-pass): implement", 1_700_050_100)
+    _commit(git_repo, "task(main@T001@complete): complete", 1_700_050_160)
+
+    # Timed from the commit the re-run was built on, not the failed run's start.
+    assert load_task_durations(git_repo, spec_id="main")["T001"] == 160.0
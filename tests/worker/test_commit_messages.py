@@ -97,6 +97,38 @@ def test_build_commit_message_without_body(git_repo):
     assert "\n\n\n" not in msg  # no triple newline from empty body
 
 
+def _git(args, cwd):
+    return subprocess.run(
+        ["git"] + args, cwd=cwd, capture_output=True, text=True, check=True,
+    ).stdout
+
+
+def test_step_commit_spawns_add_and_commit_only(git_repo, monkeypatch):
+    """A step commit forks ``add -A`` and ``commit``; HEAD comes from the batch process."""
+    import agent_arborist.git.repo as repo_mod
+    from agent_arborist.git.batch import get_batch
+
+    get_batch(git_repo).resolve("HEAD")  # batch process already running
+    spawned = []
+    real_run = subprocess.run
+
+    def counting_run(args, *a, **kw):
+        spawned.append(args[1])
+        return real_run(args, *a, **kw)
+
+    monkeypatch.setattr(repo_mod.subprocess, "run", counting_run)
+    (git_repo / "T001_test.log").write_text("ok\n")
+    sha = _commit_with_trailers(
+        "T001", "tests pass", git_repo,
+        spec_id="main", status="test-pass",
+        **{"Arborist-Step": "test"},
+    )
+    assert spawned == ["add", "commit"]
+    assert _git(["rev-parse", "HEAD"], git_repo).strip() == sha
+    files = _git(["show", "--name-only", "--format=", sha], git_repo).split()
+    assert files == ["T001_test.log"]
+
+
 # ── Integration tests ──
 
 
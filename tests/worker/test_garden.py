@@ -14,12 +14,17 @@
 
 """Tests for worker/garden.py."""
 
+import asyncio
+import time
+
+import pytest
+
 from agent_arborist.git.repo import git_current_branch, git_log
 from agent_arborist.git.state import is_task_complete
 from agent_arborist.tree.model import TaskNode, TaskTree, TestCommand, TestType
 from agent_arborist.worker.garden import (
-    garden, find_next_task, GardenResult,
-    _run_tests, _parse_test_counts,
+    agarden, garden, find_next_task, GardenResult,
+    _arun_tests, _run_tests, _parse_test_counts, _test_commands, _test_stages,
 )
 
 
@@ -171,6 +176,55 @@ def test_review_log_trailer_in_commit(git_repo, tmp_path):
     )
 
 
+def test_streamed_runner_log_is_kept(git_repo, tmp_path):
+    """A runner that streams into log_file owns that file; garden doesn't overwrite it."""
+    from agent_arborist.runner import RunResult
+
+    class StreamingRunner:
+        name = "streaming"
+        model = "mock"
+
+        def __init__(self):
+            self.log_files = []
+
+        def run(self, prompt, log_file=None, **kwargs):
+            self.log_files.append(log_file)
+            if log_file is not None:
+                log_file.write_text("streamed line 1\nstreamed line 2\n")
+            output = "APPROVED" if "Review" in prompt else "Implementation complete"
+            return RunResult(success=True, output=output)
+
+    tree = _make_tree()
+    log_dir = tmp_path / "logs"
+    runner = StreamingRunner()
+    result = garden(tree, git_repo, runner, max_retries=3, log_dir=log_dir, spec_id="main")
+    assert result.success
+
+    assert len(runner.log_files) == 2
+    assert all(f is not None and f.parent == log_dir for f in runner.log_files)
+    for f in runner.log_files:
+        assert f.read_text() == "streamed line 1\nstreamed line 2\n"
+
+
+def test_runner_without_log_file_param_still_gardens(git_repo, tmp_path):
+    """A runner whose run() predates log_file gets its output logged afterwards."""
+    from agent_arborist.runner import RunResult
+
+    class LegacyRunner:
+        name = "legacy"
+        model = "mock"
+
+        def run(self, prompt, timeout=600, cwd=None, container_workspace=None,
+                container_up_timeout=None, container_check_timeout=None):
+            output = "APPROVED" if "Review" in prompt else "Implementation complete"
+            return RunResult(success=True, output=output)
+
+    log_dir = tmp_path / "logs"
+    result = garden(_make_tree(), git_repo, LegacyRunner(), log_dir=log_dir, spec_id="main")
+    assert result.success
+    assert any("Implementation complete" in f.read_text() for f in log_dir.glob("T001_implement_*"))
+
+
 def test_test_log_trailer_in_commit(git_repo, tmp_path):
     """Test-fail commit should include Arborist-Test-Log trailer with log file path."""
     from tests.conftest import TrackingRunner
@@ -195,6 +249,46 @@ def test_test_log_trailer_in_commit(git_repo, tmp_path):
     )
 
 
+def test_passing_test_log_is_kept(git_repo, tmp_path):
+    """A passing test step streams its output to a log linked from the commit."""
+    from tests.conftest import TrackingRunner
+
+    tree = _make_tree()
+    log_dir = tmp_path / "logs"
+    result = garden(
+        tree, git_repo, TrackingRunner(), test_command="echo '2 passed in 0.1s'",
+        log_dir=log_dir, spec_id="main",
+    )
+    assert result.success
+
+    body = git_log("HEAD", "%B", git_repo, n=10, grep="tests pass")
+    assert "Arborist-Test-Log:" in body
+    logs = sorted(log_dir.glob("T001_test_*.log"))
+    assert len(logs) == 1
+    text = logs[0].read_text()
+    assert "[unit] 2 passed in 0.1s" in text
+    assert "=== unit exited 0" in text
+
+
+def test_compressed_test_log(git_repo, tmp_path):
+    """With test_compress_logs the attempt's log is gzipped before it is linked."""
+    import gzip
+    from tests.conftest import TrackingRunner
+
+    tree = _make_tree()
+    log_dir = tmp_path / "logs"
+    result = garden(
+        tree, git_repo, TrackingRunner(), test_command="echo streamed",
+        log_dir=log_dir, spec_id="main", test_compress_logs=True,
+    )
+    assert result.success
+
+    assert not list(log_dir.glob("T001_test_*.log"))
+    (gz,) = log_dir.glob("T001_test_*.log.gz")
+    assert "[unit] streamed" in gzip.decompress(gz.read_bytes()).decode()
+    assert f"Arborist-Test-Log: {gz}" in git_log("HEAD", "%B", git_repo, n=10, grep="tests pass")
+
+
 def test_review_body_contains_output(git_repo, tmp_path):
     """Review commit body should contain the actual review output, not be empty."""
     from tests.conftest import TrackingRunner
@@ -370,9 +464,83 @@ def test_parse_auto_detect():
     assert counts["passed"] == 3
 
 
+def test_run_tests_keeps_tail_and_streams_log(git_repo, tmp_path):
+    """Output past the tail limit is only on disk; counts still come from the end."""
+    from agent_arborist.worker.test_output import TAIL_CHARS
+
+    node = TaskNode(id="T001", name="Test")
+    log_file = tmp_path / "T001_test.log"
+    cmd = f"yes x | head -n {TAIL_CHARS}; echo '4 passed in 0.2s'"
+    (result,) = _run_tests(node, git_repo, cmd, None, log_file=log_file)
+    assert result.passed
+    assert len(result.stdout) <= TAIL_CHARS
+    assert result.stdout.rstrip().endswith("4 passed in 0.2s")
+    assert result.counts == {"passed": 4, "failed": 0, "skipped": 0}
+    assert log_file.stat().st_size > 2 * TAIL_CHARS
+
+
+def test_arun_tests_streams_log(git_repo, tmp_path):
+    node = TaskNode(
+        id="T001", name="Test",
+        test_commands=[
+            TestCommand(type=TestType.UNIT, command="echo unit-out; echo unit-err >&2"),
+            TestCommand(type=TestType.INTEGRATION, command="echo integration-out"),
+        ],
+    )
+    log_file = tmp_path / "T001_test.log"
+    results = asyncio.run(_arun_tests(node, git_repo, "false", None, parallel=2, log_file=log_file))
+    assert all(r.passed for r in results)
+    text = log_file.read_text()
+    assert "[unit] unit-out" in text
+    assert "[unit:stderr] unit-err" in text
+    assert "[integration] integration-out" in text
+
+
 # --- Per-node test commands tests ---
 
 
+def test_run_tests_through_container_shell(git_repo, monkeypatch):
+    """In a container with a shell agent, test commands run there instead of an exec."""
+    from agent_arborist import devcontainer
+    from agent_arborist.container_shell import AGENT_SCRIPT, ContainerShell
+
+    shell = ContainerShell(["sh", "-c", AGENT_SCRIPT], lambda cmd: ["sh", "-c", cmd])
+    assert shell.start(timeout=10)
+    monkeypatch.setattr(devcontainer, "ensure_container_running", lambda *a, **k: None)
+    monkeypatch.setattr(devcontainer, "container_shell", lambda ws: shell)
+    monkeypatch.setattr(devcontainer, "container_exec_args", lambda cmd, ws: ["false"])
+    expired = []
+    monkeypatch.setattr(devcontainer, "container_exec_failed", expired.append)
+    node = TaskNode(id="T001", name="Test")
+    try:
+        (result,) = _run_tests(node, git_repo, "echo '2 passed in 0.1s'", None, container_workspace=git_repo)
+        assert result.passed
+        assert result.counts == {"passed": 2, "failed": 0, "skipped": 0}
+        (result,) = asyncio.run(_arun_tests(node, git_repo, "exit 4", None, container_workspace=git_repo))
+        assert not result.passed
+        assert expired == []
+    finally:
+        shell.close()
+
+
+def test_run_tests_expires_container_only_on_exec_failure(git_repo, monkeypatch):
+    """A red suite keeps the container session; docker's own exit codes expire it."""
+    from agent_arborist import devcontainer
+
+    monkeypatch.setattr(devcontainer, "ensure_container_running", lambda *a, **k: None)
+    monkeypatch.setattr(devcontainer, "container_shell", lambda ws: None)
+    monkeypatch.setattr(devcontainer, "container_exec_args", lambda cmd, ws: ["sh", "-c", cmd])
+    expired = []
+    monkeypatch.setattr(devcontainer, "container_exec_failed", expired.append)
+    node = TaskNode(id="T001", name="Test")
+    (result,) = _run_tests(node, git_repo, "exit 1", None, container_workspace=git_repo)
+    assert not result.passed
+    assert expired == []
+    (result,) = _run_tests(node, git_repo, "exit 125", None, container_workspace=git_repo)
+    assert not result.passed
+    assert expired == [git_repo]
+
+
 def test_run_tests_uses_node_commands(git_repo):
     node = TaskNode(
         id="T001", name="Test",
@@ -411,6 +579,121 @@ def test_run_tests_config_timeout_used(git_repo):
     assert results[0].passed is False
 
 
+def _barrier_node(log):
+    return TaskNode(
+        id="T001", name="Test",
+        test_commands=[
+            TestCommand(type=TestType.SETUP, command=f"echo setup >> {log}"),
+            TestCommand(type=TestType.UNIT, command=f"sleep 0.5; echo unit >> {log}"),
+            TestCommand(type=TestType.INTEGRATION, command=f"sleep 0.5; echo integration >> {log}"),
+            TestCommand(type=TestType.TEARDOWN, command=f"echo teardown >> {log}"),
+        ],
+    )
+
+
+def test_test_stages_split_at_barriers():
+    node = TaskNode(id="T001", name="Test", test_commands=[
+        TestCommand(type=TestType.SETUP, command="a"),
+        TestCommand(type=TestType.SETUP, command="b"),
+        TestCommand(type=TestType.UNIT, command="c"),
+        TestCommand(type=TestType.E2E, command="d"),
+        TestCommand(type=TestType.TEARDOWN, command="e"),
+        TestCommand(type=TestType.UNIT, command="f"),
+    ])
+    assert _test_stages(_test_commands(node, "true", None)) == [[0], [1], [2, 3], [4], [5]]
+
+
+def test_run_tests_parallel_overlaps_independent_suites(git_repo, tmp_path):
+    log = tmp_path / "order.log"
+    start = time.monotonic()
+    results = _run_tests(_barrier_node(log), git_repo, "true", None, parallel=4)
+    assert time.monotonic() - start < 0.95
+    assert [r.test_type for r in results] == ["setup", "unit", "integration", "teardown"]
+    assert all(r.passed for r in results)
+    lines = log.read_text().split()
+    assert lines[0] == "setup" and lines[-1] == "teardown"
+
+
+def test_run_tests_serial_by_default(git_repo, tmp_path):
+    start = time.monotonic()
+    _run_tests(_barrier_node(tmp_path / "order.log"), git_repo, "true", None)
+    assert time.monotonic() - start >= 1.0
+
+
+def test_arun_tests_parallel_overlaps_independent_suites(git_repo, tmp_path):
+    log = tmp_path / "order.log"
+    start = time.monotonic()
+    results = asyncio.run(_arun_tests(_barrier_node(log), git_repo, "true", None, parallel=2))
+    assert time.monotonic() - start < 0.95
+    assert [r.test_type for r in results] == ["setup", "unit", "integration", "teardown"]
+    lines = log.read_text().split()
+    assert lines[0] == "setup" and lines[-1] == "teardown"
+
+
+def _failing_node(tmp_path, slow="echo ran >> {runs}"):
+    runs = tmp_path / "runs"
+    return TaskNode(
+        id="T001", name="Test",
+        test_commands=[
+            TestCommand(type=TestType.UNIT, command="exit 1"),
+            TestCommand(type=TestType.INTEGRATION, command=slow.format(runs=runs)),
+            TestCommand(type=TestType.TEARDOWN, command=f"echo teardown >> {runs}"),
+        ],
+    ), runs
+
+
+def test_run_tests_fail_fast_skips_rest_but_tears_down(git_repo, tmp_path):
+    node, runs = _failing_node(tmp_path)
+    results = _run_tests(node, git_repo, "true", None, fail_fast=True)
+    assert [(r.test_type, r.passed, r.skipped) for r in results] == [
+        ("unit", False, False), ("integration", False, True), ("teardown", True, False),
+    ]
+    assert runs.read_text().split() == ["teardown"]
+
+
+def test_run_tests_without_fail_fast_runs_everything(git_repo, tmp_path):
+    node, runs = _failing_node(tmp_path)
+    results = _run_tests(node, git_repo, "true", None)
+    assert not any(r.skipped for r in results)
+    assert runs.read_text().split() == ["ran", "teardown"]
+
+
+def test_run_tests_fail_fast_kills_running_suite(git_repo, tmp_path):
+    node, runs = _failing_node(tmp_path, slow="sleep 5; echo ran >> {runs}")
+    start = time.monotonic()
+    results = _run_tests(node, git_repo, "true", None, parallel=2, fail_fast=True)
+    assert time.monotonic() - start < 3
+    assert results[1].skipped
+    assert runs.read_text().split() == ["teardown"]
+
+
+def test_arun_tests_fail_fast_kills_running_suite(git_repo, tmp_path):
+    node, runs = _failing_node(tmp_path, slow="sleep 5; echo ran >> {runs}")
+    start = time.monotonic()
+    results = asyncio.run(_arun_tests(node, git_repo, "true", None, parallel=2, fail_fast=True))
+    assert time.monotonic() - start < 3
+    assert [r.skipped for r in results] == [False, True, False]
+    assert runs.read_text().split() == ["teardown"]
+
+
+def test_garden_fail_fast_records_skipped_suites(git_repo, tmp_path, mock_runner_all_pass):
+    node, runs = _failing_node(tmp_path)
+    tree = TaskTree()
+    tree.nodes["phase1"] = TaskNode(id="phase1", name="Phase 1", children=["T001"])
+    node.parent = "phase1"
+    tree.nodes["T001"] = node
+    tree.compute_execution_order()
+    result = garden(tree, git_repo, mock_runner_all_pass, max_retries=2, spec_id="main", test_fail_fast=True)
+    assert not result.success
+
+    last, first = [b for b in git_log("HEAD", "%B%x00", git_repo, n=20, grep="tests fail").split("\0") if b.strip()]
+    assert "Arborist-Test-Skipped-Suites: integration" in first
+    assert "Not run after a failure (fail-fast): integration" in first
+    # The final attempt has no retry left, so it runs every suite.
+    assert "Arborist-Test-Skipped-Suites" not in last
+    assert runs.read_text().split() == ["teardown", "ran", "teardown"]
+
+
 def test_trailers_include_test_metadata(git_repo, mock_runner_all_pass):
     tree = _make_tree()
     tree.nodes["T001"].test_commands = [
@@ -423,3 +706,157 @@ def test_trailers_include_test_metadata(git_repo, mock_runner_all_pass):
     assert "Arborist-Test-Type: unit" in log_output
     assert "Arborist-Test-Passed: 5" in log_output
     assert "Arborist-Test-Runtime:" in log_output
+
+
+# --- asyncio pipeline ---
+
+
+def test_agarden_matches_garden_commits(git_repo, mock_runner_all_pass):
+    tree = _make_tree()
+    tree.nodes["T001"].test_commands = [
+        TestCommand(type=TestType.UNIT, command="echo '5 passed in 0.3s'", framework="pytest"),
+    ]
+    result = asyncio.run(agarden(tree, git_repo, mock_runner_all_pass, spec_id="main"))
+    assert result.success
+    assert result.task_id == "T001"
+    assert is_task_complete("T001", git_repo, spec_id="main")
+
+    subjects = git_log("HEAD", "%s", git_repo, n=3).split("\n")
+    assert subjects == [
+        'task(main@T001@complete): complete "Create files"',
+        'task(main@T001@review-approved): review approved for "Create files"',
+        'task(main@T001@test-pass): tests pass for "Create files"',
+    ]
+    assert "Arborist-Test-Passed: 5" in git_log("HEAD", "%B", git_repo, n=5, grep="tests pass")
+
+
+def test_agarden_retries_on_test_failure(git_repo, mock_runner_all_pass):
+    tree = _make_tree()
+    counter = git_repo / ".counter"
+    counter.write_text("0")
+    cmd = f'c=$(cat {counter}); echo $((c+1)) > {counter}; [ "$c" -gt "0" ]'
+    result = asyncio.run(agarden(tree, git_repo, mock_runner_all_pass, test_command=cmd, spec_id="main"))
+    assert result.success
+    assert "tests fail" in git_log("HEAD", "%s", git_repo, n=10)
+
+
+def test_arun_tests_timeout(git_repo):
+    node = TaskNode(
+        id="T001", name="Test",
+        test_commands=[TestCommand(type=TestType.UNIT, command="sleep 10", timeout=1)],
+    )
+    results = asyncio.run(_arun_tests(node, git_repo, "true", None))
+    assert results[0].passed is False
+    assert "timed out" in results[0].stderr
+
+
+def test_agarden_cancel_kills_running_tests(git_repo, mock_runner_all_pass):
+    """Cancelling agarden mid-test kills the test command; prior commits remain."""
+    tree = _make_tree()
+    marker = git_repo / "test-finished"
+    cmd = f"sleep 3 && touch {marker}"
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                agarden(tree, git_repo, mock_runner_all_pass, test_command=cmd, spec_id="main"),
+                timeout=1,
+            )
+
+    asyncio.run(main())
+    time.sleep(3)
+    assert not marker.exists()
+    assert "implement-pass" in git_log("HEAD", "%s", git_repo, n=1)
+    assert not is_task_complete("T001", git_repo, spec_id="main")
+
+
+# --- pipelined test/review ---
+
+
+class _TimedRunner:
+    """Implements instantly; reviews take review_secs and return a fixed verdict."""
+
+    name = "timed"
+    model = "mock"
+
+    def __init__(self, review_secs=0.0, verdicts=("APPROVED",)):
+        self.review_secs = review_secs
+        self.verdicts = list(verdicts)
+        self.review_prompts = []
+
+    def run(self, prompt, **kwargs):
+        from agent_arborist.runner import RunResult
+        if prompt.startswith("Review"):
+            self.review_prompts.append(prompt)
+            time.sleep(self.review_secs)
+            verdict = self.verdicts[min(len(self.review_prompts), len(self.verdicts)) - 1]
+            return RunResult(success=verdict == "APPROVED", output=verdict)
+        return RunResult(success=True, output="Implementation complete")
+
+
+def test_pipelined_overlaps_tests_and_review(git_repo):
+    tree = _make_tree()
+    runner = _TimedRunner(review_secs=1.0)
+    start = time.monotonic()
+    result = garden(tree, git_repo, runner, test_command="sleep 1", spec_id="main", pipelined=True)
+    elapsed = time.monotonic() - start
+    assert result.success
+    assert elapsed < 1.9
+    subjects = git_log("HEAD", "%s", git_repo, n=4).split("\n")
+    assert [s.split(":")[0] for s in subjects] == [
+        "task(main@T001@complete)",
+        "task(main@T001@review-approved)",
+        "task(main@T001@test-pass)",
+        "task(main@T001@implement-pass)",
+    ]
+    assert "Tests are running separately" in runner.review_prompts[0]
+
+
+def test_pipelined_test_failure_discards_approval(git_repo):
+    tree = _make_tree()
+    counter = git_repo / ".counter"
+    counter.write_text("0")
+    cmd = f'c=$(cat {counter}); echo $((c+1)) > {counter}; sleep 0.5; [ "$c" -gt "0" ]'
+    runner = _TimedRunner(review_secs=0.0)
+    result = garden(tree, git_repo, runner, test_command=cmd, spec_id="main", pipelined=True)
+    assert result.success
+    subjects = git_log("HEAD", "%s", git_repo, n=10).split("\n")
+    statuses = [s.split("@")[2].split(")")[0] for s in subjects if s.startswith("task(main@T001@")]
+    # First attempt: implement, test-fail, no review commit.
+    assert statuses[::-1] == [
+        "implement-pass", "test-fail",
+        "implement-pass", "test-pass", "review-approved", "complete",
+    ]
+
+
+def test_pipelined_rejection_cancels_tests(git_repo):
+    tree = _make_tree()
+    marker = git_repo / "tests-finished"
+    runner = _TimedRunner(review_secs=0.0, verdicts=["REJECTED: no", "APPROVED"])
+    result = garden(
+        tree, git_repo, runner, test_command=f"sleep 2 && touch {marker}",
+        spec_id="main", pipelined=True, max_retries=1,
+    )
+    assert not result.success
+    time.sleep(2.5)
+    assert not marker.exists()
+    subjects = git_log("HEAD", "%s", git_repo, n=3).split("\n")
+    assert subjects[0].startswith("task(main@T001@failed)")
+    assert subjects[1].startswith("task(main@T001@review-rejected)")
+    assert subjects[2].startswith("task(main@T001@implement-pass)")
+
+
+def test_api_test_defaults_match_config():
+    """Library callers get the same test behaviour as the CLI with no config."""
+    import inspect
+
+    from agent_arborist.config import TestingConfig
+    from agent_arborist.worker.gardener import gardener
+
+    cfg = TestingConfig()
+    for fn in (garden, agarden, gardener):
+        params = inspect.signature(fn).parameters
+        assert params["test_cache"].default == cfg.cache, fn.__name__
+        assert params["test_fail_fast"].default == cfg.fail_fast, fn.__name__
+        assert params["test_parallel"].default == cfg.parallel, fn.__name__
+        assert params["test_compress_logs"].default == cfg.compress_logs, fn.__name__
@@ -14,9 +14,15 @@
 
 """Tests for worker/gardener.py."""
 
+import subprocess
+from pathlib import Path
+
 from agent_arborist.git.repo import git_log
+from agent_arborist.git.state import TaskState, scan_completed_tasks, scan_task_states
 from agent_arborist.tree.model import TaskNode, TaskTree
+from agent_arborist.worker.garden import garden
 from agent_arborist.worker.gardener import gardener, GardenerResult
+from tests.conftest import MockRunner
 
 
 def _make_tree():
@@ -74,3 +80,228 @@ def test_gardener_multi_phase(git_repo, mock_runner_all_pass):
     result = gardener(tree, git_repo, mock_runner_all_pass, spec_id="main")
     assert result.success
     assert result.tasks_completed == 2
+
+
+# --- Parallel mode ---
+
+
+def _wide_tree():
+    """phase1 -> T001, T002, T003 (independent); T004 depends on all three."""
+    tree = TaskTree()
+    tree.nodes["phase1"] = TaskNode(id="phase1", name="Phase 1", children=["T001", "T002", "T003", "T004"])
+    for tid in ("T001", "T002", "T003"):
+        tree.nodes[tid] = TaskNode(id=tid, name=f"Task {tid}", parent="phase1", description=f"Create {tid}.txt")
+    tree.nodes["T004"] = TaskNode(
+        id="T004", name="Task T004", parent="phase1",
+        depends_on=["T001", "T002", "T003"], description="Create T004.txt",
+    )
+    tree.compute_execution_order()
+    return tree
+
+
+class FileWritingRunner(MockRunner):
+    """Implements a task by writing ``{task_id}.txt`` into cwd."""
+
+    def run(self, prompt, timeout=60, cwd=None, container_workspace=None, **kwargs):
+        if prompt.startswith("Implement task "):
+            task_id = prompt.split()[2].rstrip(":")
+            (cwd / f"{task_id}.txt").write_text(task_id)
+        return super().run(prompt, timeout, cwd, container_workspace, **kwargs)
+
+
+def test_gardener_parallel_completes_all_tasks(git_repo):
+    tree = _wide_tree()
+    result = gardener(tree, git_repo, FileWritingRunner(), spec_id="main", parallel=3)
+
+    assert result.success, result.error
+    assert sorted(result.order) == ["T001", "T002", "T003", "T004"]
+    assert result.order[-1] == "T004"
+    assert scan_completed_tasks(tree, git_repo, spec_id="main") == {"T001", "T002", "T003", "T004"}
+    # Work done in worktrees is merged back into the main checkout
+    for tid in ("T001", "T002", "T003", "T004"):
+        assert (git_repo / f"{tid}.txt").read_text() == tid
+
+
+def test_gardener_parallel_writes_logs_in_main_checkout(git_repo):
+    """Logs and reports land in cwd while tasks run and are committed with each merge."""
+    seen = []
+
+    class WatchingRunner(FileWritingRunner):
+        def run(self, prompt, timeout=60, cwd=None, container_workspace=None, **kwargs):
+            seen.append(sorted(p.name for p in (git_repo / "spec" / "logs").glob("*")))
+            return super().run(prompt, timeout, cwd, container_workspace, **kwargs)
+
+    log_dir, report_dir = git_repo / "spec" / "logs", git_repo / "spec" / "reports"
+    result = gardener(
+        _wide_tree(), git_repo, WatchingRunner(), spec_id="main", parallel=2,
+        log_dir=log_dir, report_dir=report_dir,
+    )
+    assert result.success, result.error
+    assert any(seen)  # earlier tasks' logs were visible in cwd before their merge finished
+    assert any(log_dir.glob("T004_*")) and any(report_dir.glob("T004_*"))
+    status = subprocess.run(
+        ["git", "status", "--porcelain"], cwd=git_repo, capture_output=True, text=True, check=True,
+    ).stdout
+    assert status == ""
+    committed = subprocess.run(
+        ["git", "show", "--name-only", "--format=", "HEAD"], cwd=git_repo, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    assert any(p.startswith("spec/reports/T004_") for p in committed)
+
+
+def test_gardener_parallel_trailers_match_sequential_paths(git_repo):
+    """Trailers reference logs and reports relative to the main checkout, not as host paths."""
+    from agent_arborist.constants import TRAILER_REPORT, TRAILER_REVIEW_LOG, TRAILER_TEST_LOG
+    from agent_arborist.git.state import get_task_commit_history
+
+    log_dir, report_dir = git_repo / "spec" / "logs", git_repo / "spec" / "reports"
+    result = gardener(
+        _wide_tree(), git_repo, FileWritingRunner(), spec_id="main", parallel=2,
+        log_dir=log_dir, report_dir=report_dir,
+    )
+    assert result.success, result.error
+    trailers = {}
+    for c in get_task_commit_history("T004", git_repo, spec_id="main"):
+        trailers.update(c["trailers"])
+    assert trailers[TRAILER_TEST_LOG].startswith("spec/logs/T004_test_")
+    assert trailers[TRAILER_REVIEW_LOG].startswith("spec/logs/T004_review_")
+    report = trailers[TRAILER_REPORT]
+    assert report.startswith("spec/reports/T004_run_")
+    body = git_log("HEAD", "%B", git_repo, n=1, grep="task(main@T004@complete)", fixed_strings=True)
+    assert f"Report: {report}" in body
+    assert (git_repo / report).is_file()
+
+
+def test_task_artifacts_ignore_task_ids_sharing_a_prefix(tmp_path):
+    from agent_arborist.worker.gardener import _task_artifacts
+
+    log_dir, report_dir = tmp_path / "logs", tmp_path / "reports"
+    log_dir.mkdir()
+    report_dir.mkdir()
+    for name in ("T1_test_20260101T000000.log.gz", "T1_a_test_20260101T000000.log", "T1_notes.txt"):
+        (log_dir / name).write_text("x")
+    for name in ("T1_run_20260101T000000.json", "T1_a_run_20260101T000000.json"):
+        (report_dir / name).write_text("{}")
+
+    found = _task_artifacts("T1", tmp_path, [log_dir, report_dir])
+    assert [p.name for p in found] == ["T1_test_20260101T000000.log.gz", "T1_run_20260101T000000.json"]
+    assert [p.name for p in _task_artifacts("T1_a", tmp_path, [log_dir, report_dir])] == [
+        "T1_a_test_20260101T000000.log", "T1_a_run_20260101T000000.json",
+    ]
+
+
+def test_gardener_parallel_cleans_up_worktrees(git_repo, mock_runner_all_pass):
+    tree = _wide_tree()
+    gardener(tree, git_repo, mock_runner_all_pass, spec_id="main", parallel=2)
+
+    out = subprocess.run(
+        ["git", "worktree", "list"], cwd=git_repo, capture_output=True, text=True, check=True,
+    ).stdout
+    assert len(out.strip().splitlines()) == 1
+
+
+def test_gardener_parallel_leases_one_container_per_slot(git_repo, monkeypatch):
+    """Each worktree slot gets its own pooled container, warmed once and removed on exit."""
+    import agent_arborist.devcontainer as devcontainer
+
+    warmed, removed, used = [], [], []
+
+    def fake_ensure(workspace_folder, timeout_up=300, timeout_check=30, **kwargs):
+        warmed.append(Path(workspace_folder))
+        return devcontainer.ContainerSession(workspace_folder=Path(workspace_folder))
+
+    def fake_exec_args(cmd, workspace_folder):
+        used.append(Path(workspace_folder))
+        return cmd
+
+    monkeypatch.setattr(devcontainer, "ensure_container_running", fake_ensure)
+    monkeypatch.setattr(devcontainer, "container_exec_args", fake_exec_args)
+    monkeypatch.setattr(devcontainer, "remove_container", lambda folder, timeout=30: removed.append(Path(folder)))
+
+    tree = _wide_tree()
+    result = gardener(
+        tree, git_repo, FileWritingRunner(), spec_id="main", parallel=2,
+        container_workspace=git_repo,
+    )
+    assert result.success, result.error
+
+    slots = sorted(set(warmed))
+    assert len(slots) == 2
+    assert all(p.name.startswith("slot-") for p in slots)
+    # Outside .git, which each slot's container mounts for git to work there.
+    assert all(".git" not in p.parts and git_repo not in p.parents for p in slots)
+    # Four tasks ran their tests in the two pooled containers only.
+    assert len(used) == 4
+    assert set(used) <= set(slots)
+    assert sorted(removed) == slots
+    out = subprocess.run(
+        ["git", "worktree", "list"], cwd=git_repo, capture_output=True, text=True, check=True,
+    ).stdout
+    assert len(out.strip().splitlines()) == 1
+
+
+def test_gardener_starts_container_warmup_before_first_task(git_repo, monkeypatch):
+    import agent_arborist.devcontainer as devcontainer
+
+    events = []
+
+    def fake_warmup(workspace_folder, timeout_up=300, timeout_check=30, *, start=True):
+        events.append(("warmup", start, timeout_up))
+
+    def fake_ensure(workspace_folder, timeout_up=300, timeout_check=30, **kwargs):
+        events.append(("ensure",))
+        return devcontainer.ContainerSession(workspace_folder=Path(workspace_folder))
+
+    monkeypatch.setattr(devcontainer, "start_container_warmup", fake_warmup)
+    monkeypatch.setattr(devcontainer, "ensure_container_running", fake_ensure)
+    monkeypatch.setattr(devcontainer, "container_exec_args", lambda cmd, ws: cmd)
+
+    result = gardener(
+        _make_tree(), git_repo, FileWritingRunner(), spec_id="main",
+        container_workspace=git_repo, container_up_timeout=900,
+    )
+    assert result.success, result.error
+    assert events[0] == ("warmup", True, 900)
+    assert ("ensure",) in events[1:]
+
+
+def test_gardener_parallel_resumes_after_partial_run(git_repo, mock_runner_all_pass):
+    """State stays trailer-based: a later parallel run skips merged tasks."""
+    tree = _wide_tree()
+    garden(tree, git_repo, mock_runner_all_pass, spec_id="main", task_id="T002")
+
+    result = gardener(tree, git_repo, mock_runner_all_pass, spec_id="main", parallel=3)
+    assert result.success
+    assert "T002" not in result.order
+    assert result.tasks_completed == 3
+
+
+def test_gardener_parallel_handles_failure(git_repo, mock_runner_always_reject):
+    tree = _wide_tree()
+    result = gardener(tree, git_repo, mock_runner_always_reject, max_retries=1, spec_id="main", parallel=3)
+
+    assert not result.success
+    assert "failed" in result.error
+    states, _ = scan_task_states(tree, git_repo, spec_id="main")
+    assert states["T001"] == TaskState.FAILED
+
+
+class SharedFileRunner(MockRunner):
+    """Every task appends its ID to the same file, so concurrent merges conflict."""
+
+    def run(self, prompt, timeout=60, cwd=None, container_workspace=None, **kwargs):
+        if prompt.startswith("Implement task "):
+            task_id = prompt.split()[2].rstrip(":")
+            shared = cwd / "shared.txt"
+            prev = shared.read_text() if shared.exists() else ""
+            shared.write_text(prev + task_id + "\n")
+        return super().run(prompt, timeout, cwd, container_workspace, **kwargs)
+
+
+def test_gardener_parallel_reruns_conflicting_task(git_repo):
+    tree = _wide_tree()
+    result = gardener(tree, git_repo, SharedFileRunner(), spec_id="main", parallel=3)
+
+    assert result.success, result.error
+    lines = (git_repo / "shared.txt").read_text().split()
+    assert sorted(lines) == ["T001", "T002", "T003", "T004"]
@@ -0,0 +1,217 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for worker/test_cache.py and its use by the test step."""
+
+import asyncio
+
+from agent_arborist.git.repo import git_log
+from agent_arborist.tree.model import TaskNode, TaskTree, TestCommand, TestType
+from agent_arborist.worker.garden import _arun_tests, _run_tests, agarden, garden
+from agent_arborist.worker.test_cache import TestCache, cache_environment, cache_key, worktree_tree
+
+
+def _counting_node(tmp_path, output="2 passed in 0.1s", exit_code=0):
+    runs = tmp_path / "runs"
+    cmd = f"echo x >> {runs}; echo '{output}'; exit {exit_code}"
+    node = TaskNode(
+        id="T001", name="Test",
+        test_commands=[TestCommand(type=TestType.UNIT, command=cmd, framework="pytest")],
+    )
+    return node, runs
+
+
+def _run_count(runs):
+    return len(runs.read_text().split()) if runs.exists() else 0
+
+
+def test_cache_key_covers_every_input():
+    base = cache_key("tree", "pytest", "unit", "host")
+    assert base == cache_key("tree", "pytest", "unit", "host")
+    assert len({
+        base,
+        cache_key("tree2", "pytest", "unit", "host"),
+        cache_key("tree", "pytest -x", "unit", "host"),
+        cache_key("tree", "pytest", "integration", "host"),
+        cache_key("tree", "pytest", "unit", "devcontainer:abc"),
+    }) == 5
+
+
+def test_cache_environment_follows_devcontainer_config(tmp_path):
+    assert cache_environment(None) == "host"
+    (tmp_path / ".devcontainer").mkdir()
+    (tmp_path / ".devcontainer" / "devcontainer.json").write_text('{"image": "python:3.11"}')
+    first = cache_environment(tmp_path)
+    assert first.startswith("devcontainer:")
+    (tmp_path / ".devcontainer" / "devcontainer.json").write_text('{"image": "python:3.12"}')
+    assert cache_environment(tmp_path) != first
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = TestCache(tmp_path / "cache")
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, {"passed": True})
+    assert cache.get("ab" * 32) == {"passed": True}
+
+
+def test_worktree_tree_requires_clean_worktree(git_repo):
+    assert worktree_tree(git_repo) is not None
+    (git_repo / "new.txt").write_text("x")
+    assert worktree_tree(git_repo) is None
+
+
+def test_run_tests_reuses_result_for_same_tree(git_repo, tmp_path):
+    node, runs = _counting_node(tmp_path)
+    cache = TestCache.for_repo(git_repo)
+    first = _run_tests(node, git_repo, "true", None, cache=cache)
+    second = _run_tests(node, git_repo, "true", None, cache=cache)
+    assert _run_count(runs) == 1
+    assert not first[0].cached and second[0].cached
+    assert second[0].passed and second[0].counts == {"passed": 2, "failed": 0, "skipped": 0}
+    assert "2 passed" in second[0].stdout
+
+
+def test_run_tests_never_caches_failures(git_repo, tmp_path):
+    """A failure may come from the environment, so it always reruns."""
+    node, runs = _counting_node(tmp_path, output="1 failed in 0.1s", exit_code=1)
+    cache = TestCache.for_repo(git_repo)
+    _run_tests(node, git_repo, "true", None, cache=cache)
+    results = _run_tests(node, git_repo, "true", None, cache=cache)
+    assert _run_count(runs) == 2
+    assert not results[0].cached and not results[0].passed
+
+
+def test_run_tests_always_runs_setup_and_teardown(git_repo, tmp_path):
+    runs = tmp_path / "runs"
+    node = TaskNode(id="T001", name="Test", test_commands=[
+        TestCommand(type=TestType.SETUP, command=f"echo setup >> {runs}"),
+        TestCommand(type=TestType.UNIT, command=f"echo unit >> {runs}"),
+        TestCommand(type=TestType.TEARDOWN, command=f"echo teardown >> {runs}"),
+    ])
+    cache = TestCache.for_repo(git_repo)
+    _run_tests(node, git_repo, "true", None, cache=cache)
+    results = _run_tests(node, git_repo, "true", None, cache=cache)
+    assert [r.cached for r in results] == [False, True, False]
+    assert runs.read_text().split() == ["setup", "unit", "teardown", "setup", "teardown"]
+
+
+def test_run_tests_misses_on_dirty_or_changed_tree(git_repo, tmp_path):
+    node, runs = _counting_node(tmp_path)
+    cache = TestCache.for_repo(git_repo)
+    _run_tests(node, git_repo, "true", None, cache=cache)
+    (git_repo / "new.txt").write_text("x")
+    _run_tests(node, git_repo, "true", None, cache=cache)
+    assert _run_count(runs) == 2
+
+
+def test_run_tests_does_not_cache_timeouts(git_repo):
+    node = TaskNode(
+        id="T001", name="Test",
+        test_commands=[TestCommand(type=TestType.UNIT, command="sleep 10", timeout=1)],
+    )
+    cache = TestCache.for_repo(git_repo)
+    _run_tests(node, git_repo, "true", None, cache=cache)
+    tree = worktree_tree(git_repo)
+    assert cache.get(cache.key(tree, "sleep 10", "unit")) is None
+
+
+def test_arun_tests_shares_cache_with_run_tests(git_repo, tmp_path):
+    node, runs = _counting_node(tmp_path)
+    cache = TestCache.for_repo(git_repo)
+    _run_tests(node, git_repo, "true", None, cache=cache)
+    results = asyncio.run(_arun_tests(node, git_repo, "true", None, cache=cache))
+    assert _run_count(runs) == 1
+    assert results[0].cached
+
+
+class _RejectOnceRunner:
+    """Rejects the first review, approves the rest; implement changes nothing."""
+    name = "mock"
+    model = "mock-model"
+
+    def __init__(self):
+        self.reviews = 0
+
+    def run(self, prompt, **kwargs):
+        from agent_arborist.runner import RunResult
+        if prompt.startswith("Review the changes"):
+            self.reviews += 1
+            return RunResult(success=True, output="REJECTED" if self.reviews == 1 else "APPROVED")
+        return RunResult(success=True, output="Implementation complete")
+
+
+def _single_task_tree(node):
+    tree = TaskTree()
+    tree.nodes["phase1"] = TaskNode(id="phase1", name="Phase 1", children=["T001"])
+    node.parent = "phase1"
+    tree.nodes["T001"] = node
+    tree.compute_execution_order()
+    return tree
+
+
+def test_garden_retry_on_unchanged_tree_records_cached_trailer(git_repo, tmp_path):
+    node, runs = _counting_node(tmp_path)
+    tree = _single_task_tree(node)
+    result = garden(tree, git_repo, _RejectOnceRunner(), spec_id="main", test_cache=True)
+    assert result.success
+    assert _run_count(runs) == 1
+
+    newest, oldest = [b for b in git_log("HEAD", "%B%x00", git_repo, n=20, grep="tests pass").split("\0") if b.strip()]
+    assert "Arborist-Test-Cached: unit" in newest
+    assert "Arborist-Test-Cached" not in oldest
+
+
+def test_agarden_without_cache_reruns(git_repo, tmp_path):
+    node, runs = _counting_node(tmp_path)
+    tree = _single_task_tree(node)
+    result = asyncio.run(agarden(tree, git_repo, _RejectOnceRunner(), spec_id="main", test_cache=False))
+    assert result.success
+    assert _run_count(runs) == 2
+
+
+def test_worktree_tree_ignores_artifact_dirs(git_repo):
+    import subprocess
+
+    before = worktree_tree(git_repo, exclude=["logs"])
+    assert before == worktree_tree(git_repo)
+    (git_repo / "logs").mkdir()
+    (git_repo / "logs" / "T001_implement_1.log").write_text("attempt 1")
+    assert worktree_tree(git_repo) is None
+    assert worktree_tree(git_repo, exclude=["logs"]) == before
+    subprocess.run(["git", "add", "-A"], cwd=git_repo, check=True)
+    subprocess.run(["git", "commit", "-qm", "log"], cwd=git_repo, check=True)
+    assert worktree_tree(git_repo) != before
+    assert worktree_tree(git_repo, exclude=["logs"]) == before
+
+
+def test_run_tests_does_not_cache_signal_kills(git_repo):
+    cmd = "kill -9 $$"
+    node = TaskNode(id="T001", name="Test", test_commands=[TestCommand(type=TestType.UNIT, command=cmd)])
+    cache = TestCache.for_repo(git_repo)
+    (result,) = _run_tests(node, git_repo, "true", None, cache=cache)
+    assert not result.passed
+    assert cache.get(cache.key(worktree_tree(git_repo), cmd, "unit")) is None
+
+
+def test_garden_retry_hits_cache_with_in_repo_logs(git_repo, tmp_path):
+    """Each attempt commits new logs and reports; the retry still hits the cache."""
+    node, runs = _counting_node(tmp_path)
+    tree = _single_task_tree(node)
+    result = garden(
+        tree, git_repo, _RejectOnceRunner(), spec_id="main", test_cache=True,
+        log_dir=git_repo / "spec" / "logs", report_dir=git_repo / "spec" / "reports",
+    )
+    assert result.success
+    assert _run_count(runs) == 1
+    assert any((git_repo / "spec" / "logs").iterdir())
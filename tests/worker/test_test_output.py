@@ -0,0 +1,109 @@
+# Copyright 2026 Pennyworth Technologies, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for worker/test_cache.py and its use by the test step."""
+
+"""Tests for worker/test_output.py."""
+
+import gzip
+import threading
+
+from agent_arborist.worker.test_output import TAIL_CHARS, CommandOutput, CountParser, TestLog, gzip_log
+
+
+def _feed(framework, text):
+    parser = CountParser(framework)
+    for line in text.splitlines(keepends=True):
+        parser.feed(line)
+    return parser.counts
+
+
+def test_count_parser_pytest_split_across_lines():
+    assert _feed("pytest", "collected 9\n7 passed\n1 skipped, 1 failed\n") == {"passed": 7, "failed": 1, "skipped": 1}
+
+
+def test_count_parser_keeps_first_match():
+    assert _feed("pytest", "3 passed in 0.1s\n5 passed in 0.2s\n") == {"passed": 3, "failed": 0, "skipped": 0}
+
+
+def test_count_parser_vitest_uses_jest_summary():
+    assert _feed("vitest", "Tests:  4 passed, 1 failed, 2 skipped, 7 total\n") == {"passed": 4, "failed": 1, "skipped": 2}
+
+
+def test_count_parser_go_counts_every_package():
+    text = "ok  \ta\t0.1s\nok  \tb\t0.1s\nFAIL\tc\t0.2s\n--- FAIL: TestX\n"
+    assert _feed("go", text) == {"passed": 2, "failed": 1, "skipped": 0}
+
+
+def test_count_parser_auto_prefers_pytest():
+    assert _feed(None, "ok  \tpkg\t0.1s\n2 passed in 0.1s\n") == {"passed": 2, "failed": 0, "skipped": 0}
+    assert _feed(None, "nothing to see\n") is None
+
+
+def test_test_log_tags_lines_and_notes(tmp_path):
+    log = TestLog(tmp_path / "logs" / "T1_test.log")
+    log.note("unit: pytest")
+    log.line("unit", "stdout", "1 passed\n")
+    log.line("unit", "stderr", "warning")
+    log.close()
+    log.line("unit", "stdout", "after close\n")
+    assert (tmp_path / "logs" / "T1_test.log").read_text() == (
+        "=== unit: pytest ===\n[unit] 1 passed\n[unit:stderr] warning\n"
+    )
+
+
+def test_test_log_concurrent_writers_keep_whole_lines(tmp_path):
+    log = TestLog(tmp_path / "t.log")
+
+    def write(kind):
+        for i in range(500):
+            log.line(kind, "stdout", f"{kind} line {i}\n")
+
+    threads = [threading.Thread(target=write, args=(k,)) for k in ("unit", "integration")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    log.close()
+    lines = (tmp_path / "t.log").read_text().splitlines()
+    assert len(lines) == 1000
+    assert all(line.startswith(("[unit] unit line", "[integration] integration line")) for line in lines)
+
+
+def test_command_output_keeps_bounded_tail(tmp_path):
+    log = TestLog(tmp_path / "t.log")
+    out = CommandOutput("unit", "pytest", log)
+    line = "x" * 99 + "\n"
+    for _ in range(2 * TAIL_CHARS // len(line)):
+        out.feed("stdout", line)
+    out.feed("stdout", "12 passed in 1.0s")
+    log.close()
+    assert len(out.text("stdout")) <= TAIL_CHARS
+    assert out.text("stdout").endswith("12 passed in 1.0s\n")
+    assert out.parser.counts == {"passed": 12, "failed": 0, "skipped": 0}
+    assert (tmp_path / "t.log").stat().st_size > 2 * TAIL_CHARS
+
+
+def test_gzip_log_replaces_original(tmp_path):
+    path = tmp_path / "T1_test.log"
+    path.write_text("[unit] ok\n")
+    target = gzip_log(path)
+    assert target == tmp_path / "T1_test.log.gz"
+    assert not path.exists()
+    assert gzip.decompress(target.read_bytes()) == b"[unit] ok\n"
+
+
+def test_gzip_log_missing_file_keeps_path(tmp_path):
+    path = tmp_path / "gone.log"
+    assert gzip_log(path) == path